@@ -1,13 +1,71 @@
-from flask import Flask, render_template, send_from_directory, jsonify
+from flask import Flask, render_template, send_from_directory, jsonify, make_response, request, g
+from markupsafe import Markup
 import pandas as pd
 import plotly
 import json
+import hashlib
+import functools
+import cProfile
+import io
+import marshal
+import pstats
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode
 from src.analysis.spotify_analyzer import SpotifyAnalyzer
+from src.analysis.dataset_cache import dataset_cache
+from src.analysis.datasets import dataset_registry, DEFAULT_DATASET
+from src.analysis.delta_parts import delta_files
+from src.analysis.instrumentation import registry, span
+from src.analysis.playlists import MAX_BATCH
+from src.analysis.theme import TEMPLATE_NAME
+from src.web.payload_cache import PayloadCache
+from src.web.compression import negotiate_encoding, compress
+from src.web.serialization import to_json, script_safe
+from src.web.filters import filters_from_args, filters_query, similar_from_args, playlist_specs
+from src.web.dashboard import CHARTS, build_dashboard_payload
+from src.web.refresh import DashboardRefresher
 import os
+from pathlib import Path
 import shutil
+import sys
+import threading
+
+# Copy-on-Write (padrão a partir do pandas 3.0) ligado no ponto de entrada do
+# app: as requisições recebem cópias rasas do dataset em cache em vez de
+# cópias completas (ver `DatasetSnapshot.frame`)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
 
 app = Flask(__name__)
 
+# Trabalho pesado na inicialização (DASHBOARD_STARTUP):
+#   lazy       - nada é feito no import; a primeira requisição monta o dashboard
+#   background - uma thread aquece o cache do dashboard logo após o import
+#   eager      - o dashboard é montado no import (use com preload_app do gunicorn
+#                para que os workers herdem o cache já pronto)
+# A exportação de PNG/HTML das visualizações é uma etapa de build: python app.py --build
+STARTUP_MODE = os.environ.get('DASHBOARD_STARTUP', 'lazy')
+
+# Atualização quando os dados processados mudam (DASHBOARD_REFRESH):
+#   background - uma thread por processo confere o arquivo a cada
+#                DASHBOARD_REFRESH_INTERVAL segundos e reconstrói o dashboard;
+#                enquanto isso as requisições recebem a última versão pronta
+#   sync       - a conferência e a reconstrução acontecem na requisição
+REFRESH_MODE = os.environ.get('DASHBOARD_REFRESH', 'background')
+REFRESH_INTERVAL = float(os.environ.get('DASHBOARD_REFRESH_INTERVAL', 5))
+
+# Payload e página do dashboard calculados uma vez por versão dos dados e
+# combinação de filtros; as combinações menos usadas são descartadas (LRU)
+payload_cache = PayloadCache(max_entries=int(os.environ.get('PAYLOAD_CACHE_ENTRIES', 32)))
+
+# Perfil por requisição com ?profile=1 (DASHBOARD_PROFILING=1); desligado por
+# padrão, pois expõe detalhes internos e deixa a requisição mais lenta
+app.config['PROFILING_ENABLED'] = os.environ.get('DASHBOARD_PROFILING', '0') in ('1', 'true')
+
+REQUEST_METRIC = 'dashboard_request_seconds'
+registry.describe(REQUEST_METRIC, 'Duração das requisições HTTP por endpoint')
+
 def ensure_static_files():
     """Garante que todos os arquivos estáticos necessários estejam nos diretórios corretos"""
     # Obter o caminho absoluto do diretório do projeto
@@ -36,112 +94,459 @@ def ensure_static_files():
             print(f"Copiado {icon} para {dst_icon}")
 
 def apply_spotify_theme(fig):
-    """Aplica o tema do Spotify aos gráficos"""
-    fig.update_layout(
-        paper_bgcolor='#121212',
-        plot_bgcolor='#282828',
-        font_color='#FFFFFF',
-        title_font_color='#1DB954',
-        title_x=0.5,
-        margin=dict(t=50, r=50, b=50, l=50),
-        showlegend=True,
-        legend=dict(
-            font=dict(color='#FFFFFF'),
-            bgcolor='rgba(0,0,0,0)',
-            bordercolor='#404040'
-        )
-    )
-    
-    # Atualizar eixos
-    fig.update_xaxes(
-        gridcolor='#404040',
-        linecolor='#404040',
-        tickfont=dict(color='#FFFFFF')
-    )
-    fig.update_yaxes(
-        gridcolor='#404040',
-        linecolor='#404040',
-        tickfont=dict(color='#FFFFFF')
-    )
+    """Aplica o tema do Spotify a figuras montadas fora do analyzer.
     
+    As figuras do analyzer já nascem com o template 'spotify' (src/analysis/theme.py).
+    """
+    fig.update_layout(template=TEMPLATE_NAME)
     return fig
 
-def generate_all_visualizations():
-    """Gera e salva todas as visualizações ao iniciar a aplicação"""
+def generate_all_visualizations(max_workers=None):
+    """Gera e salva todas as visualizações (HTML e PNG)"""
     try:
         analyzer = SpotifyAnalyzer()
         df = analyzer.load_data()
-        return analyzer.save_visualizations()
-    except Exception as e:
-        print(f"Erro ao gerar visualizações: {e}")
+        return analyzer.save_visualizations(max_workers=max_workers)
+    except Exception:
+        app.logger.exception("Erro ao gerar visualizações")
         return None
 
-# Configurar arquivos estáticos e gerar visualizações ao iniciar
-ensure_static_files()
-visualizations = generate_all_visualizations()
+def build_artifacts(max_workers=None):
+    """Etapa de build: arquivos estáticos e exportação das visualizações"""
+    ensure_static_files()
+    return generate_all_visualizations(max_workers)
+
+@app.template_filter('embed_json')
+def embed_json(json_text):
+    """Spec JSON já serializado, embutido uma única vez num <script>"""
+    return Markup(script_safe(json_text))
+
+@functools.lru_cache(maxsize=1)
+def plotlyjs():
+    """plotly.js do pacote plotly instalado: (versão, corpo, corpos comprimidos)"""
+    # plotly.offline puxa IPython; só é importado quando o script é pedido
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+    return get_plotlyjs_version(), get_plotlyjs().encode('utf-8'), {}
+
+@app.context_processor
+def plotly_version():
+    return {'plotly_version': plotlyjs()[0]}
+
+@app.route('/vendor/plotly-<version>.min.js')
+def plotly_js(version):
+    """plotly.js local (a URL muda com a versão, então pode ficar em cache para sempre)"""
+    current, body, compressed = plotlyjs()
+    if version != current:
+        return "Versão do plotly.js indisponível", 404
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+    data = compressed.get(encoding)
+    if data is None:
+        # Qualidade 11 do brotli leva vários segundos nos ~3,5 MB do plotly.js
+        data = compressed[encoding] = compress(body, encoding, brotli_quality=5)
+    response = make_response(data)
+    response.mimetype = 'application/javascript'
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = 31536000
+    response.cache_control.immutable = True
+    return response
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    if app.config['PROFILING_ENABLED'] and request.args.get('profile') == '1':
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def record_request(response):
+    """Registra a duração da requisição e, com ?profile=1, devolve o perfil"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        response = profile_response(profiler)
+    start = g.pop('request_start', None)
+    if start is not None:
+        registry.observe(REQUEST_METRIC, time.perf_counter() - start,
+                         endpoint=request.endpoint or 'not_found',
+                         status=str(response.status_code))
+    return response
+
+def profile_response(profiler):
+    """Perfil cProfile da requisição: texto (profile_format=text) ou dump do pstats"""
+    if request.args.get('profile_format') == 'text':
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(60)
+        response = make_response(out.getvalue())
+        response.mimetype = 'text/plain'
+        return response
+    
+    # Mesmo formato de Profile.dump_stats: abre com pstats.Stats ou snakeviz
+    profiler.create_stats()
+    response = make_response(marshal.dumps(profiler.stats))
+    response.mimetype = 'application/octet-stream'
+    response.headers['Content-Disposition'] = (
+        f"attachment; filename={request.endpoint or 'request'}.prof"
+    )
+    return response
+
+@registry.add_collector
+def cache_metrics():
+    """Acertos, faltas e taxa de acerto dos caches de dataset e de payload"""
+    caches = {'dataset': dataset_cache.stats(), 'payload': payload_cache.stats()}
+    hits = [({'cache': name}, stats['hits']) for name, stats in caches.items()]
+    misses = [({'cache': name}, stats['misses']) for name, stats in caches.items()]
+    ratios = [
+        ({'cache': name}, stats['hits'] / (stats['hits'] + stats['misses'])
+         if stats['hits'] + stats['misses'] else 0.0)
+        for name, stats in caches.items()
+    ]
+    return [
+        ('dashboard_cache_hits_total', 'counter', 'Acertos do cache', hits),
+        ('dashboard_cache_misses_total', 'counter', 'Faltas do cache', misses),
+        ('dashboard_cache_hit_ratio', 'gauge', 'Taxa de acerto do cache', ratios),
+        ('dashboard_dataset_bytes', 'gauge', 'Bytes dos datasets carregados no processo',
+         [({}, caches['dataset']['bytes'])]),
+        ('dashboard_dataset_evictions_total', 'counter',
+         'Datasets descartados pelo orçamento de memória',
+         [({}, caches['dataset']['evictions'])])
+    ]
+
+@registry.add_collector
+def refresh_metrics():
+    """Idade dos artefatos publicados e número de reconstruções, por dataset"""
+    statuses = {dataset_id: r.health() for dataset_id, r in list(refreshers.items())}
+    return [
+        ('dashboard_artifact_age_seconds', 'gauge', 'Idade dos artefatos publicados',
+         [({'dataset': d}, s['age_seconds']) for d, s in statuses.items()
+          if s['age_seconds'] is not None]),
+        ('dashboard_refreshes_total', 'counter', 'Reconstruções do dashboard',
+         [({'dataset': d}, s['refreshes']) for d, s in statuses.items()])
+    ]
+
+@app.route('/metrics')
+def metrics():
+    """Métricas no formato do Prometheus (por processo; cada worker expõe as suas)"""
+    response = make_response(registry.render())
+    response.mimetype = 'text/plain'
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    return response
 
 @app.route('/static/<path:filename>')
 def serve_static(filename):
     return send_from_directory('static', filename)
 
+@app.route('/cache/stats')
+def cache_stats():
+    """Contadores do cache de datasets (acertos, faltas e recargas)"""
+    return jsonify({
+        'dataset': dataset_cache.stats(),
+        'payload': payload_cache.stats()
+    })
+
+def get_dashboard_payload(analyzer, data_version, filters=()):
+    """Payload do dashboard para a versão dos dados e os filtros dados.
+    
+    Calculado uma vez por (versão, filtros); as linhas filtradas vêm dos
+    índices pré-computados do dataset.
+    """
+    def build():
+        with span('build_payload'):
+            return build_dashboard_payload(analyzer.filtered(filters))
+    
+    return payload_cache.get_or_build(('payload', data_version, filters), build)
+
+def filters_tag(filters):
+    """Identificador curto da combinação de filtros (usado nas ETags)"""
+    return hashlib.sha256(repr(filters).encode()).hexdigest()[:12]
+
+def dashboard_etag(data_version, filters=(), dataset_id=DEFAULT_DATASET):
+    """ETag da página: dataset + versão dos dados + filtros + versão do template"""
+    template_path = os.path.join(app.root_path, app.template_folder, 'index.html')
+    template_mtime = os.stat(template_path).st_mtime_ns
+    key = f"{dataset_id}:{data_version}:{filters!r}:{template_mtime}"
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+def api_query(dataset_id, filters=()):
+    """Query string (sem o '?') das chamadas à API para o dataset e os filtros"""
+    query = filters_query(filters)
+    if dataset_id != DEFAULT_DATASET:
+        query = urlencode({'dataset': dataset_id}) + ('&' + query if query else '')
+    return query
+
+def dashboard_page(analyzer, data_version, filters=()):
+    """HTML da página (sem os gráficos, buscados via /api/charts) e sua ETag"""
+    dataset_id = analyzer.dataset_id
+    etag = dashboard_etag(data_version, filters, dataset_id)
+    
+    def build_page():
+        payload = get_dashboard_payload(analyzer, data_version, filters)
+        with span('render_template'):
+            return render_template('index.html',
+                                   graphs={},
+                                   chart_names=list(payload['charts']),
+                                   insights=payload['insights'],
+                                   recommendations=payload['recommendations'],
+                                   catalog=payload['catalog'],
+                                   success_metrics=payload['success_metrics'],
+                                   filters=dict(filters),
+                                   api_query=api_query(dataset_id, filters),
+                                   dataset_id=dataset_id,
+                                   datasets={d: dataset_registry.title(d) for d in dataset_registry.ids()},
+                                   genres=analyzer.filter_index.genres,
+                                   rows=payload['rows'])
+    
+    return payload_cache.get_or_build(('page', etag), build_page), etag
+
+def data_signature(dataset_id=DEFAULT_DATASET):
+    """Assinatura barata do arquivo processado e das partes incrementais (caminho, mtimes, tamanhos)"""
+    path = dataset_registry.path(dataset_id)
+    stats = [os.stat(file) for file in [path, *delta_files(path)]]
+    return str(path), tuple((stat.st_mtime_ns, stat.st_size) for stat in stats)
+
+def rebuild_dashboard(dataset_id=DEFAULT_DATASET):
+    """Recarrega os dados (se mudaram) e monta payload e página da visão sem filtros"""
+    analyzer = SpotifyAnalyzer(dataset_id)
+    with span('rebuild_dashboard'):
+        analyzer.load_data(revalidate=True)
+        data_version, data_mtime = analyzer.data_version()
+        with app.test_request_context('/'):
+            dashboard_page(analyzer, data_version)
+    return {
+        'version': data_version,
+        'data_mtime': data_mtime,
+        'data_path': str(analyzer.data_path)
+    }
+
+# Um atualizador por dataset, criado no primeiro acesso ao dataset
+refreshers = {}
+refreshers_lock = threading.Lock()
+
+def dataset_refresher(dataset_id=DEFAULT_DATASET):
+    """Atualizador (stale-while-revalidate) dos artefatos de um dataset"""
+    refresher = refreshers.get(dataset_id)
+    if refresher is None:
+        with refreshers_lock:
+            refresher = refreshers.get(dataset_id)
+            if refresher is None:
+                refresher = refreshers[dataset_id] = DashboardRefresher(
+                    functools.partial(data_signature, dataset_id),
+                    functools.partial(rebuild_dashboard, dataset_id),
+                    mode=REFRESH_MODE, interval=REFRESH_INTERVAL
+                )
+    return refresher
+
+refresher = dataset_refresher(DEFAULT_DATASET)
+if REFRESH_MODE == 'background':
+    # As requisições usam a versão já carregada; só a thread de atualização
+    # confere o arquivo e recarrega os dados
+    dataset_cache.revalidate = False
+
+def request_dataset():
+    """Dataset pedido em ?dataset= (padrão: 'spotify'); None se não estiver no registro"""
+    dataset_id = request.args.get('dataset', '').strip() or DEFAULT_DATASET
+    return dataset_id if dataset_id in dataset_registry else None
+
+def published_analyzer(dataset_id=DEFAULT_DATASET):
+    """Analyzer com os dados carregados e (versão, mtime) desses dados.
+    
+    A versão vem do snapshot de fato carregado, não do artefato publicado:
+    a thread de atualização recarrega o dataset antes de publicar a versão
+    nova, e payloads e ETags precisam seguir o frame usado.
+    """
+    artifact = dataset_refresher(dataset_id).current()
+    analyzer = SpotifyAnalyzer(dataset_id)
+    analyzer.data_path = Path(artifact['data_path'])
+    analyzer.load_data()
+    data_version, data_mtime = analyzer.data_version()
+    return analyzer, data_version, data_mtime
+
+def revalidated(response, etag, data_mtime):
+    """Aplica ETag/Last-Modified e responde 304 a GETs condicionais"""
+    response.set_etag(etag)
+    response.last_modified = datetime.fromtimestamp(data_mtime, tz=timezone.utc)
+    # Permite cache, mas exige revalidação (If-None-Match / If-Modified-Since)
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+def compressed_json(payload, key, body):
+    """Resposta JSON comprimida (br/gzip) conforme Accept-Encoding, com cache do corpo"""
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+    data = payload['compressed'].get((key, encoding))
+    if data is None:
+        data = compress(body.encode('utf-8'), encoding)
+        payload['compressed'][(key, encoding)] = data
+    
+    response = make_response(data)
+    response.mimetype = 'application/json'
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response, encoding
+
+@app.route('/api/charts/<name>')
+def api_chart(name):
+    """Spec compacto (tema aplicado, floats arredondados) de um gráfico do dashboard"""
+    if name not in CHARTS:
+        return jsonify({'erro': f"Gráfico desconhecido: {name}"}), 404
+    dataset_id = request_dataset()
+    if dataset_id is None:
+        return jsonify({'erro': f"Dataset desconhecido: {request.args.get('dataset')}"}), 404
+    try:
+        filters = filters_from_args(request.args)
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
+    
+    analyzer, data_version, data_mtime = published_analyzer(dataset_id)
+    payload = get_dashboard_payload(analyzer, data_version, filters)
+    if name not in payload['charts']:
+        if not payload['rows']:
+            return jsonify({'erro': "Nenhuma música atende aos filtros"}), 404
+        return jsonify({'erro': f"Gráfico indisponível: {name}"}), 500
+    
+    response, encoding = compressed_json(payload, name, payload['charts'][name])
+    etag = f"{data_version[:32]}-{filters_tag(filters)}-{name}-{encoding or 'identity'}"
+    return revalidated(response, etag, data_mtime)
+
+@app.route('/api/insights')
+def api_insights():
+    """Insights, recomendações e tabela de métricas de sucesso"""
+    dataset_id = request_dataset()
+    if dataset_id is None:
+        return jsonify({'erro': f"Dataset desconhecido: {request.args.get('dataset')}"}), 404
+    try:
+        filters = filters_from_args(request.args)
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
+    
+    analyzer, data_version, data_mtime = published_analyzer(dataset_id)
+    payload = get_dashboard_payload(analyzer, data_version, filters)
+    
+    body = to_json({
+        'rows': payload['rows'],
+        'insights': payload['insights'],
+        'recommendations': payload['recommendations'],
+        'catalog': payload['catalog'],
+        'success_metrics': payload['success_metrics']
+    })
+    response, encoding = compressed_json(payload, 'insights', body)
+    etag = f"{data_version[:32]}-{filters_tag(filters)}-insights-{encoding or 'identity'}"
+    return revalidated(response, etag, data_mtime)
+
+@app.route('/api/similar')
+def api_similar():
+    """Músicas mais parecidas com ?track= (uma música, ou várias para completar uma playlist)"""
+    dataset_id = request_dataset()
+    if dataset_id is None:
+        return jsonify({'erro': f"Dataset desconhecido: {request.args.get('dataset')}"}), 404
+    try:
+        tracks, k = similar_from_args(request.args)
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
+    
+    analyzer, data_version, data_mtime = published_analyzer(dataset_id)
+    try:
+        with span('similar_tracks'):
+            similar = analyzer.similar_tracks(tracks, k)
+    except KeyError as e:
+        return jsonify({'erro': e.args[0]}), 404
+    
+    response = make_response(to_json({'seeds': tracks, 'tracks': similar.to_dict(orient='records')}))
+    response.mimetype = 'application/json'
+    etag = f"{data_version[:32]}-{filters_tag((tracks, k))}-similar"
+    return revalidated(response, etag, data_mtime)
+
+@app.route('/api/playlists', methods=['POST'])
+def api_playlists():
+    """Monta um lote de playlists com a composição recomendada e o relatório de cada uma"""
+    dataset_id = request_dataset()
+    if dataset_id is None:
+        return jsonify({'erro': f"Dataset desconhecido: {request.args.get('dataset')}"}), 404
+    try:
+        specs = playlist_specs(request.get_json(silent=True), MAX_BATCH)
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
+    
+    analyzer, data_version, _ = published_analyzer(dataset_id)
+    try:
+        with span('compose_playlists'):
+            playlists = analyzer.compose_playlists(specs)
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
+    
+    satisfied = sum(p['report']['atende'] for p in playlists)
+    response = make_response(to_json({
+        'data_version': data_version,
+        'resumo': {'playlists': len(playlists), 'atendem': satisfied},
+        'playlists': playlists
+    }))
+    response.mimetype = 'application/json'
+    return response
+
 @app.route('/')
 def index():
+    dataset_id = request_dataset()
+    if dataset_id is None:
+        return f"Dataset desconhecido: {request.args.get('dataset')}", 404
     try:
-        analyzer = SpotifyAnalyzer()
-        df = analyzer.load_data()
-        graphs = {}
-        
-        def add_graph(name, func):
-            try:
-                fig = func()
-                if isinstance(fig, tuple):
-                    fig = apply_spotify_theme(fig[1])
-                    graphs[name] = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-                else:
-                    fig = apply_spotify_theme(fig)
-                    graphs[name] = json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-                return True
-            except Exception as e:
-                print(f"Erro ao gerar {name}: {e}")
-                return False
-
-        # Gerar todos os gráficos
-        add_graph('genre_popularity', analyzer.analyze_genre_popularity)
-        add_graph('explicit_analysis', analyzer.analyze_explicit_by_genre)
-        add_graph('duration_dist', analyzer.analyze_duration_distribution)
-        add_graph('popularity_trends', analyzer.analyze_popularity_trends)
-        
-        # Correlação e fatores de sucesso
-        corr_results, corr_fig = analyzer.analyze_correlations()
-        corr_fig = apply_spotify_theme(corr_fig)
-        graphs['correlation_matrix'] = json.dumps(corr_fig, cls=plotly.utils.PlotlyJSONEncoder)
-        
-        success_metrics, success_fig = analyzer.analyze_genre_success_factors()
-        success_fig = apply_spotify_theme(success_fig)
-        graphs['success_factors'] = json.dumps(success_fig, cls=plotly.utils.PlotlyJSONEncoder)
-        
-        # Gerar insights e recomendações
-        insights = analyzer.get_business_insights()
-        recommendations = analyzer.generate_recommendations()
-        
-        return render_template('index.html',
-                             graphs=graphs,
-                             insights=insights,
-                             recommendations=recommendations,
-                             success_metrics=success_metrics.to_html(
-                                 classes='table table-dark table-striped',
-                                 justify='left'
-                             ))
-    
-    except Exception as e:
-        print(f"Erro ao renderizar página: {e}")
+        filters = filters_from_args(request.args)
+    except ValueError as e:
+        return str(e), 400
+    
+    try:
+        analyzer, data_version, data_mtime = published_analyzer(dataset_id)
+        html, etag = dashboard_page(analyzer, data_version, filters)
+        return revalidated(make_response(html), etag, data_mtime)
+    
+    except Exception:
+        app.logger.exception("Erro ao renderizar página")
         return render_template('index.html',
                              graphs={},
+                             chart_names=[],
+                             filters={},
+                             api_query="",
+                             dataset_id=dataset_id,
+                             datasets={},
+                             genres=[],
+                             rows=None,
                              insights={},
                              recommendations={},
+                             catalog={},
                              success_metrics="")
 
+@app.route('/health')
+def health():
+    """Versão publicada dos artefatos do dashboard, sua idade e o estado da atualização
+    
+    Indica que o processo está vivo (sempre 200): enquanto o dashboard ainda
+    não foi montado o status é 'starting' e a primeira requisição o monta.
+    """
+    refresher.ensure_started()
+    status = refresher.health()
+    # Demais datasets já acessados neste processo
+    status['datasets'] = {
+        dataset_id: r.health() for dataset_id, r in list(refreshers.items())
+        if dataset_id != DEFAULT_DATASET
+    }
+    return jsonify(status)
+
+def warm_dashboard():
+    """Monta e publica o dashboard para a versão atual dos dados"""
+    refresher.current()
+
+if STARTUP_MODE == 'eager':
+    warm_dashboard()
+elif STARTUP_MODE == 'background':
+    threading.Thread(target=warm_dashboard, name='dashboard-warmup', daemon=True).start()
+
 if __name__ == '__main__':
+    if '--build' in sys.argv:
+        build_artifacts()
+        sys.exit(0)
+    
     # Garantir que os arquivos estáticos estejam presentes antes de iniciar
     ensure_static_files()
     app.run(debug=True, port=5001)
\ No newline at end of file
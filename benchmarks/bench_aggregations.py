@@ -0,0 +1,132 @@
+"""Benchmark do motor de agregação compartilhado (GroupAggregates).
+
+Conta quantas varreduras completas do DataFrame (groupby, máscaras booleanas
+e crosstab) uma requisição do dashboard executa, comparando com as reduções
+que cada método fazia individualmente antes da camada de agregação.
+
+Uso: python benchmarks/bench_aggregations.py
+"""
+import os
+import sys
+import time
+import warnings
+from collections import Counter
+from contextlib import contextmanager
+
+import pandas as pd
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analysis.aggregations import GroupAggregates
+from src.analysis.spotify_analyzer import SpotifyAnalyzer
+
+warnings.filterwarnings('ignore', category=FutureWarning)
+
+
+@contextmanager
+def count_scans():
+    """Instrumenta o pandas para contar operações que percorrem o frame inteiro"""
+    counter = Counter()
+    original_groupby = pd.DataFrame.groupby
+    original_getitem = pd.DataFrame.__getitem__
+    original_crosstab = pd.crosstab
+
+    def groupby(self, *args, **kwargs):
+        counter['groupby'] += 1
+        return original_groupby(self, *args, **kwargs)
+
+    def getitem(self, key):
+        if isinstance(key, pd.Series) and key.dtype == bool:
+            counter['mascara'] += 1
+        return original_getitem(self, key)
+
+    def crosstab(*args, **kwargs):
+        counter['crosstab'] += 1
+        return original_crosstab(*args, **kwargs)
+
+    pd.DataFrame.groupby = groupby
+    pd.DataFrame.__getitem__ = getitem
+    pd.crosstab = crosstab
+    try:
+        yield counter
+    finally:
+        pd.DataFrame.groupby = original_groupby
+        pd.DataFrame.__getitem__ = original_getitem
+        pd.crosstab = original_crosstab
+
+
+def legacy_reductions(df):
+    """Reduções executadas pelos métodos antes do GroupAggregates"""
+    df.groupby('genre').agg({'popularity': ['mean', 'std', 'count']})
+    df.groupby('genre')['explicit'].agg(['mean', 'count'])
+    df.groupby('popularity_category', observed=False).agg(
+        {'duration_min': 'mean', 'explicit': 'mean', 'id': 'count'}
+    )
+    # get_business_insights (executado duas vezes: direto e via generate_recommendations)
+    for _ in range(2):
+        df.groupby('genre')['popularity'].mean().nlargest(5)
+        df[df['popularity'] >= 60]['duration_min'].mean()
+        df[df['popularity'] >= 60]['duration_min'].median()
+        stats.pointbiserialr(df['explicit'], df['popularity'])
+        df['popularity_category'].value_counts()
+    # analyze_correlations
+    df[['popularity', 'duration_min']].corr()
+    groups = [df[df['genre'] == genre]['popularity'] for genre in df['genre'].unique()]
+    stats.f_oneway(*groups)
+    stats.chi2_contingency(pd.crosstab(df['genre'], df['explicit']))
+    df.groupby(['genre', 'popularity_category'], observed=False)['id'].count().unstack(fill_value=0)
+    # analyze_genre_success_factors
+    df.groupby('genre').agg({
+        'popularity': ['mean', 'std', 'count'],
+        'duration_min': 'mean',
+        'explicit': 'mean'
+    })
+
+
+def dashboard_request(analyzer):
+    """Mesmas chamadas de análise feitas pela rota '/'"""
+    analyzer.load_data()
+    analyzer.analyze_genre_popularity()
+    analyzer.analyze_explicit_by_genre()
+    analyzer.analyze_duration_distribution()
+    analyzer.analyze_popularity_trends()
+    analyzer.analyze_correlations()
+    analyzer.analyze_genre_success_factors()
+    insights = analyzer.get_business_insights()
+    analyzer.generate_recommendations(insights)
+
+
+def timed(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    analyzer = SpotifyAnalyzer()
+    df = analyzer.load_data()
+
+    with count_scans() as legacy:
+        legacy_reductions(df)
+    with count_scans() as current:
+        dashboard_request(analyzer)
+
+    print("\n=== VARREDURAS COMPLETAS POR REQUISIÇÃO ===")
+    for name in sorted(set(legacy) | set(current)):
+        print(f"{name:>10}: antes {legacy[name]:4d} | agora {current[name]:4d}")
+    saved = sum(legacy.values()) - sum(current.values())
+    print(f"{'total':>10}: antes {sum(legacy.values()):4d} | agora {sum(current.values()):4d} "
+          f"({saved} varreduras economizadas)")
+
+    print("\n=== TEMPO (melhor de 5) ===")
+    print(f"Reduções antigas:  {timed(lambda: legacy_reductions(df)) * 1000:8.2f} ms")
+    print(f"GroupAggregates:   {timed(lambda: GroupAggregates(df)) * 1000:8.2f} ms")
+    print(f"Requisição atual:  {timed(lambda: dashboard_request(analyzer)) * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
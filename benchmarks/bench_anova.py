@@ -0,0 +1,100 @@
+"""Verificação e benchmark da ANOVA/qui-quadrado por estatísticas suficientes.
+
+1. Confere F, p-valor e qui-quadrado contra `stats.f_oneway` e
+   `stats.chi2_contingency` sobre os valores brutos (dataset do projeto e
+   sintético).
+2. Mede o caminho em blocos (`load_aggregates`) num CSV sintético grande,
+   reportando tempo e pico de memória (RSS) do processo.
+
+Uso: python benchmarks/bench_anova.py [linhas] [gêneros]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_tracks
+from benchmarks.utils import peak_rss_mb
+from src.analysis.spotify_analyzer import SpotifyAnalyzer
+
+warnings.filterwarnings('ignore', category=FutureWarning)
+
+
+def reference(df):
+    """Cálculo original: uma máscara por gênero + crosstab"""
+    groups = [df[df['genre'] == genre]['popularity'] for genre in df['genre'].unique()]
+    f_statistic, p_value = stats.f_oneway(*groups)
+    chi2, p_value_chi2, _, _ = stats.chi2_contingency(pd.crosstab(df['genre'], df['explicit']))
+    return f_statistic, p_value, chi2, p_value_chi2
+
+
+def check(label, analyzer, df):
+    start = time.perf_counter()
+    expected = reference(df)
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results, _ = analyzer.analyze_correlations()
+    current_time = time.perf_counter() - start
+
+    anova = results['anova_genero_popularidade']
+    chi2 = results['chi2_genero_explicit']
+    current = (anova['f_statistic'], anova['p_value'], chi2['chi2'], chi2['p_value'])
+    np.testing.assert_allclose(current, expected, rtol=1e-8, atol=1e-300)
+    print(f"{label}: resultados iguais ao scipy | referência {reference_time:.3f} s, "
+          f"agregados {current_time:.3f} s")
+
+
+def run_child(mode, path):
+    """Executa um modo de carga num processo novo, para medir o pico de RSS isolado"""
+    analyzer = SpotifyAnalyzer()
+    analyzer.data_path = path
+    start = time.perf_counter()
+    if mode == 'blocos':
+        analyzer.load_aggregates(chunksize=250_000)
+    else:
+        analyzer.load_data(use_cache=False)
+    results, _ = analyzer.analyze_correlations()
+    elapsed = time.perf_counter() - start
+    print(f"{mode:>9}: {elapsed:6.2f} s | pico RSS {peak_rss_mb():6.0f} MB | "
+          f"F = {results['anova_genero_popularidade']['f_statistic']:.3f}, "
+          f"chi2 = {results['chi2_genero_explicit']['chi2']:.3f}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], sys.argv[3])
+        return
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    n_genres = int(sys.argv[2]) if len(sys.argv) > 2 else 3_000
+
+    analyzer = SpotifyAnalyzer()
+    check("Dataset do projeto", analyzer, analyzer.load_data())
+
+    synthetic = SpotifyAnalyzer()
+    synthetic.df = SpotifyAnalyzer.add_categories(generate_tracks(200_000, 1_000))
+    check("Sintético 200k x 1000 gêneros", synthetic, synthetic.df)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'tracks.csv')
+        for i, start in enumerate(range(0, n_rows, 500_000)):
+            chunk = generate_tracks(min(500_000, n_rows - start), n_genres, seed=i)
+            chunk.to_csv(path, mode='a', header=(i == 0), index=False)
+
+        print(f"\n{n_rows} linhas x {n_genres} gêneros:")
+        for mode in ('completo', 'blocos'):
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, path],
+                           check=True)
+
+
+if __name__ == '__main__':
+    main()
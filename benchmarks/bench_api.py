@@ -0,0 +1,84 @@
+"""Benchmark da API de gráficos: bytes e latência por gráfico.
+
+Compara, para cada gráfico do dashboard, o JSON que era embutido na página
+(spec completo via PlotlyJSONEncoder, dados brutos da duração) com o JSON
+compacto de /api/charts/<nome> e as versões gzip e brotli. Mede também a
+latência das rotas pelo test client do Flask (cache já aquecido).
+
+Uso: python benchmarks/bench_api.py [repetições]
+"""
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import plotly
+
+from app import app, CHARTS
+from src.analysis.spotify_analyzer import SpotifyAnalyzer
+from src.web.compression import brotli
+
+
+def raw_sizes():
+    """Tamanho do JSON de cada gráfico no formato antigo (embutido na página)"""
+    analyzer = SpotifyAnalyzer()
+    analyzer.load_data()
+    sizes = {}
+    for name, method in CHARTS.items():
+        kwargs = {'raw': True} if name == 'duration_dist' else {}
+        fig = getattr(analyzer, method)(**kwargs)
+        if isinstance(fig, tuple):
+            fig = fig[1]
+        sizes[name] = len(json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder))
+    return sizes
+
+
+def fetch(client, url, encoding):
+    start = time.perf_counter()
+    response = client.get(url, headers={'Accept-Encoding': encoding})
+    return response, time.perf_counter() - start
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    raw = raw_sizes()
+    client = app.test_client()
+    encodings = ['identity', 'gzip'] + (['br'] if brotli is not None else [])
+
+    start = time.perf_counter()
+    client.get('/api/charts/genre_popularity')
+    print(f"primeira requisição (monta o payload): {(time.perf_counter() - start) * 1000:.0f} ms\n")
+
+    header = f"{'gráfico':>20} {'bruto':>9} " + ' '.join(f"{e:>9}" for e in encodings)
+    print(header + f" {'ms (id)':>9}")
+    urls = {name: f"/api/charts/{name}" for name in CHARTS}
+    urls['insights'] = '/api/insights'
+    totals = dict.fromkeys(['bruto'] + encodings, 0)
+    for name, url in urls.items():
+        sizes = {}
+        for encoding in encodings:
+            response, _ = fetch(client, url, encoding)
+            sizes[encoding] = len(response.get_data())
+            totals[encoding] += sizes[encoding]
+        latency = min(fetch(client, url, 'identity')[1] for _ in range(repeats))
+        raw_size = raw.get(name)
+        totals['bruto'] += raw_size or 0
+        print(f"{name:>20} {raw_size if raw_size else '-':>9} "
+              + ' '.join(f"{sizes[e]:>9}" for e in encodings) + f" {latency * 1000:9.2f}")
+    print(f"{'total':>20} {totals['bruto']:>9} " + ' '.join(f"{totals[e]:>9}" for e in encodings))
+
+    response = client.get('/')
+    print(f"\npágina (sem gráficos embutidos): {len(response.get_data())} bytes")
+    response, _ = fetch(client, '/api/charts/duration_dist', 'gzip')
+    revalidate = client.get('/api/charts/duration_dist',
+                            headers={'Accept-Encoding': 'gzip',
+                                     'If-None-Match': response.headers['ETag']})
+    print(f"revalidação com ETag: HTTP {revalidate.status_code}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark das análises por artista e por álbum.
+
+Compara o `CatalogStore` (códigos inteiros, mapeamento artista <-> faixa
+explodido e agregações com `np.bincount`) com a versão em pandas sobre
+colunas de strings `object`: `str.split` + `explode` e `groupby` pelos
+nomes. Mede a memória das colunas de artistas/álbuns em cada
+representação, o tempo de preparo (explode ou codificação) e o tempo das
+agregações, conferindo que os resultados são iguais.
+
+Um quarto das faixas sintéticas recebe um ou dois artistas convidados
+('A, B'), para que o explode tenha o que separar.
+
+Uso: python benchmarks/bench_catalog.py [linhas] [repetições]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_tracks
+from src.analysis.catalog import CatalogStore, ARTIST_SEPARATOR
+
+
+def with_featured_artists(df, seed=0):
+    rng = np.random.default_rng(seed)
+    featured = np.flatnonzero(rng.random(len(df)) < 0.25)
+    guests = rng.integers(0, max(len(df) // 10, 1), (len(featured), 2))
+    two = rng.random(len(featured)) < 0.3
+    artists = df['artists'].to_numpy(dtype=object).copy()
+    artists[featured] = [
+        f"{artists[row]}{ARTIST_SEPARATOR}Artist {a}" + (f"{ARTIST_SEPARATOR}Artist {b}" if both else '')
+        for row, (a, b), both in zip(featured, guests, two)
+    ]
+    return df.assign(artists=artists)
+
+
+def pandas_explode(df):
+    exploded = df[['artists', 'album', 'genre', 'popularity', 'explicit']].assign(
+        artist=df['artists'].str.split(ARTIST_SEPARATOR, regex=False)
+    ).explode('artist')
+    primary = df['artists'].str.split(ARTIST_SEPARATOR, n=1, regex=False).str[0]
+    return exploded, df.assign(primary_artist=primary)
+
+
+def pandas_summaries(exploded, df):
+    artists = exploded.groupby('artist').agg(
+        track_count=('popularity', 'size'),
+        genre_count=('genre', 'nunique'),
+        popularity_mean=('popularity', 'mean'),
+        popularity_max=('popularity', 'max'),
+        explicit_share=('explicit', 'mean')
+    )
+    albums = df.groupby(['album', 'primary_artist']).agg(
+        track_count=('popularity', 'size'),
+        popularity_mean=('popularity', 'mean'),
+        explicit_share=('explicit', 'mean')
+    )
+    return artists, albums
+
+
+def store_summaries(store):
+    return store.artist_summary(), store.album_summary()
+
+
+def best_time(func, repeats):
+    best, result = float('inf'), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    df = with_featured_artists(generate_tracks(n_rows))
+    object_mb = df[['artists', 'album']].memory_usage(index=False, deep=True).sum() / 1024 ** 2
+
+    explode_s, (exploded, prepared) = best_time(lambda: pandas_explode(df), repeats)
+    exploded_mb = exploded['artist'].memory_usage(index=False, deep=True) / 1024 ** 2
+    pandas_s, (artists, albums) = best_time(lambda: pandas_summaries(exploded, prepared), repeats)
+
+    build_s, store = best_time(lambda: CatalogStore(df), repeats)
+    names_mb = (pd.Series(store.artist_names).memory_usage(index=False, deep=True)
+                + pd.Series(store.album_names).memory_usage(index=False, deep=True)) / 1024 ** 2
+    store_s, (store_artists, store_albums) = best_time(lambda: store_summaries(store), repeats)
+
+    # Mesmos números nas duas representações
+    columns = ['track_count', 'genre_count', 'popularity_mean', 'popularity_max', 'explicit_share']
+    assert np.allclose(store_artists.loc[artists.index, columns].to_numpy(), artists[columns].to_numpy())
+    store_albums = store_albums.set_index(['album', 'artist']).loc[albums.index]
+    assert np.allclose(store_albums[albums.columns].to_numpy(), albums.to_numpy())
+
+    print(f"{n_rows} linhas, {len(exploded)} pares artista-faixa, "
+          f"{len(store.artist_names)} artistas, {len(store.album_names)} álbuns")
+    print(f"{'':>24} {'memória MB':>11} {'preparo s':>10} {'agregações s':>13}")
+    print(f"{'pandas (object)':>24} {object_mb + exploded_mb:>11.1f} {explode_s:>10.2f} {pandas_s:>13.2f}")
+    print(f"{'códigos (CatalogStore)':>24} {store.nbytes / 1024 ** 2 + names_mb:>11.1f} "
+          f"{build_s:>10.2f} {store_s:>13.2f}")
+    print(f"  (códigos {store.nbytes / 1024 ** 2:.1f} MB + dicionários de nomes {names_mb:.1f} MB; "
+          f"pandas: colunas {object_mb:.1f} MB + artistas explodidos {exploded_mb:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark de carga: CSV com tipos padrão vs Parquet com tipos compactos.
+
+Para 6k (dataset do projeto), 100k e 1M linhas grava os dois formatos e
+mede, cada um num processo separado, o tempo de `SpotifyAnalyzer.read_dataset`,
+a memória do DataFrame e o pico de RSS.
+
+Uso: python benchmarks/bench_columnar.py [linhas ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_tracks
+from benchmarks.utils import peak_rss_mb
+from src.analysis.spotify_analyzer import SpotifyAnalyzer
+from src.etl.spotify_data_loader import SpotifyDataLoader
+
+
+def run_child(path):
+    start = time.perf_counter()
+    df = SpotifyAnalyzer.read_dataset(path)
+    elapsed = time.perf_counter() - start
+    frame_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+    print(f"{os.path.splitext(path)[1][1:]:>8} {elapsed * 1000:10.1f} "
+          f"{frame_mb:10.1f} {peak_rss_mb():10.0f} {os.path.getsize(path) / 1024 ** 2:10.1f}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(sys.argv[2])
+        return
+
+    sizes = [int(n) for n in sys.argv[1:]] or [None, 100_000, 1_000_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in sizes:
+            if n_rows is None:
+                df = pd.read_csv('data/processed/processed_spotify.csv')
+                label = f"dataset do projeto ({len(df)} linhas)"
+            else:
+                df = generate_tracks(n_rows)
+                label = f"{n_rows} linhas sintéticas"
+
+            csv_path = os.path.join(tmp, 'tracks.csv')
+            parquet_path = os.path.join(tmp, 'tracks.parquet')
+            df.to_csv(csv_path, index=False)
+            SpotifyDataLoader.to_compact_dtypes(df).to_parquet(parquet_path, index=False)
+
+            print(f"\n{label}")
+            print(f"{'formato':>8} {'carga ms':>10} {'frame MB':>10} {'RSS MB':>10} {'disco MB':>10}")
+            for path in (csv_path, parquet_path):
+                subprocess.run([sys.executable, os.path.abspath(__file__), '--child', path],
+                               check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Micro-benchmark do intervalo de confiança por gênero.
+
+Compara o `apply` linha a linha (uma chamada scipy por grupo) com o cálculo
+vetorizado de `confidence_interval_halfwidth`, e mede o bootstrap vetorizado.
+
+Uso: python benchmarks/bench_confidence_interval.py [n_grupos ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analysis.statistics import confidence_interval_halfwidth, bootstrap_halfwidth
+
+
+def make_metrics(n_groups, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = pd.MultiIndex.from_tuples(
+        [('popularity', 'mean'), ('popularity', 'std'), ('popularity', 'count')]
+    )
+    metrics = pd.DataFrame({
+        ('popularity', 'mean'): rng.uniform(10, 80, n_groups),
+        ('popularity', 'std'): rng.uniform(1, 25, n_groups),
+        ('popularity', 'count'): rng.integers(2, 500, n_groups)
+    }, columns=columns).round(2)
+    return metrics
+
+
+def legacy_apply(metrics):
+    return metrics.apply(
+        lambda x: stats.norm.interval(
+            0.95,
+            loc=x[('popularity', 'mean')],
+            scale=x[('popularity', 'std')] / np.sqrt(x[('popularity', 'count')])
+        )[1] - x[('popularity', 'mean')],
+        axis=1
+    )
+
+
+def vectorized(metrics, method='normal'):
+    return confidence_interval_halfwidth(
+        metrics[('popularity', 'mean')],
+        metrics[('popularity', 'std')],
+        metrics[('popularity', 'count')],
+        method=method
+    )
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1:]] or [1_000, 10_000, 50_000]
+    print(f"{'grupos':>8} {'apply (s)':>10} {'normal (ms)':>12} {'t (ms)':>8} {'speedup':>8} {'igual':>6}")
+    for n_groups in sizes:
+        metrics = make_metrics(n_groups)
+        legacy, legacy_time = timed(lambda: legacy_apply(metrics))
+        current, current_time = timed(lambda: vectorized(metrics))
+        _, t_time = timed(lambda: vectorized(metrics, method='t'))
+        same = np.array_equal(legacy.to_numpy(), current)
+        print(f"{n_groups:>8} {legacy_time:>10.3f} {current_time * 1000:>12.2f} "
+              f"{t_time * 1000:>8.2f} {legacy_time / current_time:>7.0f}x {str(same):>6}")
+
+    # Bootstrap vetorizado: 10k grupos, ~50 observações por grupo
+    n_groups, rows = 10_000, 500_000
+    rng = np.random.default_rng(1)
+    codes = rng.integers(0, n_groups, rows)
+    values = rng.integers(0, 101, rows).astype(float)
+    _, boot_time = timed(lambda: bootstrap_halfwidth(values, codes, n_groups, n_resamples=200))
+    print(f"\nBootstrap ({n_groups} grupos, {rows} linhas, 200 reamostragens): {boot_time:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
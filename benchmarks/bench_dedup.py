@@ -0,0 +1,110 @@
+"""Benchmark da detecção de faixas duplicadas.
+
+Injeta num dataset sintético de 1M linhas versões da mesma música (nome com
+outra caixa/pontuação, outro álbum, duração até 1,5 s diferente e outra
+popularidade) e "iscas": mesmo nome e artista, mas com duração 30-90 s
+maior (versões ao vivo/estendidas, que não são duplicatas). Mede o
+`find_duplicates` (blocos por chave normalizada + tolerância de duração) e
+a precisão/revocação dos pares de duplicatas encontrados, comparando com o
+agrupamento exato por (nome, artistas) e com a comparação par a par, medida
+numa amostra e extrapolada para o dataset inteiro (O(n²)).
+
+Uso: python benchmarks/bench_dedup.py [linhas] [fração de duplicatas]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_tracks
+from src.etl.deduplication import find_duplicates, normalized_keys, DURATION_TOLERANCE_MS
+
+PAIRWISE_SAMPLE = 10_000
+
+
+def with_duplicates(df, fraction, seed=0):
+    """Anexa versões e iscas de parte das faixas; retorna o dataset e o grupo real de cada linha"""
+    rng = np.random.default_rng(seed)
+    n_rows = len(df)
+    originals = rng.choice(n_rows, int(n_rows * fraction), replace=False)
+    decoys = rng.choice(n_rows, int(n_rows * fraction / 5), replace=False)
+
+    copies = df.iloc[originals].copy()
+    variant = rng.integers(0, 3, len(copies))
+    names = copies['name'].to_numpy(dtype=object)
+    copies['name'] = np.where(variant == 0, np.char.upper(names.astype(str)),
+                              np.where(variant == 1, np.char.replace(names.astype(str), ' ', ' - '), names))
+    copies['album'] = [f"Compilation {i}" for i in rng.integers(0, 1000, len(copies))]
+    copies['duration_ms'] += rng.integers(-DURATION_TOLERANCE_MS * 3 // 4, DURATION_TOLERANCE_MS * 3 // 4,
+                                          len(copies))
+    copies['popularity'] = rng.integers(0, 101, len(copies))
+
+    extended = df.iloc[decoys].copy()
+    extended['duration_ms'] += rng.integers(30_000, 90_000, len(extended))
+
+    result = pd.concat([df, copies, extended], ignore_index=True)
+    result['duration_min'] = result['duration_ms'] / 60000
+    truth = np.concatenate([np.arange(n_rows), originals, n_rows + np.arange(len(extended))])
+    return result, truth
+
+
+def pair_scores(predicted, truth):
+    """Precisão e revocação dos pares de linhas colocados no mesmo grupo"""
+    def pairs(labels):
+        counts = np.bincount(pd.factorize(labels)[0])
+        return (counts * (counts - 1) // 2).sum()
+
+    both = pairs(predicted.astype(np.int64) * (len(truth) + 1) + truth)
+    return both / max(pairs(predicted), 1), both / max(pairs(truth), 1)
+
+
+def pairwise(df, tolerance_ms):
+    """Compara cada linha com todas as seguintes (referência O(n²))"""
+    keys = normalized_keys(df)
+    duration = df['duration_ms'].to_numpy(dtype=np.int64)
+    matches = 0
+    for i in range(len(df) - 1):
+        matches += np.count_nonzero(
+            (keys[i + 1:] == keys[i]) & (np.abs(duration[i + 1:] - duration[i]) <= tolerance_ms)
+        )
+    return matches
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    fraction = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+
+    df, truth = with_duplicates(generate_tracks(n_rows), fraction)
+    print(f"{n_rows} faixas + {len(df) - n_rows} versões/iscas injetadas = {len(df)} linhas")
+
+    start = time.perf_counter()
+    normalized_keys(df)
+    keys_s = time.perf_counter() - start
+    start = time.perf_counter()
+    mapping = find_duplicates(df)
+    dedup_s = time.perf_counter() - start
+
+    exact = pd.factorize(df['name'] + '\x1f' + df['artists'])[0]
+    print(f"{'':>28} {'tempo s':>9} {'precisão':>9} {'revocação':>10} {'descartadas':>12}")
+    precision, recall = pair_scores(mapping['track_group'].to_numpy(), truth)
+    print(f"{'blocos + tolerância':>28} {dedup_s:>9.2f} {precision:>9.1%} {recall:>10.1%} "
+          f"{mapping['duplicate'].sum():>12}")
+    precision, recall = pair_scores(exact, truth)
+    print(f"{'(nome, artistas) exatos':>28} {'':>9} {precision:>9.1%} {recall:>10.1%} "
+          f"{len(df) - len(np.unique(exact)):>12}")
+    print(f"  (normalização e hash das chaves: {keys_s:.2f} s do total)")
+
+    sample = df.sample(min(PAIRWISE_SAMPLE, len(df)), random_state=0)
+    start = time.perf_counter()
+    pairwise(sample, DURATION_TOLERANCE_MS)
+    sample_s = time.perf_counter() - start
+    print(f"par a par: {sample_s:.2f} s para {len(sample)} linhas, "
+          f"~{sample_s * (len(df) / len(sample)) ** 2 / 3600:.1f} h extrapolado para {len(df)} linhas")
+
+
+if __name__ == '__main__':
+    main()
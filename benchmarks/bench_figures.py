@@ -0,0 +1,87 @@
+"""Benchmark da montagem das figuras do dashboard por requisição.
+
+Para cada gráfico mede o método do analyzer (agregados já em cache, então
+o tempo é basicamente o de montar a figura) em três modos:
+
+  - tema por chamada: figura validada + update_layout/update_xaxes/update_yaxes
+    a cada chamada, como fazia o antigo apply_spotify_theme
+  - validado:         template 'spotify' na construção, com os validadores
+  - sem validação:    template pré-validado e specs internos sem validação
+                      (padrão do dashboard)
+
+Uso: python benchmarks/bench_figures.py [repetições]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from app import CHARTS
+from src.analysis import theme
+from src.analysis.spotify_analyzer import SpotifyAnalyzer
+
+
+def legacy_theme(fig):
+    """O antigo apply_spotify_theme: três atualizações validadas por figura"""
+    fig.update_layout(
+        paper_bgcolor='#121212', plot_bgcolor='#282828', font_color='#FFFFFF',
+        title_font_color='#1DB954', title_x=0.5, margin=dict(t=50, r=50, b=50, l=50),
+        showlegend=True,
+        legend=dict(font=dict(color='#FFFFFF'), bgcolor='rgba(0,0,0,0)', bordercolor='#404040')
+    )
+    fig.update_xaxes(gridcolor='#404040', linecolor='#404040', tickfont=dict(color='#FFFFFF'))
+    fig.update_yaxes(gridcolor='#404040', linecolor='#404040', tickfont=dict(color='#FFFFFF'))
+    return fig
+
+
+def build(analyzer, method, themed):
+    fig = getattr(analyzer, method)()
+    if isinstance(fig, tuple):
+        fig = fig[1]
+    if themed:
+        legacy_theme(fig)
+    return fig
+
+
+def best_time(func, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = SpotifyAnalyzer()
+        analyzer.load_data()
+        for method in CHARTS.values():
+            getattr(analyzer, method)()
+
+    modes = {
+        'tema por chamada': (True, True),
+        'validado': (True, False),
+        'sem validação': (False, False),
+    }
+    totals = dict.fromkeys(modes, 0.0)
+    print(f"{'gráfico':>20}" + ''.join(f"{mode + ' ms':>22}" for mode in modes))
+    for name, method in CHARTS.items():
+        row = f"{name:>20}"
+        for mode, (validate, themed) in modes.items():
+            theme.VALIDATE_FIGURES = validate
+            elapsed = best_time(lambda: build(analyzer, method, themed), repeats)
+            totals[mode] += elapsed
+            row += f"{elapsed * 1000:>22.2f}"
+        print(row)
+    print(f"{'total':>20}" + ''.join(f"{totals[mode] * 1000:>22.2f}" for mode in modes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark da montagem de playlists em lote.
+
+Para um dataset sintético de 1M linhas mede a construção do
+`PlaylistComposer`, o primeiro cálculo dos pools de uma duração ideal e a
+latência (mediana e p99 de várias repetições) de lotes de playlists de 20
+músicas com as mesmas restrições e com restrições variadas, junto com a
+fração de playlists que atende a todas as restrições. Como referência,
+monta playlists uma a uma com máscaras e amostragem do pandas.
+
+Uso: python benchmarks/bench_playlists.py [linhas] [repetições]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_tracks
+from src.analysis.playlists import (
+    PlaylistComposer, POPULARITY_BUCKETS, PLAYLIST_MIX, bucket_counts, normalize_playlist_request
+)
+
+GENRES = [f"genre_{i:05d}" for i in range(5)]
+DEFAULTS = {'genres': GENRES, 'duration': 3.5}
+
+
+def pandas_playlist(df, genres, duration, tolerance, length, seed):
+    """Uma playlist por vez: filtra cada grupo/gênero e sorteia as músicas"""
+    rng = np.random.default_rng(seed)
+    counts = bucket_counts(length, list(PLAYLIST_MIX.values()))
+    near = (df['duration_min'] - duration).abs() <= tolerance
+    tracks = []
+    for (low, high), count in zip(POPULARITY_BUCKETS.values(), counts):
+        for i in range(count):
+            genre = genres[i % len(genres)]
+            candidates = df[near & df['popularity'].between(low, high) & (df['genre'] == genre)]
+            candidates = candidates[~candidates['id'].isin(tracks)]
+            tracks.append(candidates['id'].iloc[rng.integers(len(candidates))])
+    return tracks
+
+
+def latency(composer, requests, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        playlists = composer.compose(requests)
+        times.append(time.perf_counter() - start)
+    satisfied = sum(report['atende'] for _, report in playlists) / len(playlists)
+    return np.median(times) * 1000, np.percentile(times, 99) * 1000, satisfied
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    df = generate_tracks(n_rows)
+    start = time.perf_counter()
+    composer = PlaylistComposer(df)
+    print(f"{n_rows} linhas: composer {time.perf_counter() - start:.2f} s", end='')
+    start = time.perf_counter()
+    composer.pools(3.5, 1.0)
+    print(f", pools da duração ideal {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    batches = {}
+    for size in (1, 100, 1_000, 10_000):
+        batches[f"{size} iguais"] = [
+            normalize_playlist_request({'seed': seed}, DEFAULTS) for seed in range(size)
+        ]
+    # Restrições variadas: 20 combinações de gêneros e duração (pools já em cache)
+    varied = [{'genres': [f"genre_{(i % 20 * 7 + j) % 100:05d}" for j in range(5)],
+               'duration': (3.0, 3.5, 4.0)[i % 20 % 3], 'seed': i} for i in range(1_000)]
+    batches['1000 variadas'] = [normalize_playlist_request(spec, DEFAULTS) for spec in varied]
+    for duration in (3.0, 4.0):
+        composer.pools(duration, 1.0)
+
+    print(f"{'lote':>16} {'mediana ms':>11} {'p99 ms':>8} {'µs/playlist':>12} {'atendem':>8}")
+    for name, requests in batches.items():
+        median, p99, satisfied = latency(composer, requests, repeats)
+        print(f"{name:>16} {median:>11.2f} {p99:>8.2f} {median * 1000 / len(requests):>12.1f} {satisfied:>8.1%}")
+
+    start = time.perf_counter()
+    for seed in range(3):
+        pandas_playlist(df, GENRES, 3.5, 1.0, 20, seed)
+    print(f"{'pandas (1 a 1)':>16} {(time.perf_counter() - start) / 3 * 1000:>11.0f} ms por playlist")
+
+
+if __name__ == '__main__':
+    main()
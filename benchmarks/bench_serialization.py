@@ -0,0 +1,89 @@
+"""Benchmark da serialização de figuras: tamanho do payload e tempo de codificação.
+
+Para figuras de dispersão com 10 mil, 100 mil e 1 milhão de pontos (x e y
+float, cor inteira por popularidade), compara:
+
+  - antigo:      json.dumps(fig, cls=PlotlyJSONEncoder) e, como era embutido
+                 na página, a string passada de novo pelo tojson do Jinja
+  - texto:       figure_to_json sem typed arrays (orjson, se instalado)
+  - typed array: figure_to_json com os arrays numéricos em base64
+
+Confere também que os typed arrays decodificam para os valores originais.
+
+Uso: python benchmarks/bench_serialization.py [pontos ...]
+"""
+import base64
+import gzip
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import plotly
+import plotly.graph_objects as go
+
+from src.web.serialization import figure_to_json, orjson
+
+
+def scatter(n_points, seed=0):
+    rng = np.random.default_rng(seed)
+    return go.Figure(go.Scattergl(
+        x=rng.lognormal(np.log(3.5), 0.3, n_points),
+        y=rng.normal(40, 15, n_points),
+        mode='markers',
+        marker=dict(color=rng.integers(0, 101, n_points), colorscale='Viridis')
+    ))
+
+
+def best_time(func, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def check_typed_arrays(fig, body):
+    trace = json.loads(body)['data'][0]
+    decoded = {
+        'x': trace['x'], 'y': trace['y'], 'color': trace['marker']['color']
+    }
+    expected = {'x': fig.data[0].x, 'y': fig.data[0].y, 'color': fig.data[0].marker.color}
+    for key, spec in decoded.items():
+        values = np.frombuffer(base64.b64decode(spec['bdata']), dtype=np.dtype(spec['dtype']).newbyteorder('<'))
+        assert np.array_equal(values, expected[key]), key
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"serializador: {'orjson ' + orjson.__version__ if orjson else 'json (orjson ausente)'}")
+    for n_points in sizes:
+        fig = scatter(n_points)
+        repeats = 5 if n_points <= 100_000 else 2
+
+        modes = {
+            'antigo': lambda: json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder),
+            'antigo + tojson': lambda: json.dumps(json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)),
+            'texto': lambda: figure_to_json(fig, typed_arrays=False),
+            'typed array': lambda: figure_to_json(fig),
+        }
+
+        print(f"\n{n_points} pontos")
+        print(f"{'modo':>16} {'ms':>10} {'KB':>10} {'KB gzip':>10}")
+        for mode, encode in modes.items():
+            body, elapsed = best_time(encode, repeats)
+            data = body.encode('utf-8')
+            gzipped = gzip.compress(data, compresslevel=6, mtime=0)
+            print(f"{mode:>16} {elapsed * 1000:>10.1f} {len(data) / 1024:>10.0f} "
+                  f"{len(gzipped) / 1024:>10.0f}")
+            if mode == 'typed array':
+                check_typed_arrays(fig, body)
+
+
+if __name__ == '__main__':
+    main()
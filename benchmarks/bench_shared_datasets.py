@@ -0,0 +1,100 @@
+"""Benchmark dos datasets compartilhados entre processos (arquivo Arrow mapeado).
+
+Gera um dataset processado sintético e abre N processos "worker" que
+carregam o mesmo dataset pelo DatasetCache ao mesmo tempo, com e sem o
+diretório de colunas compartilhadas. Para cada worker mede o tempo de carga
+e a memória após rodar uma análise: anônima (privada do processo), mapeada de
+arquivo e PSS (memória proporcional, que divide as páginas compartilhadas
+entre os processos que as usam).
+
+Uso: python benchmarks/bench_shared_datasets.py [linhas] [workers]
+"""
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate_tracks
+
+CHILD = """
+import contextlib, io, json, sys, time
+from src.analysis.spotify_analyzer import SpotifyAnalyzer
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    analyzer = SpotifyAnalyzer()
+    analyzer.load_data()
+loaded = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    analyzer.get_business_insights()
+    analyzer.filtered((('genres', ('genre_00001',)),))
+
+# Mede só depois que todos os workers carregaram (o PSS divide as páginas entre eles)
+print('pronto', flush=True)
+sys.stdin.readline()
+memory = {}
+with open('/proc/self/smaps_rollup') as f:
+    for line in f:
+        key, _, value = line.partition(':')
+        if key in ('Rss', 'Pss', 'Anonymous'):
+            memory[key] = int(value.split()[0]) / 1024
+with open('/proc/self/status') as f:
+    for line in f:
+        if line.startswith('RssFile:'):
+            memory['RssFile'] = int(line.split()[1]) / 1024
+print(json.dumps({'load_s': loaded - start, **memory}), flush=True)
+sys.stdin.read()  # continua vivo até os demais medirem
+"""
+
+
+def run_workers(tmp, n_workers, store_dir):
+    env = {**os.environ, 'PYTHONPATH': ROOT, 'DASHBOARD_COLUMN_STORE': store_dir}
+    workers = [
+        subprocess.Popen([sys.executable, '-c', CHILD], cwd=tmp, env=env,
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(n_workers)
+    ]
+    for worker in workers:
+        assert worker.stdout.readline().strip() == 'pronto'
+    for worker in workers:
+        worker.stdin.write('\n')
+        worker.stdin.flush()
+    results = [json.loads(worker.stdout.readline()) for worker in workers]
+    for worker in workers:
+        worker.communicate('')
+    return results
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    with tempfile.TemporaryDirectory() as tmp:
+        processed = os.path.join(tmp, 'data', 'processed')
+        os.makedirs(processed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_tracks(n_rows).to_parquet(os.path.join(processed, 'processed_spotify.parquet'))
+        store_dir = os.path.join(tmp, 'data', 'cache', 'columns')
+
+        print(f"{n_rows} linhas, {n_workers} workers")
+        print(f"{'modo':>22} {'carga s':>9} {'anônima MB':>11} {'arquivo MB':>11} {'PSS MB':>8}")
+        modes = [
+            ('privado', ''),
+            ('compartilhado (frio)', store_dir),
+            ('compartilhado', store_dir),
+        ]
+        for mode, store in modes:
+            results = run_workers(tmp, n_workers, store)
+            mean = {key: sum(r[key] for r in results) / len(results) for key in results[0]}
+            print(f"{mode:>22} {mean['load_s']:>9.2f} {mean['Anonymous']:>11.0f} "
+                  f"{mean['RssFile']:>11.0f} {mean['Pss']:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
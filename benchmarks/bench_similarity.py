@@ -0,0 +1,95 @@
+"""Benchmark do índice de similaridade ("mais como esta" e completar playlist).
+
+Para um dataset sintético de 1M linhas mede a construção do
+`SimilarityIndex`, a gravação e a reabertura (mapeada em memória) do índice
+persistido, e a vazão de consultas de uma música (k=10) e de playlists de 10
+sementes (k=25). As respostas são conferidas contra uma varredura completa
+ingênua (distância de todas as linhas, ordenação por gênero e distância).
+
+Uso: python benchmarks/bench_similarity.py [linhas] [consultas]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_tracks
+from src.analysis.similarity import SimilarityIndex, ARTIST_WEIGHT
+
+
+def full_scan(index, track_ids, k):
+    """Varredura de todas as linhas, sem blocos por gênero (referência)"""
+    seeds = np.concatenate([index.positions(t) for t in track_ids])
+    features = np.asarray(index.features, dtype=np.float64).T
+    distance = ((features[:, None, :] - features[seeds][None, :, :]) ** 2).sum(axis=2)
+    distance += ARTIST_WEIGHT * (index.artists[:, None] != index.artists[seeds][None, :])
+    genres = index._genre_of(np.arange(len(index)))
+    same_genre = genres[:, None] == genres[seeds][None, :]
+    seed_genres = same_genre.any(axis=1)
+    # Nos gêneros das sementes, só as sementes do mesmo gênero contam; esses
+    # gêneros vêm primeiro, e cada faixa aparece uma vez, sem as sementes
+    distance[seed_genres[:, None] & ~same_genre] = np.inf
+    distance = distance.min(axis=1).astype(np.float32)
+    order = np.lexsort((np.arange(len(index)), distance, ~seed_genres))
+    seen, result = set(index.id_codes[seeds]), []
+    for position in order:
+        code = index.id_codes[position]
+        if code not in seen:
+            seen.add(code)
+            result.append(index.order[position])
+            if len(result) == k:
+                break
+    return np.array(result)
+
+
+def throughput(index, queries, k):
+    start = time.perf_counter()
+    for track_ids in queries:
+        index.query(track_ids, k)
+    elapsed = time.perf_counter() - start
+    return len(queries) / elapsed, elapsed / len(queries) * 1000
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rng = np.random.default_rng(1)
+
+    df = generate_tracks(n_rows)
+    start = time.perf_counter()
+    index = SimilarityIndex(df)
+    print(f"{n_rows} linhas: construção do índice {time.perf_counter() - start:.2f} s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = os.path.join(tmp, 'similarity')
+        start = time.perf_counter()
+        index.save(directory)
+        size = sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory))
+        print(f"gravação {time.perf_counter() - start:.2f} s ({size / 1024 ** 2:.1f} MB)")
+        start = time.perf_counter()
+        index = SimilarityIndex.load(directory)
+        print(f"reabertura {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        ids = df['id'].to_numpy()
+        single = [[ids[i]] for i in rng.integers(0, n_rows, n_queries)]
+        playlists = [list(ids[rng.integers(0, n_rows, 10)]) for _ in range(max(n_queries // 10, 1))]
+
+        for name, queries, k in [('uma música, k=10', single, 10), ('playlist de 10, k=25', playlists, 25)]:
+            for track_ids in queries[:5]:
+                rows, _ = index.query(track_ids, k)
+                assert np.array_equal(rows, full_scan(index, track_ids, k)), name
+            rate, latency = throughput(index, queries, k)
+            print(f"{name:>22}: {rate:8.0f} consultas/s ({latency:.2f} ms por consulta)")
+
+        start = time.perf_counter()
+        for track_ids in single[:5]:
+            full_scan(index, track_ids, 10)
+        print(f"{'varredura completa':>22}: {(time.perf_counter() - start) / 5 * 1000:.0f} ms por consulta")
+
+
+if __name__ == '__main__':
+    main()
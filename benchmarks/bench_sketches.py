@@ -0,0 +1,118 @@
+"""Precisão e custo dos sketches de quantis (t-digest) da duração.
+
+1. Precisão no dataset do projeto: compara os quantis dos sketches com
+   `np.quantile` exato para o dataset inteiro, popularidade >= 60
+   (duracao_ideal), cada faixa de popularidade e cada gênero com ao menos
+   40 faixas. O erro é medido em minutos e em posição (rank) e o script
+   falha se o erro de rank passar de `MAX_RANK_ERROR`.
+2. Custo em 1M linhas sintéticas: construção, construção em blocos +
+   merge, consulta da mediana e memória dos sketches vs a coluna.
+
+Uso: python benchmarks/bench_sketches.py [linhas]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_tracks
+from src.analysis.sketches import BAND_WIDTH, QuantileSketches
+from src.analysis.statistics import distribution_summary
+
+QUANTILES = [0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99]
+MAX_RANK_ERROR = 0.01
+
+
+def rank_error(values, estimate, exact):
+    """Distância, em fração das faixas, entre os ranks do valor estimado e do exato"""
+    values = np.sort(values)
+    estimate_rank = np.searchsorted(values, estimate, side='left')
+    exact_rank = np.searchsorted(values, exact, side='left')
+    return np.abs(estimate_rank - exact_rank) / len(values)
+
+
+def check_accuracy(df):
+    sketches = QuantileSketches(df)
+    selections = {'dataset inteiro': ({}, df)}
+    selections['popularidade >= 60'] = ({'popularity_min': 60}, df[df['popularity'] >= 60])
+    for band in range(0, 100, BAND_WIDTH):
+        high = band + BAND_WIDTH - 1 if band + BAND_WIDTH < 100 else 100
+        subset = df[df['popularity'].between(band, high)]
+        if len(subset):
+            selections[f"popularidade {band}-{high}"] = (
+                {'popularity_min': band, 'popularity_max': high}, subset
+            )
+    counts = df['genre'].value_counts()
+    for genre in counts[counts >= 40].index:
+        selections[f"gênero {genre}"] = ({'genres': [genre]}, df[df['genre'] == genre])
+
+    rows = []
+    for label, (query, subset) in selections.items():
+        values = subset['duration_min'].to_numpy()
+        digest = sketches.digest(**query)
+        estimate = digest.quantile(QUANTILES)
+        exact = np.quantile(values, QUANTILES)
+        rows.append({
+            'seleção': label,
+            'faixas': len(values),
+            'centroides': len(digest.means),
+            'erro abs máx (min)': np.abs(estimate - exact).max(),
+            'erro rank máx': rank_error(values, estimate, exact).max(),
+            'erro mediana (min)': abs(digest.median() - np.median(values))
+        })
+    report = pd.DataFrame(rows).set_index('seleção')
+    with pd.option_context('display.width', 160, 'display.max_columns', 10):
+        print(report.sort_values('erro rank máx', ascending=False).head(15).round(4))
+        print(f"... {len(report)} seleções; erro de rank máximo: {report['erro rank máx'].max():.4f}")
+
+    exact = distribution_summary(df['duration_min'])
+    approx = sketches.digest().summary()
+    print("\nResumo do violino (exato vs sketch):")
+    for key in ('q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean'):
+        print(f"  {key:>10}: {exact[key]:8.4f} {approx[key]:8.4f}")
+    print(f"  {'outliers':>10}: {len(exact['outliers']):8d} {len(approx['outliers']):8d}")
+    print(f"  densidade: erro abs máx {np.abs(np.interp(exact['grid'], approx['grid'], approx['density']) - exact['density']).max():.4f} "
+          f"(pico {exact['density'].max():.4f})")
+    return report['erro rank máx'].max()
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def measure_cost(n_rows):
+    df = generate_tracks(n_rows)
+    sketches, build = timed(lambda: QuantileSketches(df))
+    chunks = [df.iloc[i:i + 250_000] for i in range(0, n_rows, 250_000)]
+    _, chunked = timed(lambda: QuantileSketches.merge(QuantileSketches(c) for c in chunks))
+    digest, query = timed(lambda: sketches.digest(popularity_min=60))
+    _, exact = timed(lambda: df.loc[df['popularity'] >= 60, 'duration_min'].median())
+
+    sketch_mb = (sketches.means.nbytes + sketches.weights.nbytes + sketches.cell_codes.nbytes
+                 + sketches.cells.memory_usage(deep=True).sum()) / 1024 ** 2
+    print(f"\n{n_rows} linhas sintéticas, {len(sketches.cells)} células gênero x faixa")
+    print(f"construção: {build * 1000:.0f} ms | em blocos + merge: {chunked * 1000:.0f} ms")
+    print(f"mediana (popularidade >= 60): sketch {query * 1000:.1f} ms | exata {exact * 1000:.1f} ms")
+    print(f"memória: sketches {sketch_mb:.1f} MB ({len(sketches.means)} centroides) | "
+          f"coluna {df['duration_min'].nbytes / 1024 ** 2:.1f} MB")
+
+
+def main():
+    df = pd.read_csv('data/processed/processed_spotify.csv')
+    print(f"=== PRECISÃO NO DATASET DO PROJETO ({len(df)} faixas) ===")
+    worst = check_accuracy(df)
+
+    measure_cost(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
+
+    if worst > MAX_RANK_ERROR:
+        sys.exit(f"Erro de rank {worst:.4f} acima do limite {MAX_RANK_ERROR}")
+
+
+if __name__ == '__main__':
+    main()
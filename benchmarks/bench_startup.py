@@ -0,0 +1,51 @@
+"""Benchmark de inicialização: tempo de import do app e time-to-first-byte.
+
+Para cada modo de DASHBOARD_STARTUP, num processo novo, mede o tempo de
+`import app` e o tempo até a primeira resposta de '/' pelo test client do
+Flask (que inclui montar o dashboard, se ainda não estiver no cache).
+
+Uso: python benchmarks/bench_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().get('/')
+first_byte = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - start,
+    'ttfb_s': first_byte - imported,
+    'status': response.status_code
+}))
+"""
+
+
+def measure(mode):
+    env = {**os.environ, 'DASHBOARD_STARTUP': mode, 'PYTHONPATH': ROOT}
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', CHILD], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    total = time.perf_counter() - start
+    metrics = json.loads(result.stdout.strip().splitlines()[-1])
+    metrics['processo_s'] = total
+    return metrics
+
+
+def main():
+    print(f"{'modo':>12} {'import s':>10} {'TTFB s':>10} {'processo s':>12}")
+    for mode in ('lazy', 'background', 'eager'):
+        m = measure(mode)
+        print(f"{mode:>12} {m['import_s']:>10.2f} {m['ttfb_s']:>10.3f} {m['processo_s']:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
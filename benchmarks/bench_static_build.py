@@ -0,0 +1,70 @@
+"""Benchmark do build do site estático (generate_static.py).
+
+Num diretório temporário, com um catálogo sintético, mede:
+- build completo (inclui comprimir o plotly.js com brotli);
+- novo build sem mudanças (tudo reaproveitado pelo manifesto);
+- build após mudar só o template (apenas a página é refeita);
+- build após uma nova versão dos dados (dados e página refeitos).
+
+Imprime o relatório de cada build (tempo e tamanhos original/gzip/brotli).
+
+Uso: python benchmarks/bench_static_build.py [linhas]
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate_tracks
+from src.analysis.datasets import DatasetRegistry
+from src.web.static_site import StaticSiteBuilder, print_report
+
+
+def build(output_dir, template_dir, registry):
+    builder = StaticSiteBuilder(output_dir, static_dir=os.path.join(ROOT, 'static'),
+                                template_dir=template_dir, registry=registry, dataset_ids=['sintetico'])
+    start = time.perf_counter()
+    # O analyzer imprime o progresso; aqui interessa só o relatório
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = builder.build()
+    return time.perf_counter() - start, report
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.join(tmp, 'data')
+        template_dir = os.path.join(tmp, 'templates')
+        output_dir = os.path.join(tmp, 'site')
+        os.makedirs(data_dir)
+        shutil.copytree(os.path.join(ROOT, 'templates'), template_dir)
+        data_file = os.path.join(data_dir, 'processed_spotify.csv')
+        generate_tracks(n_rows).to_csv(data_file, index=False)
+        registry = DatasetRegistry({'sintetico': {'path': data_dir, 'title': 'Sintético'}})
+
+        def touch_template():
+            with open(os.path.join(template_dir, 'index.html'), 'a', encoding='utf-8') as f:
+                f.write('\n<!-- build -->\n')
+
+        def new_data():
+            generate_tracks(n_rows, seed=1).to_csv(data_file, index=False)
+
+        steps = [('completo', None), ('sem mudanças', None),
+                 ('template alterado', touch_template), ('dados novos', new_data)]
+        for name, change in steps:
+            if change is not None:
+                change()
+            elapsed, report = build(output_dir, template_dir, registry)
+            print(f"\n=== {name}: {elapsed:.2f} s ({n_rows} linhas) ===")
+            print_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark do ETL em blocos: pico de memória vs tamanho do arquivo bruto.
+
+Gera arquivos brutos sintéticos de tamanhos crescentes e roda, cada um num
+processo separado (com o diretório temporário como cwd), `process_data`
+(tudo em memória) e `process_data_streaming`.
+
+Uso: python benchmarks/bench_streaming_etl.py [linhas ...]
+"""
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate_tracks
+from benchmarks.utils import peak_rss_mb
+from src.etl.spotify_data_loader import SpotifyDataLoader
+
+
+def run_child(mode):
+    loader = SpotifyDataLoader()
+    start = time.perf_counter()
+    # O ETL imprime o perfil completo; aqui interessa só o tempo e a memória
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == 'blocos':
+            loader.process_data_streaming(chunksize=100_000)
+        else:
+            loader.process_data()
+    elapsed = time.perf_counter() - start
+    print(f"{mode:>10} {elapsed:10.2f} {peak_rss_mb():10.0f}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(sys.argv[2])
+        return
+
+    sizes = [int(n) for n in sys.argv[1:]] or [100_000, 500_000, 1_000_000]
+    for n_rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            raw_dir = os.path.join(tmp, 'data', 'raw')
+            os.makedirs(raw_dir)
+            raw_file = os.path.join(raw_dir, 'spoty_tracks.csv')
+            for i, start in enumerate(range(0, n_rows, 250_000)):
+                chunk = generate_tracks(min(250_000, n_rows - start), seed=i)
+                chunk.drop(columns=['duration_min']).to_csv(
+                    raw_file, mode='a', header=(i == 0), index=False
+                )
+
+            print(f"\n{n_rows} linhas brutas ({os.path.getsize(raw_file) / 1024 ** 2:.0f} MB)")
+            print(f"{'modo':>10} {'tempo s':>10} {'RSS MB':>10}")
+            for mode in ('completo', 'blocos'):
+                subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--child', mode],
+                    cwd=tmp, check=True, env={**os.environ, 'PYTHONPATH': ROOT}
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""Suíte de benchmarks do analyzer e da aplicação web sobre dados sintéticos.
+
+Para cada tamanho de dataset, num processo novo (diretório temporário como
+cwd, com `data/raw` gerado por `synthetic.generate_tracks`), mede:
+
+  - etl: `process_data_streaming` do SpotifyDataLoader (bruto -> processado)
+  - load_data: primeira leitura do processado (cache frio) e leitura com cache
+  - cada analyze_*, get_business_insights e generate_recommendations
+    (mediana de N repetições, dataset já carregado)
+  - '/': primeira resposta (monta o dashboard) e vazão com o cache aquecido
+    pelo test client do Flask
+
+Os resultados vão para um JSON (padrão: benchmarks/results/<commit>.json)
+com o commit, a versão do Python e os tempos de cada etapa. `--compare`
+mostra a razão entre dois arquivos de resultado, etapa por etapa.
+
+Uso: python benchmarks/bench_suite.py [--rows 10000 100000] [--genres 120]
+                                      [--repeats 5] [--requests 200] [--output arquivo]
+     python benchmarks/bench_suite.py --compare antes.json depois.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ANALYZER_STEPS = [
+    'analyze_genre_popularity',
+    'analyze_explicit_by_genre',
+    'analyze_duration_distribution',
+    'analyze_popularity_trends',
+    'analyze_correlations',
+    'analyze_genre_success_factors',
+    'analyze_artist_popularity',
+    'analyze_catalog',
+    'deduplicated',
+    'get_business_insights',
+    'generate_recommendations'
+]
+
+
+def timings(func, repeats):
+    """Tempos (s) de `repeats` chamadas de `func`, com a saída do analyzer silenciada"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        samples.append(time.perf_counter() - start)
+    return {
+        'median_s': statistics.median(samples),
+        'min_s': min(samples),
+        'repeats': repeats
+    }
+
+
+def write_raw(n_rows, n_genres, seed):
+    """Grava o dataset bruto sintético em data/raw (relativo ao cwd) em blocos"""
+    from benchmarks.synthetic import generate_tracks
+
+    raw_dir = os.path.join('data', 'raw')
+    os.makedirs(raw_dir, exist_ok=True)
+    raw_file = os.path.join(raw_dir, 'spoty_tracks.csv')
+    for i, start in enumerate(range(0, n_rows, 250_000)):
+        chunk = generate_tracks(min(250_000, n_rows - start), n_genres=n_genres, seed=seed + i)
+        chunk.drop(columns=['duration_min']).to_csv(
+            raw_file, mode='a', header=(i == 0), index=False
+        )
+    return os.path.getsize(raw_file)
+
+
+def run_child(args):
+    """Executa as medições de um tamanho de dataset (cwd = diretório temporário)"""
+    results = {'rows': args.rows[0], 'genres': args.genres}
+    results['raw_mb'] = write_raw(args.rows[0], args.genres, args.seed) / 1024 ** 2
+
+    from benchmarks.utils import peak_rss_mb
+    from src.etl.spotify_data_loader import SpotifyDataLoader
+
+    steps = {}
+    steps['etl'] = timings(lambda: SpotifyDataLoader().process_data_streaming(), 1)
+
+    os.environ['DASHBOARD_REFRESH'] = 'sync'
+    os.environ['DASHBOARD_STARTUP'] = 'lazy'
+    from src.analysis.spotify_analyzer import SpotifyAnalyzer
+
+    analyzer = SpotifyAnalyzer()
+    steps['load_data_cold'] = timings(analyzer.load_data, 1)
+    steps['load_data_cached'] = timings(analyzer.load_data, args.repeats)
+
+    for step in ANALYZER_STEPS:
+        method = getattr(analyzer, step)
+        # A primeira chamada monta estruturas derivadas (cubo, sketches, índices)
+        steps[f"{step}_first"] = timings(method, 1)
+        steps[step] = timings(method, args.repeats)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import app
+    client = app.test_client()
+    steps['index_first'] = timings(lambda: client.get('/'), 1)
+
+    status = client.get('/').status_code
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        client.get('/')
+    elapsed = time.perf_counter() - start
+    steps['index'] = {
+        'median_s': elapsed / args.requests,
+        'requests_per_s': args.requests / elapsed,
+        'requests': args.requests,
+        'status': status
+    }
+
+    results['steps'] = steps
+    results['peak_rss_mb'] = peak_rss_mb()
+    print(json.dumps(results))
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'desconhecido'
+
+
+def run_suite(args):
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {'genres': args.genres, 'repeats': args.repeats,
+                   'requests': args.requests, 'seed': args.seed},
+        'datasets': []
+    }
+
+    for n_rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            result = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child',
+                 '--rows', str(n_rows), '--genres', str(args.genres),
+                 '--repeats', str(args.repeats), '--requests', str(args.requests),
+                 '--seed', str(args.seed)],
+                cwd=tmp, env={**os.environ, 'PYTHONPATH': ROOT},
+                capture_output=True, text=True, check=True
+            )
+        dataset = json.loads(result.stdout.strip().splitlines()[-1])
+        report['datasets'].append(dataset)
+        print_dataset(dataset)
+
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f"{commit}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados salvos em {output}")
+
+
+def print_dataset(dataset):
+    print(f"\n{dataset['rows']} linhas, {dataset['genres']} gêneros "
+          f"(bruto {dataset['raw_mb']:.1f} MB, pico RSS {dataset['peak_rss_mb']:.0f} MB)")
+    print(f"{'etapa':>38} {'mediana ms':>12} {'mín ms':>10}")
+    for step, m in dataset['steps'].items():
+        extra = f"  ({m['requests_per_s']:.0f} req/s)" if 'requests_per_s' in m else ''
+        print(f"{step:>38} {m['median_s'] * 1000:>12.2f} "
+              f"{m.get('min_s', m['median_s']) * 1000:>10.2f}{extra}")
+
+
+def compare(before_path, after_path):
+    """Razão depois/antes da mediana de cada etapa, por tamanho de dataset"""
+    with open(before_path, encoding='utf-8') as f:
+        before = json.load(f)
+    with open(after_path, encoding='utf-8') as f:
+        after = json.load(f)
+
+    print(f"{before['commit']} -> {after['commit']}")
+    previous = {(d['rows'], d['genres']): d for d in before['datasets']}
+    for dataset in after['datasets']:
+        base = previous.get((dataset['rows'], dataset['genres']))
+        if base is None:
+            continue
+        print(f"\n{dataset['rows']} linhas, {dataset['genres']} gêneros")
+        print(f"{'etapa':>38} {'antes ms':>10} {'depois ms':>10} {'razão':>8}")
+        for step, m in dataset['steps'].items():
+            if step not in base['steps']:
+                continue
+            old, new = base['steps'][step]['median_s'], m['median_s']
+            print(f"{step:>38} {old * 1000:>10.2f} {new * 1000:>10.2f} {new / old:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--genres', type=int, default=120)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output')
+    parser.add_argument('--compare', nargs=2, metavar=('ANTES', 'DEPOIS'))
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    elif args.child:
+        run_child(args)
+    else:
+        run_suite(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+"""Utilitários compartilhados pelos benchmarks."""
+import resource
+
+
+def peak_rss_mb():
+    """Pico de RSS do processo atual (VmHWM no Linux, que não herda do processo pai)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
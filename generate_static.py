@@ -1,19 +1,21 @@
-import os
-import shutil
-from app import app
+import sys
 
-def generate_static_site():
-    # Criar diretório docs (GitHub Pages usa este diretório por padrão)
-    if os.path.exists('docs'):
-        shutil.rmtree('docs')
-    os.makedirs('docs')
+from src.web.static_site import StaticSiteBuilder, print_report
+
+
+def generate_static_site(output_dir='docs', force=False):
+    """Build do site estático em `output_dir` (GitHub Pages usa 'docs' por padrão).
+
+    Só os artefatos cujas entradas mudaram desde o último build são
+    refeitos; `force=True` refaz tudo.
+    """
+    report = StaticSiteBuilder(output_dir, force=force).build()
+    print_report(report)
+    return report
 
-    # Copiar arquivos estáticos
-    shutil.copytree('static', 'docs/static')
-    
-    # Copiar o arquivo index.html para docs
-    shutil.copy('templates/index.html', 'docs/index.html')
 
 if __name__ == '__main__':
-    generate_static_site()
-    print("Site estático gerado com sucesso na pasta 'docs'!")
\ No newline at end of file
+    # Uso: python generate_static.py [--output docs] [--force]
+    output_dir = sys.argv[sys.argv.index('--output') + 1] if '--output' in sys.argv else 'docs'
+    generate_static_site(output_dir, force='--force' in sys.argv)
+    print(f"Site estático gerado com sucesso na pasta '{output_dir}'!")
@@ -0,0 +1,13 @@
+import os
+
+# Porta definida pelo Render ou 5000 como padrão
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+
+# O app é importado uma vez no processo mestre e os workers são criados por
+# fork: o dataset e o dashboard aquecidos no import são compartilhados
+# (copy-on-write) em vez de recalculados por worker.
+preload_app = True
+# Threads não sobrevivem ao fork: cada worker inicia a sua thread de
+# atualização (DASHBOARD_REFRESH) na primeira requisição
+os.environ.setdefault('DASHBOARD_STARTUP', 'eager')
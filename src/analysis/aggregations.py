@@ -0,0 +1,328 @@
+from functools import reduce
+
+import pickle
+
+import numpy as np
+import pandas as pd
+
+
+POPULARITY_LABELS = ['Muito Baixa', 'Baixa', 'Média', 'Alta', 'Muito Alta']
+DURATION_LABELS = ['Muito Curta', 'Curta', 'Média', 'Longa', 'Muito Longa']
+
+
+def add_categories(df):
+    """Deriva as colunas de categoria de popularidade e de duração"""
+    # Criando categorias de popularidade para análises
+    df['popularity_category'] = pd.cut(
+        df['popularity'],
+        bins=[0, 20, 40, 60, 80, 100],
+        labels=POPULARITY_LABELS
+    )
+
+    # Criando categorias de duração
+    df['duration_category'] = pd.cut(
+        df['duration_min'],
+        bins=[0, 2, 3, 4, 5, float('inf')],
+        labels=DURATION_LABELS
+    )
+
+    return df
+
+
+class OlapCube:
+    """Cubo materializado gênero x popularidade x duração x explícito.
+
+    Cada célula guarda estatísticas combináveis (contagem, soma e soma dos
+    quadrados da popularidade e da duração, e a soma do produto das duas).
+    Só as células não vazias são armazenadas, indexadas por
+    (genre, popularity_category, duration_category, explicit); as categorias
+    são representadas pelo código do rótulo, com -1 para linhas fora dos bins
+    do `pd.cut` (ex.: popularidade 0).
+
+    Qualquer agrupamento sobre essas dimensões sai de `rollup`, que soma as
+    células em vez de varrer as faixas. O cubo tem no máximo
+    gêneros x 72 células, então é barato de persistir e de combinar.
+    """
+
+    DIMENSIONS = ['genre', 'popularity_category', 'duration_category', 'explicit']
+    MEASURES = ['count', 'popularity_sum', 'popularity_sumsq', 'duration_sum',
+                'duration_sumsq', 'popularity_duration_sum']
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    @staticmethod
+    def _category_codes(series, labels):
+        """Códigos 0..n-1 dos rótulos, com n para valores sem categoria"""
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        return np.where(codes < 0, len(labels), codes)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Constrói o cubo com um único `np.bincount` por medida.
+
+        Retorna (cubo, códigos de gênero por linha, gêneros).
+        """
+        genre_codes, genres = pd.factorize(df['genre'], sort=True)
+        genres = np.asarray(genres)
+        popularity_codes = cls._category_codes(df['popularity_category'], POPULARITY_LABELS)
+        duration_codes = cls._category_codes(df['duration_category'], DURATION_LABELS)
+        explicit = df['explicit'].to_numpy(dtype=bool)
+
+        n_popularity = len(POPULARITY_LABELS) + 1
+        n_duration = len(DURATION_LABELS) + 1
+        cell_codes = ((genre_codes * n_popularity + popularity_codes) * n_duration
+                      + duration_codes) * 2 + explicit
+        size = len(genres) * n_popularity * n_duration * 2
+
+        popularity = df['popularity'].to_numpy(dtype=float)
+        duration = df['duration_min'].to_numpy(dtype=float)
+
+        def total(weights=None):
+            return np.bincount(cell_codes, weights=weights, minlength=size)
+
+        count = total().astype(np.int64)
+        cells = np.flatnonzero(count)
+        genre, rest = np.divmod(cells, n_popularity * n_duration * 2)
+        popularity_category, rest = np.divmod(rest, n_duration * 2)
+        duration_category, explicit_cell = np.divmod(rest, 2)
+
+        index = pd.MultiIndex.from_arrays([
+            genres[genre],
+            np.where(popularity_category == n_popularity - 1, -1, popularity_category).astype(np.int8),
+            np.where(duration_category == n_duration - 1, -1, duration_category).astype(np.int8),
+            explicit_cell.astype(bool)
+        ], names=cls.DIMENSIONS)
+
+        measures = {
+            'count': count,
+            'popularity_sum': total(popularity),
+            'popularity_sumsq': total(popularity * popularity),
+            'duration_sum': total(duration),
+            'duration_sumsq': total(duration * duration),
+            'popularity_duration_sum': total(popularity * duration)
+        }
+        cube = cls(pd.DataFrame({m: measures[m][cells] for m in cls.MEASURES}, index=index))
+        return cube, genre_codes, genres
+
+    @classmethod
+    def combine(cls, cubes, signs):
+        """Soma (sinal 1) ou subtrai (sinal -1) cubos; células zeradas são removidas"""
+        cells = pd.concat([cube.cells * sign for cube, sign in zip(cubes, signs)])
+        cells = cells.groupby(level=cls.DIMENSIONS, sort=True).sum()
+        return cls(cells[cells['count'] > 0].astype({'count': np.int64}))
+
+    def rollup(self, dimensions, where=None):
+        """Soma das células agrupadas por `dimensions` (opcionalmente filtradas por `where`).
+
+        `where` é um dicionário dimensão -> valor, ex.: {'explicit': True}.
+        Os grupos saem ordenados, como num `groupby`, e são calculados com
+        `np.bincount` sobre os códigos do índice das células.
+        """
+        if isinstance(dimensions, str):
+            dimensions = [dimensions]
+        cells = self.cells
+        for dimension, value in (where or {}).items():
+            cells = cells[cells.index.get_level_values(dimension) == value]
+
+        index = cells.index
+        positions = [index.names.index(dimension) for dimension in dimensions]
+        levels = [index.levels[i] for i in positions]
+        shape = [max(len(level), 1) for level in levels]
+        group_codes = np.ravel_multi_index([index.codes[i] for i in positions], shape)
+        size = int(np.prod(shape))
+
+        count = np.bincount(group_codes, weights=cells['count'].to_numpy(), minlength=size)
+        groups = np.flatnonzero(count)
+        group_levels = np.unravel_index(groups, shape)
+        if len(dimensions) == 1:
+            group_index = pd.Index(levels[0][group_levels[0]], name=dimensions[0])
+        else:
+            group_index = pd.MultiIndex.from_arrays(
+                [level[codes] for level, codes in zip(levels, group_levels)], names=dimensions
+            )
+
+        totals = {'count': count[groups].round().astype(np.int64)}
+        for measure in self.MEASURES[1:]:
+            totals[measure] = np.bincount(
+                group_codes, weights=cells[measure].to_numpy(), minlength=size
+            )[groups]
+        return pd.DataFrame(totals, index=group_index)
+
+
+class GroupAggregates:
+    """Estatísticas suficientes por gênero e por categoria de popularidade.
+
+    Todas as tabelas são derivadas de um `OlapCube` construído uma única vez
+    (um `np.bincount` por medida sobre o código combinado das dimensões), em
+    vez de um `groupby` por análise. As médias, desvios e tabelas usadas pelo
+    `SpotifyAnalyzer` são derivadas desses totais.
+    """
+
+    def __init__(self, df):
+        self.cube, self.genre_codes, genres = OlapCube.from_frame(df)
+        self.n_rows = len(df)
+        self._derive(pd.Index(genres, name='genre'))
+
+    def _derive(self, genres):
+        """Tabelas por gênero/categoria obtidas por roll-up do cubo"""
+        cube = self.cube
+        self.genres = genres
+        self.categories = pd.Index(POPULARITY_LABELS)
+        category_index = pd.CategoricalIndex(
+            POPULARITY_LABELS, categories=POPULARITY_LABELS,
+            ordered=True, name='popularity_category'
+        )
+
+        by_genre = cube.rollup('genre').reindex(genres, fill_value=0)
+        explicit = cube.rollup('genre', where={'explicit': True}).reindex(genres, fill_value=0)
+        self.by_genre = self._with_explicit(by_genre, explicit)
+
+        # Linhas sem categoria (popularidade 0 fica fora de pd.cut) são ignoradas,
+        # como no groupby original
+        codes = range(len(POPULARITY_LABELS))
+        by_category = cube.rollup('popularity_category').reindex(codes, fill_value=0)
+        explicit = cube.rollup(
+            'popularity_category', where={'explicit': True}
+        ).reindex(codes, fill_value=0)
+        self.by_popularity_category = self._with_explicit(by_category, explicit).set_axis(category_index)
+
+        counts = cube.rollup(['genre', 'popularity_category'])['count'].unstack(fill_value=0)
+        self.genre_by_category = (
+            counts.reindex(index=genres, columns=codes, fill_value=0)
+            .set_axis(category_index, axis=1).astype(np.int64)
+        )
+
+    @staticmethod
+    def _with_explicit(stats, explicit):
+        """Completa os totais com as colunas das faixas explícitas"""
+        stats = stats.astype({'count': np.int64})
+        return pd.DataFrame({
+            'count': stats['count'],
+            'popularity_sum': stats['popularity_sum'],
+            'popularity_sumsq': stats['popularity_sumsq'],
+            'duration_sum': stats['duration_sum'],
+            'duration_sumsq': stats['duration_sumsq'],
+            'explicit_count': explicit['count'].astype(float),
+            'popularity_duration_sum': stats['popularity_duration_sum'],
+            'explicit_popularity_sum': explicit['popularity_sum']
+        }, index=stats.index)
+
+    @classmethod
+    def merge(cls, parts):
+        """Combina agregados calculados sobre partes disjuntas do dataset.
+
+        Como todas as estatísticas são somas, o resultado é igual ao de
+        calcular sobre o dataset inteiro; isso permite processar arquivos
+        grandes em blocos com memória limitada.
+        """
+        parts = list(parts)
+        return cls.combine(parts, [1] * len(parts))
+
+    def apply_delta(self, added=None, removed=None):
+        """Agregados atualizados: soma as linhas em `added` e subtrai as de `removed`"""
+        parts, signs = [self], [1]
+        for part, sign in ((added, 1), (removed, -1)):
+            if part is not None and part.n_rows:
+                parts.append(part)
+                signs.append(sign)
+        return self.combine(parts, signs)
+
+    @classmethod
+    def combine(cls, parts, signs):
+        """Soma (sinal 1) ou subtrai (sinal -1) agregados, combinando os cubos"""
+        merged = cls.__new__(cls)
+        merged.n_rows = sum(part.n_rows * sign for part, sign in zip(parts, signs))
+        # Os códigos por linha não sobrevivem à combinação de blocos
+        merged.genre_codes = None
+        merged.cube = OlapCube.combine([part.cube for part in parts], signs)
+        # Gêneros que ficaram sem faixas (após subtração) deixam de existir
+        genres = merged.cube.cells.index.get_level_values('genre').unique().sort_values()
+        merged._derive(pd.Index(np.asarray(genres), name='genre'))
+        return merged
+
+    def __getstate__(self):
+        # Os códigos por linha não fazem parte dos agregados persistidos
+        return {**self.__dict__, 'genre_codes': None}
+
+    def save(self, path, source_versions=None):
+        """Persiste os agregados, com as versões dos arquivos de origem"""
+        with open(path, 'wb') as f:
+            pickle.dump({'aggregates': self, 'source_versions': source_versions or {}}, f)
+
+    @staticmethod
+    def load(path):
+        """Retorna (agregados, versões de origem) salvos por `save`"""
+        with open(path, 'rb') as f:
+            stored = pickle.load(f)
+        return stored['aggregates'], stored['source_versions']
+
+    @staticmethod
+    def _mean(total, count):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return pd.Series(np.where(count > 0, total / count, np.nan), index=total.index)
+
+    @staticmethod
+    def _std(total, total_sq, count):
+        """Desvio padrão amostral (ddof=1) a partir de soma e soma dos quadrados"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = (total_sq - total * total / count) / (count - 1)
+            var = np.where(count > 1, np.clip(var, 0, None), np.nan)
+        return pd.Series(np.sqrt(var), index=total.index)
+
+    def summary(self, stats):
+        """Médias e desvios derivados de uma tabela de totais (por gênero ou categoria)"""
+        count = stats['count']
+        return pd.DataFrame({
+            'popularity_mean': self._mean(stats['popularity_sum'], count),
+            'popularity_std': self._std(stats['popularity_sum'], stats['popularity_sumsq'], count),
+            'count': count,
+            'duration_mean': self._mean(stats['duration_sum'], count),
+            'explicit_mean': self._mean(stats['explicit_count'], count)
+        })
+
+    def genre_summary(self):
+        return self.summary(self.by_genre)
+
+    def popularity_category_summary(self):
+        return self.summary(self.by_popularity_category)
+
+    def totals(self):
+        """Somas globais (todas as linhas), obtidas somando os grupos de gênero"""
+        return self.by_genre.sum()
+
+    @staticmethod
+    def _pearson(n, sum_x, sum_y, sum_xx, sum_yy, sum_xy):
+        cov = n * sum_xy - sum_x * sum_y
+        var_x = n * sum_xx - sum_x * sum_x
+        var_y = n * sum_yy - sum_y * sum_y
+        # Variável constante (ex.: subconjunto filtrado só de explícitas): NaN, como no pandas
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return cov / np.sqrt(var_x * var_y)
+
+    def popularity_duration_corr(self):
+        t = self.totals()
+        return self._pearson(
+            t['count'], t['popularity_sum'], t['duration_sum'],
+            t['popularity_sumsq'], t['duration_sumsq'], t['popularity_duration_sum']
+        )
+
+    def explicit_popularity_corr(self):
+        """Correlação ponto-bisserial (Pearson com variável binária)"""
+        t = self.totals()
+        # explicit é 0/1, então a soma dos quadrados é igual à soma
+        return self._pearson(
+            t['count'], t['explicit_count'], t['popularity_sum'],
+            t['explicit_count'], t['popularity_sumsq'], t['explicit_popularity_sum']
+        )
+
+    def explicit_contingency(self):
+        """Tabela gênero x explícito equivalente a pd.crosstab(genre, explicit)"""
+        explicit = self.by_genre['explicit_count'].round().astype(np.int64)
+        table = pd.DataFrame({
+            False: self.by_genre['count'] - explicit,
+            True: explicit
+        })
+        table.columns.name = 'explicit'
+        # crosstab só inclui valores observados
+        return table.loc[:, table.sum() > 0]
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # sem pyarrow a separação dos artistas usa o pandas
+    pa = None
+
+ARTIST_SEPARATOR = ', '
+
+
+def split_artists(artists):
+    """Separa 'A, B' em pares (linha, artista) com os artistas codificados por dicionário.
+
+    Retorna (linhas, códigos, nomes): `linhas` e `códigos` têm um elemento
+    por par, na ordem das linhas; `nomes[código]` é o artista. Valores
+    vazios ou nulos não geram pares.
+    """
+    if pa is not None:
+        array = pa.array(artists, from_pandas=True)
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        lists = pc.split_pattern(pc.cast(array, pa.large_string()), ARTIST_SEPARATOR)
+        rows = pc.list_parent_indices(lists).to_numpy()
+        names = pc.list_flatten(lists)
+        keep = pc.greater(pc.utf8_length(names), 0)
+        encoded = pc.filter(names, keep).dictionary_encode()
+        return (rows[keep.to_numpy(zero_copy_only=False)].astype(np.int64),
+                encoded.indices.to_numpy().astype(np.int32),
+                np.asarray(encoded.dictionary.to_pylist(), dtype=object))
+
+    exploded = pd.Series(artists).reset_index(drop=True).str.split(ARTIST_SEPARATOR, regex=False).explode()
+    exploded = exploded[exploded.notna() & (exploded != '')]
+    codes, names = pd.factorize(exploded)
+    return exploded.index.to_numpy(dtype=np.int64), codes.astype(np.int32), np.asarray(names, dtype=object)
+
+
+def concentration(counts):
+    """Concentração do catálogo: fatia das maiores entidades, HHI e Gini das contagens"""
+    counts = np.sort(np.asarray(counts, dtype=float))[::-1]
+    total = counts.sum()
+    if not total:
+        return {'entidades': 0, 'top_1pct': 0.0, 'top_10pct': 0.0, 'hhi': 0.0, 'gini': 0.0}
+    shares = counts / total
+    n = len(counts)
+    cumulative = np.cumsum(shares)
+    # Gini a partir da curva de Lorenz (contagens em ordem crescente)
+    lorenz = np.cumsum(shares[::-1])
+    return {
+        'entidades': n,
+        'top_1pct': float(cumulative[max(int(np.ceil(n * 0.01)), 1) - 1]),
+        'top_10pct': float(cumulative[max(int(np.ceil(n * 0.10)), 1) - 1]),
+        'hhi': float((shares ** 2).sum()),
+        'gini': float(1 - (2 * lorenz.sum() - 1) / n)
+    }
+
+
+class CatalogStore:
+    """Artistas e álbuns do dataset codificados por dicionário.
+
+    - artistas: nomes únicos e o mapeamento explodido artista <-> faixa
+      (`pair_rows`/`pair_artists`), ordenado por artista com offsets, já
+      que uma faixa pode ter vários artistas ('A, B');
+    - álbuns: um código por linha, identificando (álbum, artista principal),
+      para não juntar álbuns homônimos de artistas diferentes.
+
+    As agregações são `np.bincount`/`reduceat` sobre os códigos inteiros,
+    sem agrupar strings.
+    """
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        rows, codes, self.artist_names = split_artists(df['artists'])
+
+        # Artista principal: o primeiro par de cada linha (-1 sem artista)
+        first = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]]) if len(rows) else rows
+        self.primary_artist = np.full(self.n_rows, -1, dtype=np.int32)
+        self.primary_artist[rows[first]] = codes[first]
+
+        order = np.argsort(codes, kind='stable')
+        self.pair_rows = rows[order]
+        self.pair_artists = codes[order]
+        self.artist_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(codes, minlength=len(self.artist_names)))]
+        )
+
+        album_codes, album_names = pd.factorize(df['album'])
+        keys = album_codes.astype(np.int64) * (len(self.artist_names) + 1) + self.primary_artist + 1
+        album_codes, unique_keys = pd.factorize(keys, sort=True)
+        self.album_codes = album_codes.astype(np.int32)
+        album_of_key = unique_keys // (len(self.artist_names) + 1)
+        self.album_names = np.where(
+            album_of_key >= 0, np.asarray(album_names, dtype=object)[np.maximum(album_of_key, 0)], None
+        )
+        self.album_artists = (unique_keys % (len(self.artist_names) + 1) - 1).astype(np.int32)
+
+        genre_codes, self.genres = pd.factorize(df['genre'])
+        self.genre_codes = genre_codes.astype(np.int32)
+        self.popularity = df['popularity'].to_numpy(dtype=np.float64)
+        self.explicit = df['explicit'].to_numpy(dtype=bool)
+
+    @property
+    def nbytes(self):
+        """Bytes dos arrays de códigos (sem contar os dicionários de nomes)"""
+        arrays = [self.primary_artist, self.pair_rows, self.pair_artists, self.artist_offsets,
+                  self.album_codes, self.album_artists, self.genre_codes]
+        return sum(a.nbytes for a in arrays)
+
+    @staticmethod
+    def _distinct_per(groups, values, n_values, n_groups):
+        """Quantidade de valores distintos por grupo (pares únicos grupo x valor)"""
+        pairs = np.sort(groups.astype(np.int64) * n_values + values)
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]] if len(pairs) else pairs
+        return np.bincount(pairs // n_values, minlength=n_groups)
+
+    def artist_summary(self):
+        """Métricas por artista (uma linha por artista, contando faixas com vários artistas para cada um)"""
+        n_artists = len(self.artist_names)
+        count = np.diff(self.artist_offsets)
+        popularity = self.popularity[self.pair_rows]
+        nonempty = count > 0
+        popularity_max = np.zeros(n_artists)
+        if len(popularity):
+            popularity_max[nonempty] = np.maximum.reduceat(popularity, self.artist_offsets[:-1][nonempty])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            summary = pd.DataFrame({
+                'track_count': count,
+                'album_count': self._distinct_per(
+                    self.pair_artists, self.album_codes[self.pair_rows], len(self.album_names), n_artists
+                ),
+                'genre_count': self._distinct_per(
+                    self.pair_artists, self.genre_codes[self.pair_rows], len(self.genres), n_artists
+                ),
+                'popularity_mean': np.bincount(self.pair_artists, weights=popularity, minlength=n_artists) / count,
+                'popularity_max': popularity_max,
+                'explicit_share': np.bincount(
+                    self.pair_artists, weights=self.explicit[self.pair_rows], minlength=n_artists
+                ) / count
+            }, index=pd.Index(self.artist_names, name='artist'))
+        return summary
+
+    def album_summary(self):
+        """Métricas por álbum (álbum + artista principal)"""
+        n_albums = len(self.album_names)
+        count = np.bincount(self.album_codes, minlength=n_albums)
+        artists = np.full(n_albums, None, dtype=object)
+        known = self.album_artists >= 0
+        artists[known] = self.artist_names[self.album_artists[known]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return pd.DataFrame({
+                'album': self.album_names,
+                'artist': artists,
+                'track_count': count,
+                'genre_count': self._distinct_per(self.album_codes, self.genre_codes, len(self.genres), n_albums),
+                'popularity_mean': np.bincount(self.album_codes, weights=self.popularity, minlength=n_albums) / count,
+                'explicit_share': np.bincount(self.album_codes, weights=self.explicit, minlength=n_albums) / count
+            })
+
+    @staticmethod
+    def leaders(summary, n=10, min_tracks=3):
+        """As `n` entradas de maior popularidade média entre as com pelo menos `min_tracks` faixas"""
+        eligible = summary[summary['track_count'] >= min_tracks]
+        return eligible.sort_values(['popularity_mean', 'track_count'], ascending=False, kind='stable').head(n)
@@ -0,0 +1,101 @@
+import os
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # sem pyarrow os datasets ficam em memória privada de cada processo
+    pa = None
+
+BOOL_COLUMNS_KEY = b'bool_columns'
+
+
+def _to_arrow(series):
+    """Coluna Arrow que pode ser lida de volta sem cópia (None se o tipo não tiver suporte)"""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return pa.DictionaryArray.from_arrays(
+            pa.array(series.cat.codes.to_numpy(), mask=series.isna().to_numpy()),
+            pa.array(np.asarray(dtype.categories, dtype=object)),
+            ordered=dtype.ordered
+        )
+    if dtype == bool:
+        # Booleanos do Arrow são bits; como uint8 a coluna vira um bool numpy sem cópia
+        return pa.array(series.to_numpy().view(np.uint8))
+    if dtype.kind in 'iuf':
+        return pa.array(series.to_numpy())
+    if dtype == object or isinstance(dtype, pd.StringDtype):
+        # O pandas só envolve large_string sem converter os offsets
+        try:
+            return pa.array(series.to_numpy(dtype=object), type=pa.large_string(), from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return None
+    return None
+
+
+def write_column_store(df, path):
+    """Grava as colunas de `df` num arquivo Arrow IPC não comprimido, em um único bloco.
+
+    A escrita vai para um arquivo temporário renomeado no fim, então
+    processos que gravam a mesma versão ao mesmo tempo não se atrapalham.
+    Retorna False se alguma coluna tiver um tipo sem suporte.
+    """
+    arrays, bool_columns = {}, []
+    for column in df.columns:
+        array = _to_arrow(df[column])
+        if array is None:
+            return False
+        arrays[str(column)] = array
+        if df[column].dtype == bool:
+            bool_columns.append(str(column))
+
+    table = pa.table(arrays).replace_schema_metadata(
+        {BOOL_COLUMNS_KEY: ','.join(bool_columns).encode()}
+    )
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+    with pa.OSFile(str(tmp), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(len(table), 1))
+    os.replace(tmp, path)
+    return True
+
+
+def open_column_store(path):
+    """DataFrame cujas colunas apontam direto para o arquivo mapeado em memória.
+
+    As páginas do arquivo ficam no page cache do sistema e são compartilhadas
+    por todos os processos que abrem o mesmo arquivo (ex.: workers do
+    gunicorn); só os códigos das colunas categóricas são copiados. As
+    colunas são somente leitura.
+    """
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    metadata = table.schema.metadata or {}
+    bool_columns = set(filter(None, metadata.get(BOOL_COLUMNS_KEY, b'').decode().split(',')))
+
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if pa.types.is_dictionary(column.type):
+            chunk = column.chunk(0) if column.num_chunks else pa.array([], column.type)
+            columns[name] = pd.Categorical.from_codes(
+                chunk.indices.fill_null(-1).to_numpy(zero_copy_only=False),
+                categories=chunk.dictionary.to_pylist(),
+                ordered=column.type.ordered
+            )
+        elif pa.types.is_large_string(column.type):
+            columns[name] = pd.arrays.ArrowStringArray(column)
+        else:
+            values = (column.chunk(0).to_numpy(zero_copy_only=True) if column.num_chunks
+                      else np.empty(0, dtype=column.type.to_pandas_dtype()))
+            columns[name] = values.view(bool) if name in bool_columns else values
+    return pd.DataFrame(columns, copy=False)
+
+
+def memory_bytes(df):
+    """Bytes ocupados pelas colunas de `df` (mapeadas ou não)"""
+    return int(df.memory_usage(index=False, deep=True).sum())
@@ -0,0 +1,259 @@
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from src.analysis.delta_parts import delta_files
+from src.analysis.column_store import pa, write_column_store, open_column_store, memory_bytes
+
+
+def copy_on_write():
+    """Copy-on-Write do pandas ativo (padrão a partir do pandas 3.0).
+
+    O módulo não liga a opção: quem quer as cópias rasas de `frame()`
+    (ex.: o app) habilita `mode.copy_on_write` no seu ponto de entrada.
+    """
+    return int(pd.__version__.split('.')[0]) >= 3 or pd.get_option('mode.copy_on_write') is True
+
+
+def content_hash(path):
+    """SHA-256 do conteúdo do arquivo e das suas partes incrementais (versão do dataset)"""
+    digest = hashlib.sha256()
+    for file in [path, *delta_files(path)]:
+        with open(file, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class DatasetSnapshot:
+    """Uma versão carregada do dataset: frame, hash, mtime e estruturas derivadas.
+
+    Tudo vem da mesma entrada do cache, mesmo que outra thread recarregue o
+    arquivo depois (ex.: a thread de atualização do dashboard): quem usa o
+    snapshot nunca mistura o frame de uma versão com a chave ou os índices
+    de outra.
+    """
+
+    def __init__(self, cache, key, entry):
+        self._cache = cache
+        self._key = key
+        self._entry = entry
+        self.version = entry['version']
+        self.mtime = entry['mtime']
+
+    def frame(self):
+        """Cópia do frame que pode ser alterada sem chegar ao cache.
+
+        Com Copy-on-Write é uma cópia rasa: compartilha os arrays do cache (e
+        dos arquivos Arrow mapeados) e uma escrita copia só o bloco alterado.
+        Sem ele, uma cópia rasa escreveria nos arrays do cache; a cópia é
+        completa.
+        """
+        return self._entry['df'].copy(deep=not copy_on_write())
+
+    def derived(self, name, builder):
+        """Estrutura derivada desta versão, construída uma vez com `builder(df)`"""
+        with self._cache._lock:
+            derived = self._entry.setdefault('derived', {})
+            if name not in derived:
+                derived[name] = builder(self._entry['df'])
+            return derived[name]
+
+    def store_path(self, name):
+        """Caminho em `store_dir` para persistir uma estrutura derivada desta versão.
+
+        Fica ao lado do arquivo Arrow da versão e é removido junto com ele
+        quando o conteúdo muda. None quando o cache não tem `store_dir`.
+        """
+        if self._cache.store_dir is None:
+            return None
+        prefix = self._cache._store_prefix(self._key)
+        return self._cache.store_dir / f"{prefix}-{self.version[:16]}.{name}"
+
+
+class DatasetCache:
+    """Cache de datasets compartilhado pelo processo.
+
+    Cada arquivo é lido uma única vez e mantido em memória. A cada acesso
+    o cache compara mtime/tamanho do arquivo; se mudaram, calcula o hash do
+    conteúdo e só recarrega quando o conteúdo de fato mudou.
+
+    Com `revalidate = False` os acessos usam a entrada já carregada sem
+    conferir o arquivo; a revalidação fica a cargo de quem chama
+    `version(..., revalidate=True)` (ex.: a thread de atualização do dashboard).
+
+    Com `store_dir`, cada versão carregada é gravada uma vez como arquivo
+    Arrow em `store_dir` e aberta mapeada em memória: os processos que
+    servem o mesmo dataset (workers do gunicorn) compartilham as colunas
+    pelo page cache em vez de manter cópias privadas.
+
+    Com `memory_budget` (bytes), os datasets menos usados recentemente são
+    descartados quando o total carregado passa do orçamento (o dataset
+    acessado por último sempre fica).
+    """
+
+    def __init__(self, store_dir=None, memory_budget=0):
+        self.revalidate = True
+        self.store_dir = Path(store_dir) if store_dir and pa is not None else None
+        self.memory_budget = memory_budget
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()
+        self._counters = {'hits': 0, 'misses': 0, 'reloads': 0, 'evictions': 0}
+
+    @staticmethod
+    def _file_signature(path):
+        """(mtime mais recente, tamanhos) do arquivo e das suas partes incrementais"""
+        stats = [os.stat(file) for file in [path, *delta_files(path)]]
+        return max(stat.st_mtime_ns for stat in stats), tuple(stat.st_size for stat in stats)
+
+    def _entry(self, path, loader, revalidate=None):
+        """Retorna a entrada atualizada do arquivo, recarregando se necessário"""
+        key = str(Path(path).resolve())
+        if revalidate is None:
+            revalidate = self.revalidate
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            if entry is not None and not revalidate:
+                self._counters['hits'] += 1
+                return entry
+
+            signature = self._file_signature(key)
+
+            if entry is not None and entry['signature'] == signature:
+                self._counters['hits'] += 1
+                return entry
+
+            version = content_hash(key)
+            if entry is not None and entry['version'] == version:
+                # Arquivo tocado (mtime mudou) mas conteúdo idêntico
+                entry['signature'] = signature
+                self._counters['hits'] += 1
+                return entry
+
+            df = self._load(key, version, loader)
+            self._counters['reloads' if entry is not None else 'misses'] += 1
+            entry = {
+                'df': df,
+                'signature': signature,
+                'version': version,
+                'mtime': signature[0] / 1e9,
+                'bytes': memory_bytes(df)
+            }
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+            return entry
+
+    def _store_prefix(self, key):
+        # O hash do caminho separa arquivos de mesmo nome de datasets diferentes
+        return f"{Path(key).stem}-{hashlib.sha256(key.encode()).hexdigest()[:8]}"
+
+    def _load(self, key, version, loader):
+        """Carrega a versão do dataset, pelo arquivo Arrow compartilhado quando configurado"""
+        if self.store_dir is None:
+            return loader(key)
+
+        prefix = self._store_prefix(key)
+        store = self.store_dir / f"{prefix}-{version[:16]}.arrow"
+        if not store.exists():
+            df = loader(key)
+            if not write_column_store(df, store):
+                return df
+            # Versões antigas do mesmo arquivo (e o que foi persistido a partir
+            # delas): quem ainda as mapeia continua lendo normalmente depois
+            # da remoção
+            for old in self.store_dir.glob(f"{prefix}-*"):
+                if old.name.startswith(f"{store.stem}."):
+                    continue
+                if old.is_dir():
+                    shutil.rmtree(old, ignore_errors=True)
+                else:
+                    old.unlink(missing_ok=True)
+        return open_column_store(store)
+
+    def _evict(self):
+        """Descarta os datasets menos usados enquanto o total passar do orçamento"""
+        if not self.memory_budget:
+            return
+        total = sum(entry['bytes'] for entry in self._entries.values())
+        while total > self.memory_budget and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            total -= entry['bytes']
+            self._counters['evictions'] += 1
+
+    def snapshot(self, path, loader, revalidate=None):
+        """Versão atual do dataset em `path` como um `DatasetSnapshot`"""
+        entry = self._entry(path, loader, revalidate)
+        return DatasetSnapshot(self, str(Path(path).resolve()), entry)
+
+    def get(self, path, loader):
+        """Retorna uma visão do dataset em `path` isolada do cache.
+
+        `loader` recebe o caminho e devolve o DataFrame; só é chamado no
+        primeiro acesso ou quando o conteúdo do arquivo muda.
+        """
+        return self.snapshot(path, loader).frame()
+
+    def derived(self, path, loader, name, builder):
+        """Estrutura derivada do dataset (ex.: índices), construída uma vez por versão.
+
+        `builder` recebe o DataFrame em cache; o resultado fica guardado na
+        entrada do arquivo e é descartado junto com ela quando o conteúdo muda.
+        """
+        return self.snapshot(path, loader).derived(name, builder)
+
+    def store_path(self, path, loader, name):
+        """Caminho em `store_dir` para persistir uma estrutura derivada da versão atual"""
+        return self.snapshot(path, loader).store_path(name)
+
+    def version(self, path, loader, revalidate=None):
+        """Retorna (hash do conteúdo, mtime) da versão atual do dataset"""
+        snapshot = self.snapshot(path, loader, revalidate)
+        return snapshot.version, snapshot.mtime
+
+    def invalidate(self, path=None):
+        """Descarta uma entrada (ou todas) do cache"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(Path(path).resolve()), None)
+
+    def stats(self):
+        """Contadores de acerto/falta/recarga/descarte e datasets em memória"""
+        with self._lock:
+            return {
+                **self._counters,
+                'bytes': sum(entry['bytes'] for entry in self._entries.values()),
+                'memory_budget': self.memory_budget,
+                'datasets': {
+                    path: {
+                        'version': entry['version'],
+                        'rows': len(entry['df']),
+                        'bytes': entry['bytes']
+                    }
+                    for path, entry in self._entries.items()
+                }
+            }
+
+
+def _project_path(path):
+    """Caminho relativo resolvido a partir da raiz do projeto, não do diretório atual"""
+    return Path(__file__).resolve().parents[2] / path if path else None
+
+
+# DASHBOARD_COLUMN_STORE: diretório dos arquivos Arrow compartilhados entre
+# processos (vazio desativa; relativo à raiz do projeto);
+# DASHBOARD_MEMORY_BUDGET_MB: orçamento dos datasets carregados por processo
+# (0 = sem limite)
+dataset_cache = DatasetCache(
+    store_dir=_project_path(os.environ.get('DASHBOARD_COLUMN_STORE', 'data/cache/columns')),
+    memory_budget=int(float(os.environ.get('DASHBOARD_MEMORY_BUDGET_MB', 0)) * 1024 ** 2)
+)
@@ -0,0 +1,67 @@
+import json
+import os
+from pathlib import Path
+
+from src.etl.spotify_data_loader import HAS_PYARROW
+
+DEFAULT_DATASET = 'spotify'
+
+
+def processed_file(directory):
+    """Arquivo processado de um diretório: Parquet quando disponível; CSV como fallback"""
+    directory = Path(directory)
+    data_path = directory / 'processed_spotify.parquet'
+    if not (HAS_PYARROW and data_path.exists()):
+        data_path = directory / 'processed_spotify.csv'
+    return data_path
+
+
+class DatasetRegistry:
+    """Catálogos servidos pelo dashboard: identificador -> arquivo processado.
+
+    O dataset padrão ('spotify') é o `data/processed` do projeto. Outros
+    catálogos (regiões, selos...) vêm de um JSON no formato
+    `{"id": {"path": "...", "title": "..."}}` (ou `{"id": "caminho"}`), em
+    que o caminho é um arquivo processado ou um diretório com o
+    `processed_spotify.parquet`/`.csv` gerado pelo ETL.
+    """
+
+    def __init__(self, datasets=None):
+        self._datasets = {DEFAULT_DATASET: {'path': Path('data/processed'), 'title': 'Spotify'}}
+        for dataset_id, spec in (datasets or {}).items():
+            if not isinstance(spec, dict):
+                spec = {'path': spec}
+            self._datasets[dataset_id] = {
+                'path': Path(spec['path']),
+                'title': spec.get('title', dataset_id)
+            }
+
+    @classmethod
+    def from_file(cls, path):
+        """Registro a partir do JSON em `path` (só o dataset padrão se o arquivo não existir)"""
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __contains__(self, dataset_id):
+        return dataset_id in self._datasets
+
+    def ids(self):
+        return list(self._datasets)
+
+    def title(self, dataset_id):
+        return self._datasets[dataset_id]['title']
+
+    def path(self, dataset_id=None):
+        """Arquivo processado do dataset (KeyError se o identificador não existir)"""
+        dataset_id = dataset_id or DEFAULT_DATASET
+        if dataset_id not in self._datasets:
+            raise KeyError(f"Dataset desconhecido: {dataset_id}")
+        path = self._datasets[dataset_id]['path']
+        # Diretórios são resolvidos a cada chamada: o Parquet pode surgir depois
+        return processed_file(path) if path.suffix not in ('.csv', '.parquet') else path
+
+
+# DASHBOARD_DATASETS: JSON com os catálogos além do padrão
+dataset_registry = DatasetRegistry.from_file(os.environ.get('DASHBOARD_DATASETS', 'datasets.json'))
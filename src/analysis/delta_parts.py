@@ -0,0 +1,68 @@
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Chave de uma faixa no dataset processado: o mesmo id aparece em vários gêneros
+KEY_COLUMNS = ['id', 'genre']
+# Número de partes a partir do qual a ingestão incremental compacta o Parquet
+MAX_DELTA_PARTS = 8
+
+
+def parts_dir(path):
+    """Diretório das partes incrementais de um arquivo processado Parquet"""
+    return Path(path).with_suffix('.parts')
+
+
+def delta_files(path):
+    """Partes incrementais do arquivo processado, da mais antiga à mais recente.
+
+    Cada ingestão incremental grava as faixas inseridas e alteradas numa
+    parte `part-NNNNN.parquet` ao lado do arquivo base, sem reescrevê-lo.
+    Só arquivos Parquet têm partes.
+    """
+    if Path(path).suffix != '.parquet':
+        return []
+    return sorted(parts_dir(path).glob('part-*.parquet'))
+
+
+def write_delta(df, path):
+    """Grava `df` (tipos compactos) como a próxima parte do arquivo processado `path`.
+
+    A parte é escrita num temporário e renomeada no fim: quem lista as
+    partes nunca vê um arquivo pela metade.
+    """
+    directory = parts_dir(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    existing = delta_files(path)
+    number = int(existing[-1].stem.split('-')[1]) + 1 if existing else 1
+    target = directory / f"part-{number:05d}.parquet"
+    tmp = directory / f".{target.name}.{uuid.uuid4().hex}"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, target)
+    return target
+
+
+def clear_deltas(path):
+    """Remove as partes (o arquivo base foi regravado com todas as faixas)"""
+    shutil.rmtree(parts_dir(path), ignore_errors=True)
+
+
+def _key_index(keys):
+    return pd.MultiIndex.from_arrays([keys[col].astype(str) for col in KEY_COLUMNS])
+
+
+def latest_rows(base_keys, delta_keys):
+    """Máscara das linhas de base + partes (concatenadas) que continuam valendo.
+
+    `base_keys` e `delta_keys` (uma por parte) são DataFrames com as colunas
+    de `KEY_COLUMNS`. Uma linha da base sai quando a chave aparece em alguma
+    parte; entre as partes fica a versão mais recente de cada chave.
+    """
+    if not delta_keys:
+        return np.ones(len(base_keys), dtype=bool)
+    deltas = _key_index(pd.concat(delta_keys, ignore_index=True))
+    return np.r_[~_key_index(base_keys).isin(deltas), ~deltas.duplicated(keep='last')]
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import plotly.io as pio
+
+from src.analysis.instrumentation import registry, SPAN_METRIC
+
+MANIFEST_NAME = 'manifest.json'
+PLOTLYJS_NAME = 'plotly.min.js'
+
+
+def figure_hash(fig_json):
+    """Hash do spec da figura; se não mudar, os arquivos exportados continuam válidos"""
+    return hashlib.sha256(fig_json.encode('utf-8')).hexdigest()
+
+
+def _export_figure(name, fig_json, html_path, png_path):
+    """Exporta uma figura para HTML e PNG (executado nos processos do pool)"""
+    fig = pio.from_json(fig_json)
+    timings = {}
+
+    start = time.perf_counter()
+    # O plotly.js fica num único arquivo compartilhado no mesmo diretório
+    fig.write_html(html_path, include_plotlyjs='directory')
+    timings['html'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fig.write_image(png_path)
+    timings['png'] = time.perf_counter() - start
+
+    return name, timings
+
+
+def _write_shared_plotlyjs(output_dir, manifest):
+    """Grava o plotly.min.js compartilhado pelos HTMLs, se faltar ou mudar de versão"""
+    # plotly.offline puxa IPython; só é importado quando há exportação
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+    path = output_dir / PLOTLYJS_NAME
+    version = get_plotlyjs_version()
+    if path.exists() and manifest.get(PLOTLYJS_NAME) == version:
+        return
+    path.write_text(get_plotlyjs(), encoding='utf-8')
+    manifest[PLOTLYJS_NAME] = version
+    print(f"Salvo {PLOTLYJS_NAME} (plotly.js {version}) em {path}")
+
+
+def export_figures(figures, output_dir, max_workers=None, force=False):
+    """Exporta as figuras em paralelo, pulando as que não mudaram.
+
+    `figures` é um dicionário nome -> figura. Cada figura só é exportada se
+    o hash do seu spec for diferente do registrado no manifest (ou se algum
+    arquivo estiver faltando). `max_workers` define o tamanho do pool de
+    processos (padrão: variável VISUALIZATION_WORKERS ou número de CPUs).
+    Retorna os tempos de exportação por figura.
+    """
+    output_dir = Path(output_dir)
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = {}
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+
+    if max_workers is None:
+        max_workers = int(os.environ.get('VISUALIZATION_WORKERS', 0)) or os.cpu_count()
+
+    _write_shared_plotlyjs(output_dir, manifest)
+
+    pending = {}
+    for name, fig in figures.items():
+        fig_json = fig.to_json()
+        digest = figure_hash(fig_json)
+        html_path = output_dir / f"{name}.html"
+        png_path = output_dir / f"{name}.png"
+        if not force and manifest.get(name) == digest and html_path.exists() and png_path.exists():
+            print(f"{name}: sem alterações, exportação ignorada")
+            continue
+        pending[name] = (digest, fig_json, str(html_path), str(png_path))
+
+    timings = {}
+    try:
+        if pending:
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+                futures = [
+                    pool.submit(_export_figure, name, fig_json, html_path, png_path)
+                    for name, (_, fig_json, html_path, png_path) in pending.items()
+                ]
+                for future in futures:
+                    name, figure_timings = future.result()
+                    timings[name] = figure_timings
+                    # A exportação roda em outro processo; os tempos são registrados aqui
+                    registry.observe(SPAN_METRIC, figure_timings['html'], span='export_html')
+                    registry.observe(SPAN_METRIC, figure_timings['png'], span='export_png')
+                    manifest[name] = pending[name][0]
+                    print(f"Salvo {name}: HTML {figure_timings['html']:.2f} s, "
+                          f"PNG {figure_timings['png']:.2f} s")
+    finally:
+        # Registra o que foi exportado mesmo se alguma figura falhar
+        manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+    return timings
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+from src.analysis.aggregations import DURATION_LABELS
+
+
+def normalize_filters(genres=None, popularity_min=None, popularity_max=None,
+                      explicit=None, duration=None, dedup=False):
+    """Forma canônica (hashable) de um filtro; filtros vazios são omitidos.
+
+    A mesma combinação de filtros, em qualquer ordem, gera a mesma tupla,
+    que serve de chave para os caches de resultado. `dedup` descarta as
+    versões duplicadas das faixas (resolvido pelo analyzer, não pelo índice).
+    """
+    filters = []
+    if genres:
+        filters.append(('genres', tuple(sorted(set(genres)))))
+    if popularity_min is not None:
+        filters.append(('popularity_min', int(popularity_min)))
+    if popularity_max is not None:
+        filters.append(('popularity_max', int(popularity_max)))
+    if explicit is not None:
+        filters.append(('explicit', bool(explicit)))
+    if duration:
+        unknown = set(duration) - set(DURATION_LABELS)
+        if unknown:
+            raise ValueError(f"Categoria de duração desconhecida: {', '.join(sorted(unknown))}")
+        filters.append(('duration', tuple(c for c in DURATION_LABELS if c in duration)))
+    if dedup:
+        filters.append(('dedup', True))
+    return tuple(filters)
+
+
+class FilterIndex:
+    """Índices pré-computados para filtrar o dataset sem varrer as colunas.
+
+    - gênero: posições das linhas agrupadas por gênero (argsort dos códigos)
+      e o offset de cada gênero nesse vetor;
+    - popularidade: posições ordenadas pela popularidade, para resolver uma
+      faixa com duas buscas binárias;
+    - explícito e categoria de duração: bitmaps (`np.packbits`) por valor.
+
+    `select` combina os filtros numa máscara e devolve as posições das
+    linhas selecionadas, em ordem.
+    """
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+
+        codes, genres = pd.factorize(df['genre'], sort=True)
+        self.genre_codes = {genre: code for code, genre in enumerate(genres)}
+        self.genre_rows = np.argsort(codes, kind='stable').astype(np.int64)
+        self.genre_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(codes, minlength=len(genres)))]
+        )
+
+        popularity = df['popularity'].to_numpy()
+        self.popularity_rows = np.argsort(popularity, kind='stable').astype(np.int64)
+        self.popularity_sorted = popularity[self.popularity_rows]
+
+        explicit = df['explicit'].to_numpy(dtype=bool)
+        self.explicit_bitmaps = {
+            True: np.packbits(explicit),
+            False: np.packbits(~explicit)
+        }
+
+        duration = df['duration_category'].astype('category').cat.set_categories(DURATION_LABELS)
+        duration_codes = duration.cat.codes.to_numpy()
+        self.duration_bitmaps = {
+            category: np.packbits(duration_codes == code)
+            for code, category in enumerate(DURATION_LABELS)
+        }
+
+    @property
+    def genres(self):
+        return list(self.genre_codes)
+
+    def _unpack(self, bitmap):
+        return np.unpackbits(bitmap, count=self.n_rows).view(bool)
+
+    def _rows_mask(self, rows):
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def genre_mask(self, genres):
+        codes = [self.genre_codes[g] for g in genres if g in self.genre_codes]
+        rows = [self.genre_rows[self.genre_offsets[c]:self.genre_offsets[c + 1]] for c in codes]
+        return self._rows_mask(np.concatenate(rows) if rows else np.empty(0, dtype=np.int64))
+
+    def popularity_mask(self, low=None, high=None):
+        """Linhas com popularidade em [low, high] (limites inclusivos)"""
+        start = 0 if low is None else np.searchsorted(self.popularity_sorted, low, side='left')
+        stop = self.n_rows if high is None else np.searchsorted(self.popularity_sorted, high, side='right')
+        return self._rows_mask(self.popularity_rows[start:stop])
+
+    def duration_bitmap(self, categories):
+        bitmap = np.zeros_like(self.duration_bitmaps[DURATION_LABELS[0]])
+        for category in categories:
+            np.bitwise_or(bitmap, self.duration_bitmaps[category], out=bitmap)
+        return bitmap
+
+    def select(self, filters):
+        """Posições das linhas que atendem `filters` (saída de `normalize_filters`).
+
+        Retorna None quando não há filtro (dataset inteiro).
+        """
+        filters = dict(filters)
+        if not filters:
+            return None
+
+        # Filtros de bitmap são combinados ainda compactados
+        bitmap = None
+        if 'explicit' in filters:
+            bitmap = self.explicit_bitmaps[filters['explicit']].copy()
+        if 'duration' in filters:
+            duration = self.duration_bitmap(filters['duration'])
+            bitmap = duration if bitmap is None else np.bitwise_and(bitmap, duration, out=bitmap)
+
+        mask = None if bitmap is None else self._unpack(bitmap)
+        if 'genres' in filters:
+            genre = self.genre_mask(filters['genres'])
+            mask = genre if mask is None else np.logical_and(mask, genre, out=genre)
+        if 'popularity_min' in filters or 'popularity_max' in filters:
+            popularity = self.popularity_mask(filters.get('popularity_min'), filters.get('popularity_max'))
+            mask = popularity if mask is None else np.logical_and(mask, popularity, out=popularity)
+
+        return np.flatnonzero(mask)
@@ -0,0 +1,128 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Limites (em segundos) dos buckets dos histogramas de latência
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SPAN_METRIC = 'dashboard_span_seconds'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Histogramas de latência e métricas coletadas sob demanda, no formato do Prometheus.
+
+    `span(nome)` mede um trecho de código e registra a duração no histograma
+    `dashboard_span_seconds{span="nome"}`; `timed()` faz o mesmo como
+    decorador. Métricas de outros componentes (ex.: contadores de cache) são
+    lidas na hora de `render` pelos coletores registrados com `add_collector`.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._help = {SPAN_METRIC: 'Duração das etapas do dashboard'}
+        self._collectors = []
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def observe(self, name, value, **labels):
+        """Registra uma observação (em segundos) no histograma `name`"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0
+                }
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(SPAN_METRIC, time.perf_counter() - start, span=name)
+
+    def timed(self, name=None):
+        """Decorador: mede cada chamada como um span (padrão: nome da função)"""
+        def decorator(func):
+            span_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def add_collector(self, collector):
+        """`collector()` devolve [(nome, tipo, ajuda, [(labels, valor), ...]), ...]"""
+        self._collectors.append(collector)
+        return collector
+
+    def span_summary(self):
+        """Contagem e tempo total por span (para relatórios e benchmarks)"""
+        with self._lock:
+            return {
+                dict(labels)['span']: {'count': h['count'], 'sum': h['sum']}
+                for (name, labels), h in self._histograms.items() if name == SPAN_METRIC
+            }
+
+    def render(self):
+        """Texto no formato de exposição do Prometheus (versão 0.0.4)"""
+        lines = []
+        with self._lock:
+            histograms = {
+                key: {**h, 'buckets': list(h['buckets'])} for key, h in self._histograms.items()
+            }
+
+        for name in sorted({name for name, _ in histograms}):
+            lines.append(f"# HELP {name} {self._help.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for (metric, labels), h in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                for bound, count in zip(self.buckets + (float('inf'),), h['buckets'] + [h['count']]):
+                    bucket_labels = labels + (('le', _format_value(float(bound))),)
+                    lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {h['sum']!r}")
+                lines.append(f"{name}_count{_format_labels(labels)} {h['count']}")
+
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(
+                        f"{name}{_format_labels(tuple(sorted(labels.items())))} {_format_value(value)}"
+                    )
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+span = registry.span
+timed = registry.timed
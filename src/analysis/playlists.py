@@ -0,0 +1,273 @@
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Composição sugerida por `generate_recommendations`: fração da playlist e
+# faixa de popularidade (limites inclusivos) de cada grupo de músicas
+PLAYLIST_MIX = {'musicas_populares': 0.4, 'musicas_trending': 0.3, 'musicas_descoberta': 0.3}
+POPULARITY_BUCKETS = {
+    'musicas_populares': (60, 100),
+    'musicas_trending': (40, 59),
+    'musicas_descoberta': (0, 39)
+}
+BUCKETS = list(PLAYLIST_MIX)
+
+DEFAULT_LENGTH = 20
+MAX_LENGTH = 200
+MAX_BATCH = 10_000
+# Minutos em torno da duração ideal aceitos para cada música e para a média
+DURATION_TOLERANCE = 1.0
+# Candidatos de cada pool entre os quais as playlists variam
+VARIETY = 50
+
+
+def _int(value, name, low, high):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} deve ser um inteiro entre {low} e {high}")
+    if not low <= value <= high:
+        raise ValueError(f"{name} deve ser um inteiro entre {low} e {high}")
+    return value
+
+
+def _float(value, name):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} deve ser um número positivo")
+    if not (math.isfinite(value) and value > 0):
+        raise ValueError(f"{name} deve ser um número positivo")
+    return value
+
+
+def normalize_playlist_request(spec, defaults):
+    """Forma canônica de um pedido de playlist: (restrições, semente).
+
+    `spec` aceita length, genres, min_genres, duration (minutos),
+    tolerance, mix ({grupo: fração}) e seed; o que faltar vem de `defaults`
+    (gêneros e duração ideal dos insights) e das constantes do módulo. As
+    restrições são uma tupla hashable: pedidos com as mesmas restrições são
+    resolvidos juntos. Levanta ValueError para valores inválidos.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("Cada playlist deve ser um objeto JSON")
+    length = _int(spec.get('length', DEFAULT_LENGTH), 'length', 1, MAX_LENGTH)
+
+    genres = spec.get('genres') or defaults['genres']
+    if isinstance(genres, str):
+        genres = [g.strip() for g in genres.split(',') if g.strip()]
+    genres = tuple(dict.fromkeys(str(g) for g in genres))
+    if not genres:
+        raise ValueError("Informe ao menos um gênero")
+    min_genres = _int(spec.get('min_genres', min(len(genres), length)), 'min_genres', 1, MAX_LENGTH)
+
+    mix = spec.get('mix') or PLAYLIST_MIX
+    if not isinstance(mix, dict) or set(mix) - set(BUCKETS):
+        raise ValueError(f"mix deve ter as chaves {', '.join(BUCKETS)}")
+    shares = [mix.get(bucket, 0) for bucket in BUCKETS]
+    if not all(isinstance(s, (int, float)) and s >= 0 for s in shares) or not sum(shares):
+        raise ValueError("As frações de mix devem ser números não negativos com soma positiva")
+    shares = tuple(round(s / sum(shares), 6) for s in shares)
+
+    constraints = (
+        length, genres, min_genres,
+        round(_float(spec.get('duration', defaults['duration']), 'duration'), 3),
+        round(_float(spec.get('tolerance', DURATION_TOLERANCE), 'tolerance'), 3),
+        shares
+    )
+    return constraints, _int(spec.get('seed', 0), 'seed', 0, 2 ** 31 - 1)
+
+
+def bucket_counts(length, shares):
+    """Músicas de cada grupo numa playlist de `length` (maiores restos)"""
+    exact = np.asarray(shares) * length
+    counts = np.floor(exact).astype(np.int64)
+    remainder = length - counts.sum()
+    counts[np.argsort(-(exact - counts), kind='stable')[:remainder]] += 1
+    return counts
+
+
+def _mix64(values):
+    """Hash splitmix64 (vetorizado) para variar as playlists por semente"""
+    with np.errstate(over='ignore'):
+        z = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+class PlaylistComposer:
+    """Monta playlists em lote a partir de pools de candidatas pré-computados.
+
+    Cada música (uma vez por id) pertence a um grupo de popularidade
+    (`POPULARITY_BUCKETS`) e a um gênero. Para uma duração ideal e uma
+    tolerância, o pool de cada (grupo, gênero) lista primeiro as músicas
+    dentro da tolerância, da mais popular para a menos popular, e depois as
+    demais, da duração mais próxima para a mais distante. Os pools de cada
+    duração ficam em cache (LRU).
+
+    Pedidos com as mesmas restrições compartilham um plano guloso: quantas
+    músicas de cada (grupo, gênero), com o excedente de pools pequenos
+    remanejado para outros gêneros e, em último caso, outros grupos. As
+    playlists do lote são então preenchidas de uma vez (NumPy), cada uma
+    a partir de um deslocamento derivado da semente dentro dos `VARIETY`
+    primeiros candidatos de cada pool na tolerância, sem repetir músicas.
+    """
+
+    def __init__(self, df, max_pools=8):
+        # A mesma música pode aparecer em vários gêneros: entra só no primeiro
+        self.rows = np.flatnonzero(~df['id'].duplicated().to_numpy())
+        genre_codes, genres = pd.factorize(df['genre'], sort=True)
+        self.genres = pd.Index(np.asarray(genres))
+        self.genre_codes = genre_codes.astype(np.int32)
+
+        popularity = df['popularity'].to_numpy()
+        self.bucket_codes = np.full(len(df), -1, dtype=np.int8)
+        for code, bucket in enumerate(BUCKETS):
+            low, high = POPULARITY_BUCKETS[bucket]
+            self.bucket_codes[(popularity >= low) & (popularity <= high)] = code
+        self.popularity = popularity
+        self.duration = df['duration_min'].to_numpy(dtype=np.float64)
+
+        self.max_pools = max_pools
+        self._pools = OrderedDict()
+        self._lock = threading.Lock()
+
+    def pools(self, duration, tolerance):
+        """Pools da duração ideal: (linhas concatenadas, offsets e músicas na tolerância por grupo x gênero)"""
+        key = (duration, tolerance)
+        with self._lock:
+            if key in self._pools:
+                self._pools.move_to_end(key)
+                return self._pools[key]
+
+        rows = self.rows[self.bucket_codes[self.rows] >= 0]
+        distance = np.abs(self.duration[rows] - duration)
+        outside = distance > tolerance
+        pool_codes = self.bucket_codes[rows].astype(np.int64) * len(self.genres) + self.genre_codes[rows]
+        # Dentro da tolerância: mais populares primeiro; fora: mais próximas primeiro
+        rank = np.where(outside, distance, -self.popularity[rows])
+        order = np.lexsort((rows, rank, outside, pool_codes))
+        n_pools = len(BUCKETS) * len(self.genres)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(pool_codes, minlength=n_pools))])
+        inside = np.bincount(pool_codes[~outside], minlength=n_pools)
+        pools = (rows[order], offsets, inside)
+
+        with self._lock:
+            self._pools[key] = pools
+            while len(self._pools) > self.max_pools:
+                self._pools.popitem(last=False)
+        return pools
+
+    def plan(self, constraints, offsets, inside):
+        """Plano guloso das restrições: pool, índice no pool e janela de cada posição"""
+        length, genres, min_genres, _, _, shares = constraints
+        unknown = [g for g in genres if g not in self.genres]
+        if unknown:
+            raise ValueError(f"Gênero desconhecido: {', '.join(unknown)}")
+        used = self.genres.get_indexer(genres[:length])
+        n_genres = len(self.genres)
+        capacity = np.diff(offsets).reshape(len(BUCKETS), n_genres)[:, used]
+
+        # Distribui cada grupo pelos gêneros em rodízio
+        wanted = np.zeros((len(BUCKETS), len(used)), dtype=np.int64)
+        slot_buckets = np.repeat(np.arange(len(BUCKETS)), bucket_counts(length, shares))
+        np.add.at(wanted, (slot_buckets, np.arange(length) % len(used)), 1)
+
+        # Pools pequenos: o excedente vai para o gênero com mais folga no mesmo
+        # grupo e, se o grupo esgotar, para o (grupo, gênero) com mais folga
+        counts = np.minimum(wanted, capacity)
+        excess = (wanted - counts).sum(axis=1)
+        for bucket in range(len(BUCKETS)):
+            while excess[bucket] > 0 and (capacity[bucket] - counts[bucket]).max() > 0:
+                counts[bucket, np.argmax(capacity[bucket] - counts[bucket])] += 1
+                excess[bucket] -= 1
+        for _ in range(excess.sum()):
+            spare = capacity - counts
+            if spare.max() <= 0:
+                break
+            counts[np.unravel_index(np.argmax(spare), spare.shape)] += 1
+
+        pairs = (np.arange(len(BUCKETS))[:, None] * n_genres + used[None, :]).ravel()
+        pair_counts = counts.ravel()
+        slot_pairs = np.repeat(pairs, pair_counts)
+        slot_index = np.arange(pair_counts.sum()) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+        # As playlists variam entre os melhores candidatos: os `VARIETY`
+        # primeiros na tolerância (ou os necessários, se forem mais)
+        windows = np.maximum(pair_counts, np.minimum(inside[pairs], VARIETY))
+        windows = np.repeat(np.minimum(capacity.ravel(), windows), pair_counts)
+        # Intercala os gêneros ao longo da playlist
+        order = np.lexsort((slot_pairs % n_genres, slot_index))
+        return slot_pairs[order], slot_index[order], windows[order]
+
+    def compose(self, requests):
+        """Linhas das playlists de um lote de pedidos (saída de `normalize_playlist_request`).
+
+        Retorna uma lista, na ordem dos pedidos, de (linhas do DataFrame,
+        relatório das restrições).
+        """
+        groups = {}
+        for position, (constraints, seed) in enumerate(requests):
+            groups.setdefault(constraints, []).append((position, seed))
+
+        results = [None] * len(requests)
+        for constraints, members in groups.items():
+            _, _, _, duration, tolerance, _ = constraints
+            pool_rows, offsets, inside = self.pools(duration, tolerance)
+            slot_pairs, slot_index, windows = self.plan(constraints, offsets, inside)
+
+            positions = [p for p, _ in members]
+            seeds = np.array([s for _, s in members], dtype=np.uint64)
+            # Deslocamento de cada playlist em cada pool: posições distintas
+            # dentro da janela do pool
+            starts = _mix64(seeds[:, None] * np.uint64(1_000_003) + slot_pairs[None, :].astype(np.uint64))
+            starts = (starts % windows.astype(np.uint64)).astype(np.int64)
+            picks = (starts + slot_index[None, :]) % windows
+            rows = pool_rows[offsets[slot_pairs][None, :] + picks]
+
+            for position, playlist_rows, report in zip(positions, rows, self.report(rows, constraints)):
+                results[position] = (playlist_rows, report)
+        return results
+
+    def report(self, rows, constraints):
+        """Quanto cada playlist (linha de `rows`) atende às restrições"""
+        length, genres, min_genres, duration, tolerance, shares = constraints
+        n_playlists, n_tracks = rows.shape
+        target = bucket_counts(length, shares)
+
+        buckets = self.bucket_codes[rows]
+        counts = np.stack([(buckets == code).sum(axis=1) for code in range(len(BUCKETS))], axis=1)
+        genre_codes = np.sort(self.genre_codes[rows], axis=1)
+        distinct = (n_tracks > 0) + (np.diff(genre_codes, axis=1) != 0).sum(axis=1)
+        durations = self.duration[rows]
+        mean_duration = durations.mean(axis=1) if n_tracks else np.full(n_playlists, np.nan)
+        in_tolerance = (np.abs(durations - duration) <= tolerance).mean(axis=1) if n_tracks else np.zeros(n_playlists)
+
+        checks = {
+            'tamanho': np.full(n_playlists, n_tracks == length),
+            'mix': (counts == target).all(axis=1),
+            'generos': distinct >= min(min_genres, length),
+            'duracao': np.abs(mean_duration - duration) <= tolerance
+        }
+        satisfied = np.logical_and.reduce(list(checks.values()))
+
+        # Listas Python de uma vez: os relatórios são montados sem tocar no NumPy
+        target = dict(zip(BUCKETS, target.tolist()))
+        rows = zip(counts.tolist(), distinct.tolist(), mean_duration.tolist(), in_tolerance.tolist(),
+                   zip(*[check.tolist() for check in checks.values()]), satisfied.tolist())
+        for playlist_counts, n_genres, mean, near, flags, ok in rows:
+            yield {
+                'musicas': n_tracks,
+                'mix': dict(zip(BUCKETS, playlist_counts)),
+                'mix_alvo': target,
+                'generos': n_genres,
+                'duracao_media': mean,
+                'duracao_alvo': duration,
+                'na_tolerancia': near,
+                'restricoes': dict(zip(checks, flags)),
+                'atende': ok
+            }
@@ -0,0 +1,228 @@
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Peso de cada coluna no vetor de características (colunas numéricas
+# padronizadas; explícito entra como 0/1)
+FEATURE_WEIGHTS = {'popularity': 1.0, 'duration': 1.0, 'explicit': 0.5}
+# Distância (ao quadrado) somada quando o artista principal é outro
+ARTIST_WEIGHT = 0.5
+# Linhas por bloco da busca por força bruta (buffers cabem no cache L2)
+BLOCK_ROWS = 16_384
+
+ARRAYS = ('order', 'features', 'artists', 'genre_offsets', 'id_keys', 'id_codes',
+          'id_positions', 'id_offsets')
+
+
+def primary_artists(artists):
+    """Primeiro artista de cada faixa ('A, B' -> 'A')"""
+    return pd.Series(artists).astype(str).str.split(', ', n=1).str[0]
+
+
+class SimilarityIndex:
+    """Índice de vizinhos das faixas por gênero, artista, popularidade, duração e explícito.
+
+    Cada faixa vira um vetor float32 compacto (popularidade e log da duração
+    padronizados, explícito 0/1, cada um com seu peso em `FEATURE_WEIGHTS`)
+    mais o código do artista principal. Os vetores ficam por coluna
+    (`features[j]` é a característica j de todas as faixas) e as faixas
+    ordenadas por gênero, então o gênero de uma semente é uma fatia contígua.
+
+    A distância entre duas faixas é a euclidiana ao quadrado dos vetores mais
+    `ARTIST_WEIGHT` se os artistas principais forem diferentes. As consultas
+    são força bruta em blocos (NumPy) sobre os gêneros das sementes: faixas do
+    mesmo gênero vêm primeiro, e os demais gêneros só completam o resultado
+    quando esses gêneros não têm faixas suficientes.
+    """
+
+    def __init__(self, df):
+        genre_codes, self.genres = pd.factorize(df['genre'], sort=True)
+        self.order = np.argsort(genre_codes, kind='stable').astype(np.int64)
+        self.genre_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(genre_codes, minlength=len(self.genres)))]
+        ).astype(np.int64)
+
+        popularity = df['popularity'].to_numpy(dtype=np.float64)
+        duration = np.log(np.maximum(df['duration_ms'].to_numpy(dtype=np.float64), 1))
+        features = np.column_stack([
+            self._standardize(popularity) * FEATURE_WEIGHTS['popularity'],
+            self._standardize(duration) * FEATURE_WEIGHTS['duration'],
+            df['explicit'].to_numpy(dtype=np.float64) * FEATURE_WEIGHTS['explicit']
+        ])
+        self.features = np.ascontiguousarray(features[self.order].T, dtype=np.float32)
+
+        artist_codes, _ = pd.factorize(primary_artists(df['artists']))
+        self.artists = artist_codes[self.order].astype(np.int32)
+
+        # Busca por id: ids únicos ordenados (bytes) e, para cada id, as
+        # posições das suas linhas (a mesma faixa pode estar em vários gêneros)
+        id_codes, ids = pd.factorize(df['id'], sort=True)
+        self.id_keys = np.array([str(i).encode('utf-8') for i in ids])
+        self.id_codes = id_codes[self.order].astype(np.int32)
+        self.id_positions = np.argsort(self.id_codes, kind='stable').astype(np.int64)
+        self.id_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(self.id_codes, minlength=len(ids)))]
+        ).astype(np.int64)
+
+    @staticmethod
+    def _standardize(values):
+        std = values.std()
+        return (values - values.mean()) / (std if std > 0 else 1)
+
+    def __len__(self):
+        return len(self.order)
+
+    def positions(self, track_id):
+        """Posições (no vetor ordenado por gênero) das linhas de uma faixa; vazio se não existir"""
+        key = str(track_id).encode('utf-8')
+        code = np.searchsorted(self.id_keys, key)
+        if code == len(self.id_keys) or self.id_keys[code] != key:
+            return np.empty(0, dtype=np.int64)
+        return self.id_positions[self.id_offsets[code]:self.id_offsets[code + 1]]
+
+    def _genre_of(self, positions):
+        return np.searchsorted(self.genre_offsets, positions, side='right') - 1
+
+    def _scores(self, start, stop, seeds):
+        """Menor distância de cada faixa em [start, stop) a alguma das sementes"""
+        scores = np.empty(stop - start, dtype=np.float32)
+        distance = np.empty(min(BLOCK_ROWS, stop - start), dtype=np.float32)
+        diff = np.empty_like(distance)
+        for block in range(start, stop, BLOCK_ROWS):
+            end = min(block + BLOCK_ROWS, stop)
+            n = end - block
+            best = scores[block - start:end - start]
+            best.fill(np.inf)
+            for seed in seeds:
+                d, t = distance[:n], diff[:n]
+                d.fill(0)
+                for column in self.features:
+                    np.subtract(column[block:end], column[seed], out=t)
+                    np.multiply(t, t, out=t)
+                    np.add(d, t, out=d)
+                np.add(d, ARTIST_WEIGHT, out=d, where=self.artists[block:end] != self.artists[seed])
+                np.minimum(best, d, out=best)
+        return scores
+
+    def _best(self, positions, scores, k, excluded):
+        """Até `k` posições de menor distância, sem repetir faixas nem incluir `excluded`"""
+        m = min(2 * k + len(excluded), len(positions))
+        while True:
+            candidates = np.argpartition(scores, m - 1)[:m] if m < len(positions) else np.arange(len(positions))
+            candidates = candidates[np.lexsort((positions[candidates], scores[candidates]))]
+            codes = self.id_codes[positions[candidates]]
+            keep = ~np.isin(codes, excluded)
+            candidates, codes = candidates[keep], codes[keep]
+            # A mesma faixa em gêneros diferentes conta uma vez (a mais próxima)
+            _, first = np.unique(codes, return_index=True)
+            candidates = candidates[np.sort(first)]
+            if len(candidates) >= k or m >= len(positions):
+                candidates = candidates[:k]
+                return positions[candidates], scores[candidates]
+            m = min(2 * m, len(positions))
+
+    def query(self, track_ids, k=10):
+        """Faixas mais parecidas com `track_ids` (uma faixa ou uma playlist a completar).
+
+        Retorna (linhas do DataFrame, distâncias), em ordem de proximidade,
+        sem as próprias sementes. Levanta KeyError para ids desconhecidos.
+        """
+        seeds = []
+        for track_id in track_ids:
+            positions = self.positions(track_id)
+            if not len(positions):
+                raise KeyError(f"Música desconhecida: {track_id}")
+            seeds.append(positions)
+        if not seeds:
+            raise ValueError("Informe ao menos uma música")
+        seeds = np.unique(np.concatenate(seeds))
+        excluded = np.unique(self.id_codes[seeds])
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        # Gêneros das sementes: cada semente só é comparada com o próprio gênero
+        positions, scores = [], []
+        seed_genres = self._genre_of(seeds)
+        for genre in np.unique(seed_genres):
+            start, stop = self.genre_offsets[genre], self.genre_offsets[genre + 1]
+            positions.append(np.arange(start, stop))
+            scores.append(self._scores(start, stop, seeds[seed_genres == genre]))
+        best, distances = self._best(np.concatenate(positions), np.concatenate(scores), k, excluded)
+
+        if len(best) < k:
+            # Gêneros das sementes esgotados: completa com os demais gêneros
+            others = np.setdiff1d(np.arange(len(self.genres)), seed_genres)
+            rest = [np.arange(self.genre_offsets[g], self.genre_offsets[g + 1]) for g in others]
+            if rest:
+                rest = np.concatenate(rest)
+                rest_scores = np.concatenate([
+                    self._scores(self.genre_offsets[g], self.genre_offsets[g + 1], seeds) for g in others
+                ])
+                more, more_distances = self._best(
+                    rest, rest_scores, k - len(best), np.union1d(excluded, self.id_codes[best])
+                )
+                best = np.concatenate([best, more])
+                distances = np.concatenate([distances, more_distances])
+
+        return self.order[best], distances
+
+    def save(self, directory):
+        """Grava o índice como arquivos .npy num diretório (escrita atômica por renomeação)"""
+        directory = Path(directory)
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        tmp = directory.with_name(f".{directory.name}.{uuid.uuid4().hex}")
+        tmp.mkdir()
+        for name in ARRAYS:
+            np.save(tmp / f"{name}.npy", getattr(self, name))
+        with open(tmp / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump({
+                'genres': [str(g) for g in self.genres],
+                'feature_weights': FEATURE_WEIGHTS,
+                'artist_weight': ARTIST_WEIGHT
+            }, f)
+        try:
+            os.replace(tmp, directory)
+        except OSError:
+            # Outro processo gravou a mesma versão primeiro
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory):
+        """Índice gravado por `save`, com os arrays mapeados em memória.
+
+        Retorna None se o diretório não existir ou tiver sido gravado com
+        outros pesos.
+        """
+        directory = Path(directory)
+        try:
+            with open(directory / 'meta.json', encoding='utf-8') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        if meta['feature_weights'] != FEATURE_WEIGHTS or meta['artist_weight'] != ARTIST_WEIGHT:
+            return None
+
+        index = cls.__new__(cls)
+        index.genres = pd.Index(meta['genres'])
+        for name in ARRAYS:
+            setattr(index, name, np.load(directory / f"{name}.npy", mmap_mode='r'))
+        return index
+
+    @classmethod
+    def open(cls, df, directory=None):
+        """Índice persistido em `directory` para esta versão dos dados; construído e gravado se faltar"""
+        if directory is not None:
+            index = cls.load(directory)
+            if index is not None:
+                return index
+            # Gravado com outros pesos: é reconstruído
+            shutil.rmtree(directory, ignore_errors=True)
+        index = cls(df)
+        if directory is not None:
+            index.save(directory)
+        return index
@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+
+from src.analysis.statistics import distribution_summary
+
+# Faixas de popularidade dos sketches: [0, 10), [10, 20), ..., [90, 100), {100}
+BAND_WIDTH = 10
+
+
+def compress_centroids(groups, means, weights, compression):
+    """Compressão t-digest de vários digests de uma vez.
+
+    Recebe centroides (ou pontos, com peso 1) de vários grupos e devolve os
+    centroides comprimidos de cada grupo, ordenados por (grupo, média). Cada
+    centroide é atribuído a um cluster pela função de escala k1
+    (`compression * asin(2q - 1) / pi`) do quantil do seu centro, o que
+    mantém clusters pequenos (em geral pontos isolados) nas caudas e
+    limita cada grupo a `compression + 1` centroides.
+    """
+    order = np.lexsort((means, groups))
+    groups, means, weights = groups[order], means[order], weights[order]
+    if not len(groups):
+        return groups, means, weights
+
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    sizes = np.diff(np.r_[starts, len(groups)])
+    before = np.cumsum(weights) - weights
+    group_before = np.repeat(before[starts], sizes)
+    group_total = np.repeat(np.add.reduceat(weights, starts), sizes)
+
+    q = (before - group_before + weights / 2) / group_total
+    k = np.floor(compression * (np.arcsin(2 * q - 1) / np.pi + 0.5)).astype(np.int64)
+    clusters = groups.astype(np.int64) * (compression + 1) + k
+    boundaries = np.flatnonzero(np.r_[True, clusters[1:] != clusters[:-1]])
+
+    cluster_weights = np.add.reduceat(weights, boundaries)
+    cluster_means = np.add.reduceat(means * weights, boundaries) / cluster_weights
+    return groups[boundaries], cluster_means, cluster_weights
+
+
+class TDigest:
+    """Sketch t-digest de uma distribuição: quantis com erro limitado em O(compression).
+
+    Além dos centroides guarda contagem, soma, soma dos quadrados, mínimo e
+    máximo exatos. Digests são combinados concatenando e recomprimindo os
+    centroides (`merge`).
+    """
+
+    def __init__(self, means, weights, minimum, maximum, total, total_sq, compression=200):
+        self.means = means
+        self.weights = weights
+        self.min = minimum
+        self.max = maximum
+        self.sum = total
+        self.sumsq = total_sq
+        self.compression = compression
+
+    @classmethod
+    def from_values(cls, values, compression=200):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        _, means, weights = compress_centroids(
+            np.zeros(len(values), dtype=np.int64), values, np.ones(len(values)), compression
+        )
+        return cls(means, weights, values.min(initial=np.inf), values.max(initial=-np.inf),
+                   values.sum(), np.square(values).sum(), compression)
+
+    @classmethod
+    def merge(cls, digests, compression=200):
+        digests = list(digests)
+        means = np.concatenate([d.means for d in digests]) if digests else np.empty(0)
+        weights = np.concatenate([d.weights for d in digests]) if digests else np.empty(0)
+        _, means, weights = compress_centroids(
+            np.zeros(len(means), dtype=np.int64), means, weights, compression
+        )
+        return cls(
+            means, weights,
+            min((d.min for d in digests), default=np.inf),
+            max((d.max for d in digests), default=-np.inf),
+            sum(d.sum for d in digests), sum(d.sumsq for d in digests), compression
+        )
+
+    @property
+    def count(self):
+        return int(round(self.weights.sum()))
+
+    def mean(self):
+        return self.sum / self.count if self.count else np.nan
+
+    def quantile(self, q):
+        """Quantil(is) `q`, com a mesma interpolação linear de `np.quantile`.
+
+        Cada centroide representa seus pontos centrado no seu peso
+        acumulado; com todos os pesos iguais a 1 o resultado é exato.
+        """
+        if not self.count:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.r_[0.5, centers, total - 0.5]
+        values = np.r_[self.min, self.means, self.max]
+        return np.interp(np.asarray(q, dtype=float) * (total - 1) + 0.5, positions, values)
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def summary(self, grid_size=512, max_outliers=200):
+        """Resumo para violino/box (mesmo formato de `distribution_summary`)"""
+        if not self.count:
+            # Digest vazio: min/max são ±inf e não há quartis
+            return distribution_summary(np.empty(0))
+        q1, median, q3 = self.quantile([0.25, 0.5, 0.75])
+        summary = distribution_summary(
+            self.means, weights=self.weights, quartiles=(q1, median, q3),
+            grid_size=grid_size, max_outliers=max_outliers
+        )
+        # Perto das cercas os centroides agrupam vários pontos; como a cauda é
+        # contínua, o ponto mais extremo dentro da cerca fica junto ao limite
+        iqr = q3 - q1
+        summary['lowerfence'] = max(self.min, q1 - 1.5 * iqr)
+        summary['upperfence'] = min(self.max, q3 + 1.5 * iqr)
+        return summary
+
+
+class QuantileSketches:
+    """Sketches t-digest de uma coluna por gênero e por faixa de popularidade.
+
+    Todos os digests (um por célula gênero x faixa de `BAND_WIDTH` pontos)
+    ficam em arrays planos ordenados por célula, construídos de uma vez por
+    `compress_centroids`. `digest` combina as células selecionadas, o que
+    responde medianas, percentis e resumos de violino/box de qualquer
+    conjunto de gêneros e faixas sem reler a coluna. Sketches de blocos
+    disjuntos são combinados com `merge` (remoções exigem reconstruir).
+    """
+
+    def __init__(self, df=None, column='duration_min', compression=200):
+        self.column = column
+        self.compression = compression
+        if df is None:
+            return
+
+        genre_codes, genres = pd.factorize(df['genre'], sort=True)
+        bands = df['popularity'].to_numpy() // BAND_WIDTH
+        values = df[column].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        cells, cell_codes = np.unique(
+            genre_codes[valid].astype(np.int64) * (100 // BAND_WIDTH + 1) + bands[valid],
+            return_inverse=True
+        )
+        genre_index, band_index = np.divmod(cells, 100 // BAND_WIDTH + 1)
+        self._set_cells(
+            pd.MultiIndex.from_arrays(
+                [np.asarray(genres)[genre_index], band_index * BAND_WIDTH],
+                names=['genre', 'popularity_band']
+            ),
+            cell_codes, values[valid], np.ones(valid.sum())
+        )
+
+    def _set_cells(self, index, cell_codes, means, weights, stats=None):
+        """Comprime os centroides por célula e guarda as estatísticas exatas"""
+        n_cells = len(index)
+        if stats is None:
+            stats = pd.DataFrame({
+                'min': pd.Series(means).groupby(cell_codes).min().reindex(range(n_cells)).to_numpy(),
+                'max': pd.Series(means).groupby(cell_codes).max().reindex(range(n_cells)).to_numpy(),
+                'sum': np.bincount(cell_codes, weights=means * weights, minlength=n_cells),
+                'sumsq': np.bincount(cell_codes, weights=means * means * weights, minlength=n_cells)
+            })
+        self.cells = stats.set_axis(index)
+        self.cell_codes, self.means, self.weights = compress_centroids(
+            cell_codes, means, weights, self.compression
+        )
+        self.offsets = np.searchsorted(self.cell_codes, np.arange(n_cells + 1))
+
+    @classmethod
+    def merge(cls, parts):
+        """Combina sketches de partes disjuntas do dataset"""
+        parts = list(parts)
+        merged = cls(column=parts[0].column, compression=parts[0].compression)
+        index = parts[0].cells.index
+        for part in parts[1:]:
+            index = index.union(part.cells.index)
+
+        cell_codes, means, weights = [], [], []
+        stats = []
+        for part in parts:
+            codes = index.get_indexer(part.cells.index)
+            cell_codes.append(codes[part.cell_codes])
+            means.append(part.means)
+            weights.append(part.weights)
+            stats.append(part.cells.set_axis(codes))
+        stats = pd.concat(stats).groupby(level=0).agg(
+            {'min': 'min', 'max': 'max', 'sum': 'sum', 'sumsq': 'sum'}
+        ).reindex(range(len(index)))
+
+        merged._set_cells(
+            index, np.concatenate(cell_codes), np.concatenate(means),
+            np.concatenate(weights), stats.reset_index(drop=True)
+        )
+        return merged
+
+    def digest(self, genres=None, popularity_min=None, popularity_max=None):
+        """TDigest combinado dos gêneros e da faixa de popularidade [min, max].
+
+        Os limites de popularidade precisam coincidir com as bordas das faixas
+        (min múltiplo de `BAND_WIDTH`; max igual a um múltiplo menos 1, ou 100).
+        """
+        if popularity_min is not None and popularity_min % BAND_WIDTH:
+            raise ValueError(f"popularity_min deve ser múltiplo de {BAND_WIDTH}")
+        if popularity_max is not None and popularity_max != 100 and (popularity_max + 1) % BAND_WIDTH:
+            raise ValueError(f"popularity_max deve terminar uma faixa de {BAND_WIDTH} pontos")
+
+        selected = np.ones(len(self.cells), dtype=bool)
+        if genres is not None:
+            selected &= self.cells.index.get_level_values('genre').isin(genres)
+        band = self.cells.index.get_level_values('popularity_band').to_numpy()
+        if popularity_min is not None:
+            selected &= band >= popularity_min
+        if popularity_max is not None:
+            selected &= band <= popularity_max
+        cells = np.flatnonzero(selected)
+
+        rows = np.concatenate(
+            [np.arange(self.offsets[c], self.offsets[c + 1]) for c in cells]
+        ) if len(cells) else np.empty(0, dtype=np.int64)
+        _, means, weights = compress_centroids(
+            np.zeros(len(rows), dtype=np.int64), self.means[rows], self.weights[rows],
+            self.compression
+        )
+        stats = self.cells.iloc[cells]
+        return TDigest(
+            means, weights, stats['min'].min() if len(cells) else np.inf,
+            stats['max'].max() if len(cells) else -np.inf,
+            stats['sum'].sum(), stats['sumsq'].sum(), self.compression
+        )
@@ -1,197 +1,584 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
 from pathlib import Path
 from scipy import stats
 import os
+import copy
+from src.analysis.dataset_cache import dataset_cache
+from src.analysis.delta_parts import KEY_COLUMNS, delta_files, latest_rows
+from src.analysis.datasets import dataset_registry, DEFAULT_DATASET
+from src.analysis.aggregations import GroupAggregates, add_categories
+from src.analysis.figure_export import export_figures
+from src.analysis.filter_index import FilterIndex
+from src.analysis.similarity import SimilarityIndex
+from src.analysis.catalog import CatalogStore, concentration
+from src.analysis.playlists import PlaylistComposer, PLAYLIST_MIX, normalize_playlist_request
+from src.analysis.sketches import QuantileSketches
+from src.etl.deduplication import find_duplicates
+from src.analysis.instrumentation import timed
+from src.analysis.theme import spotify_figure, GREEN_SCALE, SPOTIFY_GREEN, WHITE
+from src.analysis.statistics import (
+    confidence_interval_halfwidth, bootstrap_halfwidth, one_way_anova
+)
 
 class SpotifyAnalyzer:
-    def __init__(self):
-        self.data_path = Path('data/processed/processed_spotify.csv')
+    def __init__(self, dataset_id=None):
+        """`dataset_id`: catálogo do registro de datasets (padrão: 'spotify')"""
+        self.dataset_id = dataset_id or DEFAULT_DATASET
+        self.data_path = dataset_registry.path(self.dataset_id)
         self.visualization_path = Path('static/visualization')
         self.df = None
+        self._aggregates = None
+        self._sketches = None
+        self._filter_index = None
+        self._similarity_index = None
+        self._playlist_composer = None
+        self._catalog = None
+        self._duplicates = None
+        self._full_dataset = False
+        self.snapshot = None
         
         # Criar diretório de visualização se não existir
         os.makedirs(self.visualization_path, exist_ok=True)
         print(f"Diretório de visualizações criado em: {self.visualization_path}")
     
-    def load_data(self):
-        """Carrega os dados processados"""
-        self.df = pd.read_csv(self.data_path)
-        
-        # Criando categorias de popularidade para análises
-        self.df['popularity_category'] = pd.cut(
-            self.df['popularity'],
-            bins=[0, 20, 40, 60, 80, 100],
-            labels=['Muito Baixa', 'Baixa', 'Média', 'Alta', 'Muito Alta']
-        )
-        
-        # Criando categorias de duração
-        self.df['duration_category'] = pd.cut(
-            self.df['duration_min'],
-            bins=[0, 2, 3, 4, 5, float('inf')],
-            labels=['Muito Curta', 'Curta', 'Média', 'Longa', 'Muito Longa']
+    add_categories = staticmethod(add_categories)
+    
+    @staticmethod
+    def default_data_path():
+        """Arquivo processado a analisar: formato colunar quando disponível; CSV como fallback"""
+        return dataset_registry.path(DEFAULT_DATASET)
+    
+    @staticmethod
+    def _columnar_projection(columns):
+        """Colunas a ler do Parquet (duration_min é derivada de duration_ms)"""
+        if columns is None:
+            return None
+        projection = [col for col in columns if col != 'duration_min']
+        if 'duration_min' in columns and 'duration_ms' not in projection:
+            projection.append('duration_ms')
+        return projection
+    
+    @staticmethod
+    def _from_columnar(table, columns=None):
+        import pyarrow as pa
+        
+        # Strings ficam em buffers Arrow (sem um objeto Python por valor)
+        string_dtype = pd.StringDtype('pyarrow')
+        df = table.to_pandas(
+            types_mapper={pa.string(): string_dtype, pa.large_string(): string_dtype}.get,
+            split_blocks=True
         )
-        
+        df['duration_min'] = df['duration_ms'] / 60000
+        if columns is not None:
+            df = df[columns]
+        return df
+    
+    @classmethod
+    def _delta_projection(cls, columns):
+        """Projeção do Parquet incluindo a chave usada para aplicar as partes incrementais"""
+        projection = cls._columnar_projection(columns)
+        if projection is None:
+            return None
+        return projection + [col for col in KEY_COLUMNS if col not in projection]
+    
+    @classmethod
+    def read_raw(cls, path, columns=None):
+        """Lê o arquivo processado (Parquet mapeado em memória ou CSV)
+        
+        As partes gravadas pela ingestão incremental são aplicadas sobre o
+        Parquet base: vale a versão mais recente de cada (id, gênero).
+        """
+        if Path(path).suffix == '.parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            
+            deltas = delta_files(path)
+            if not deltas:
+                table = pq.read_table(
+                    path, columns=cls._columnar_projection(columns), memory_map=True
+                )
+                return cls._from_columnar(table, columns)
+            
+            tables = [pq.read_table(file, columns=cls._delta_projection(columns), memory_map=True)
+                      for file in [path, *deltas]]
+            keep = latest_rows(tables[0].select(KEY_COLUMNS).to_pandas(),
+                               [table.select(KEY_COLUMNS).to_pandas() for table in tables[1:]])
+            table = pa.concat_tables(
+                [table.replace_schema_metadata() for table in tables], promote_options='permissive'
+            ).filter(pa.array(keep))
+            return cls._from_columnar(table, columns)
+        return pd.read_csv(path, usecols=columns)
+    
+    @classmethod
+    def iter_raw_chunks(cls, path, columns=None, chunksize=500_000):
+        """Lê o arquivo processado em blocos de até `chunksize` linhas
+        
+        Com partes incrementais, as linhas substituídas são retiradas de cada
+        bloco do Parquet base e as partes (pequenas) vêm num bloco final.
+        """
+        if Path(path).suffix == '.parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            
+            deltas = [pq.read_table(file, columns=cls._delta_projection(columns))
+                      for file in delta_files(path)]
+            delta_keys = [table.select(KEY_COLUMNS).to_pandas() for table in deltas]
+            projection = cls._delta_projection(columns) if deltas else cls._columnar_projection(columns)
+            batches = pq.ParquetFile(path, memory_map=True).iter_batches(
+                batch_size=chunksize, columns=projection
+            )
+            for batch in batches:
+                if deltas:
+                    keep = latest_rows(batch.select(KEY_COLUMNS).to_pandas(), delta_keys)
+                    batch = batch.filter(pa.array(keep[:batch.num_rows]))
+                yield cls._from_columnar(batch, columns)
+            if deltas:
+                keep = latest_rows(delta_keys[0].iloc[:0], delta_keys)
+                table = pa.concat_tables(
+                    [table.replace_schema_metadata() for table in deltas], promote_options='permissive'
+                ).filter(pa.array(keep))
+                yield cls._from_columnar(table, columns)
+        else:
+            yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+    
+    @classmethod
+    @timed()
+    def read_dataset(cls, path):
+        """Lê o arquivo processado e deriva as colunas de categoria"""
+        return cls.add_categories(cls.read_raw(path))
+    
+    def load_data(self, use_cache=True, revalidate=None):
+        """Carrega os dados processados (a partir do cache do processo por padrão)
+        
+        Com o cache, o analyzer fica preso ao snapshot carregado: frame,
+        versão e estruturas derivadas são sempre da mesma versão dos dados.
+        """
+        if use_cache:
+            self.snapshot = dataset_cache.snapshot(self.data_path, self.read_dataset, revalidate)
+            self.df = self.snapshot.frame()
+        else:
+            self.snapshot = None
+            self.df = self.read_dataset(self.data_path)
+        self._aggregates = None
+        self._sketches = None
+        self._filter_index = None
+        self._similarity_index = None
+        self._playlist_composer = None
+        self._catalog = None
+        self._duplicates = None
+        self._full_dataset = use_cache
         return self.df
     
+    @timed()
+    def load_aggregates(self, chunksize=500_000):
+        """Calcula apenas os agregados, lendo o arquivo em blocos.
+        
+        Para datasets que não cabem em memória: o pico de memória fica
+        limitado ao tamanho do bloco, e as análises que dependem só dos
+        agregados e nos sketches de quantis (ex.: `analyze_correlations`,
+        `get_business_insights`) passam a funcionar sem `self.df`.
+        """
+        columns = ['genre', 'popularity', 'duration_min', 'explicit']
+        aggregates, sketches = [], []
+        for chunk in self.iter_raw_chunks(self.data_path, columns, chunksize):
+            aggregates.append(GroupAggregates(self.add_categories(chunk)))
+            sketches.append(QuantileSketches(chunk))
+        self._aggregates = GroupAggregates.merge(aggregates)
+        self._sketches = QuantileSketches.merge(sketches)
+        return self._aggregates
+    
+    @property
+    def aggregates(self):
+        """Agregados por gênero/categoria compartilhados por todas as análises"""
+        if self._aggregates is None:
+            if self._full_dataset:
+                # Cubo persistido pelo ETL (ou calculado) uma vez por versão dos
+                # dados e compartilhado pelo processo (e pelos workers do gunicorn)
+                self._aggregates = self.snapshot.derived(
+                    'aggregates', lambda df: self._stored_aggregates() or GroupAggregates(df)
+                )
+            else:
+                self._aggregates = GroupAggregates(self.df)
+        return self._aggregates
+    
+    @property
+    def duration_sketches(self):
+        """Sketches t-digest da duração por gênero e faixa de popularidade"""
+        if self._sketches is None:
+            if self._full_dataset:
+                self._sketches = self.snapshot.derived('duration_sketches', QuantileSketches)
+            else:
+                self._sketches = QuantileSketches(self.df)
+        return self._sketches
+    
+    def _stored_aggregates(self):
+        """Agregados persistidos pelo ETL, se forem da mesma versão do arquivo carregado"""
+        path = self.data_path.parent / 'processed_spotify.aggregates.pkl'
+        if not (self._full_dataset and path.exists()):
+            return None
+        aggregates, versions = GroupAggregates.load(path)
+        if versions.get(self.data_path.name) != self.data_version()[0]:
+            return None
+        return aggregates
+    
+    @property
+    def filter_index(self):
+        """Índices de filtro do dataset carregado (compartilhados por versão dos dados)"""
+        if self._full_dataset:
+            return self.snapshot.derived('filter_index', FilterIndex)
+        if self._filter_index is None:
+            self._filter_index = FilterIndex(self.df)
+        return self._filter_index
+    
+    @property
+    def similarity_index(self):
+        """Índice de vizinhos das faixas (persistido junto do arquivo Arrow de cada versão)"""
+        if self._full_dataset:
+            directory = self.snapshot.store_path('similarity')
+            return self.snapshot.derived(
+                'similarity_index', lambda df: SimilarityIndex.open(df, directory)
+            )
+        if self._similarity_index is None:
+            self._similarity_index = SimilarityIndex(self.df)
+        return self._similarity_index
+    
+    @property
+    def playlist_composer(self):
+        """Pools de candidatas para montar playlists (compartilhados por versão dos dados)"""
+        if self._full_dataset:
+            return self.snapshot.derived('playlist_composer', PlaylistComposer)
+        if self._playlist_composer is None:
+            self._playlist_composer = PlaylistComposer(self.df)
+        return self._playlist_composer
+    
+    @property
+    def catalog(self):
+        """Artistas e álbuns codificados por dicionário (compartilhados por versão dos dados)"""
+        if self._full_dataset:
+            return self.snapshot.derived('catalog', CatalogStore)
+        if self._catalog is None:
+            self._catalog = CatalogStore(self.df)
+        return self._catalog
+    
+    @property
+    def duplicates(self):
+        """Máscara das linhas que são versões duplicadas de outra faixa do mesmo gênero"""
+        if self._full_dataset:
+            # Mapeamento persistido pelo ETL (ou calculado) uma vez por versão dos dados
+            return self.snapshot.derived('duplicates', self._full_duplicates)
+        if self._duplicates is None:
+            self._duplicates = find_duplicates(self.df)['duplicate'].to_numpy()
+        return self._duplicates
+    
+    def _full_duplicates(self, df):
+        stored = self._stored_duplicates(df)
+        return stored if stored is not None else find_duplicates(df)['duplicate'].to_numpy()
+    
+    def _stored_duplicates(self, df):
+        """Duplicatas do mapeamento canônico gravado pelo ETL, se cobrir exatamente as faixas de `df`.
+        
+        O mapeamento é casado com as linhas pela chave (id, gênero); se faltar
+        alguma faixa ou sobrar alguma linha, ele é de outra versão dos dados.
+        """
+        for suffix in ('.canonical.parquet', '.canonical.csv'):
+            path = self.data_path.with_name(self.data_path.stem + suffix)
+            if path.exists():
+                break
+        else:
+            return None
+        columns = [*KEY_COLUMNS, 'duplicate']
+        if path.suffix == '.parquet':
+            mapping = pd.read_parquet(path, columns=columns)
+        else:
+            mapping = pd.read_csv(path, usecols=columns, dtype={'id': str, 'genre': str})
+        if len(mapping) != len(df):
+            return None
+        duplicate = mapping['duplicate'].to_numpy(dtype=bool)
+        stored = [mapping[col].astype(str).to_numpy() for col in KEY_COLUMNS]
+        loaded = [df[col].astype(str).to_numpy() for col in KEY_COLUMNS]
+        if all(np.array_equal(a, b) for a, b in zip(stored, loaded)):
+            return duplicate
+        # Ingestões incrementais gravam o mapeamento em outra ordem
+        keys = pd.MultiIndex.from_arrays(stored)
+        if not keys.is_unique:
+            return None
+        rows = keys.get_indexer(pd.MultiIndex.from_arrays(loaded))
+        if (rows < 0).any():
+            return None
+        return duplicate[rows]
+    
+    def filtered(self, filters):
+        """Analyzer restrito às linhas que atendem `filters`.
+        
+        `filters` é a saída de `normalize_filters` (gêneros, faixa de
+        popularidade, explícito, categorias de duração, sem duplicatas). As
+        linhas são resolvidas pelos índices pré-computados; todas as
+        análises do novo analyzer operam só sobre o subconjunto.
+        """
+        dedup = dict(filters).get('dedup', False)
+        rows = self.filter_index.select(tuple(f for f in filters if f[0] != 'dedup'))
+        if dedup:
+            canonical = ~self.duplicates
+            rows = np.flatnonzero(canonical) if rows is None else rows[canonical[rows]]
+        if rows is None:
+            return self
+        
+        subset = copy.copy(self)
+        subset.df = self.df.take(rows)
+        subset._aggregates = None
+        subset._sketches = None
+        subset._filter_index = None
+        subset._similarity_index = None
+        subset._playlist_composer = None
+        subset._catalog = None
+        subset._duplicates = None
+        subset._full_dataset = False
+        return subset
+    
+    def deduplicated(self):
+        """Analyzer sem as versões duplicadas das faixas (uma por música e gênero)"""
+        return self.filtered((('dedup', True),))
+    
+    def data_version(self, revalidate=None):
+        """Hash do conteúdo e mtime dos dados carregados (ou da versão atual do arquivo)"""
+        if self.snapshot is not None and revalidate is None:
+            return self.snapshot.version, self.snapshot.mtime
+        return dataset_cache.version(self.data_path, self.read_dataset, revalidate)
+    
+    @timed()
     def analyze_genre_popularity(self):
         """Análise da relação entre gêneros e popularidade usando gráfico de dispersão"""
-        genre_stats = self.df.groupby('genre').agg({
-            'popularity': ['mean', 'std', 'count']
-        }).round(2)
+        genre_stats = self.aggregates.genre_summary()[
+            ['popularity_mean', 'popularity_std', 'count']
+        ].round(2)
         
         genre_stats.columns = ['popularity_mean', 'popularity_std', 'track_count']
         genre_stats = genre_stats.reset_index()
         genre_stats = genre_stats[genre_stats['track_count'] >= 5]
-        
-        fig = px.scatter(
-            genre_stats,
-            x='popularity_mean',
-            y='track_count',
-            size='track_count',
-            color='popularity_mean',
-            color_continuous_scale=[[0, '#282828'], [0.5, '#404040'], [1, '#1DB954']],
-            title='Popularidade vs. Quantidade de Músicas por Gênero',
-            labels={
-                'popularity_mean': 'Popularidade Média',
-                'track_count': 'Quantidade de Músicas',
-                'genre': 'Gênero'
-            }
-        )
-        
-        # Remover rótulos e ajustar aparência
-        fig.update_traces(
-            textposition=None,
-            text=None,
-            hovertemplate="<br>".join([
-                "Gênero: %{customdata[0]}",
-                "Popularidade Média: %{x:.1f}",
-                "Quantidade: %{y}",
-                "<extra></extra>"
-            ]),
-            customdata=genre_stats[['genre']],
-            marker=dict(
-                line=dict(color='#1DB954', width=1)
+
+        # Bolhas com área proporcional à quantidade (diâmetro máximo de 20 px)
+        sizes = genre_stats['track_count'].to_numpy()
+        fig = spotify_figure(
+            data=[dict(
+                type='scatter',
+                mode='markers',
+                x=genre_stats['popularity_mean'].to_numpy(),
+                y=sizes,
+                customdata=genre_stats[['genre']].to_numpy(),
+                hovertemplate="<br>".join([
+                    "Gênero: %{customdata[0]}",
+                    "Popularidade Média: %{x:.1f}",
+                    "Quantidade: %{y}",
+                    "<extra></extra>"
+                ]),
+                marker=dict(
+                    color=genre_stats['popularity_mean'].to_numpy(),
+                    coloraxis='coloraxis',
+                    size=sizes,
+                    sizemode='area',
+                    sizeref=sizes.max() / 20 ** 2 if len(sizes) else 1,
+                    symbol='circle',
+                    line=dict(color=SPOTIFY_GREEN, width=1)
+                ),
+                name='',
+                showlegend=False
+            )],
+            layout=dict(
+                title=dict(text='Popularidade vs. Quantidade de Músicas por Gênero'),
+                xaxis=dict(title=dict(text='Popularidade Média')),
+                yaxis=dict(title=dict(text='Quantidade de Músicas')),
+                coloraxis=dict(
+                    colorbar=dict(title=dict(text='Popularidade Média')),
+                    colorscale=GREEN_SCALE
+                ),
+                legend=dict(itemsizing='constant')
             )
         )
-        
+
         return fig
     
+    @timed()
     def analyze_explicit_by_genre(self):
         """Análise de conteúdo explícito por gênero"""
-        explicit_by_genre = self.df.groupby('genre')['explicit'].agg(['mean', 'count']).reset_index()
+        explicit_by_genre = self.aggregates.genre_summary()[['explicit_mean', 'count']]
+        explicit_by_genre = explicit_by_genre.rename(columns={'explicit_mean': 'mean'}).reset_index()
         explicit_by_genre['explicit_percentage'] = explicit_by_genre['mean'] * 100
         explicit_by_genre = explicit_by_genre[explicit_by_genre['count'] >= 10]
         explicit_by_genre = explicit_by_genre.sort_values('explicit_percentage', ascending=False)
-        
-        fig = px.bar(
-            explicit_by_genre.head(10),
-            x='genre',
-            y='explicit_percentage',
-            title='Porcentagem de Conteúdo Explícito por Gênero (Top 10)',
-            labels={
-                'genre': 'Gênero',
-                'explicit_percentage': 'Porcentagem de Músicas Explícitas'
-            }
+        top = explicit_by_genre.head(10)
+
+        fig = spotify_figure(
+            data=[dict(
+                type='bar',
+                x=top['genre'].to_numpy(),
+                y=top['explicit_percentage'].to_numpy(),
+                marker=dict(color=SPOTIFY_GREEN),
+                hovertemplate='Gênero=%{x}<br>Porcentagem de Músicas Explícitas=%{y}<extra></extra>',
+                name='',
+                showlegend=False
+            )],
+            layout=dict(
+                title=dict(text='Porcentagem de Conteúdo Explícito por Gênero (Top 10)'),
+                xaxis=dict(title=dict(text='Gênero')),
+                yaxis=dict(title=dict(text='Porcentagem de Músicas Explícitas')),
+                barmode='relative'
+            )
         )
-        
-        fig.update_traces(marker_color='#1DB954')
         return fig
     
-    def analyze_duration_distribution(self):
-        """Análise da distribuição de duração das músicas"""
-        fig = go.Figure()
-        
-        fig.add_trace(go.Violin(
-            y=self.df['duration_min'],
-            box_visible=True,
-            line_color='#1DB954',
-            fillcolor='rgba(29, 185, 84, 0.3)',
-            name='Distribuição'
-        ))
-        
-        fig.update_layout(
-            title='Distribuição da Duração das Músicas',
-            yaxis_title='Duração (minutos)',
+    @timed()
+    def analyze_duration_distribution(self, raw=False):
+        """Análise da distribuição de duração das músicas
+        
+        Por padrão a densidade (KDE) e o box plot são calculados no servidor
+        a partir do sketch de quantis da duração, e a figura leva só o resumo
+        em vez de todas as durações. Com
+        `raw=True` gera o violino original a partir dos pontos brutos.
+        """
+        layout = dict(
+            title=dict(text='Distribuição da Duração das Músicas'),
+            yaxis=dict(title=dict(text='Duração (minutos)')),
             showlegend=False
         )
-        return fig
+
+        if raw:
+            return spotify_figure(data=[dict(
+                type='violin',
+                y=self.df['duration_min'].to_numpy(),
+                box=dict(visible=True),
+                line=dict(color=SPOTIFY_GREEN),
+                fillcolor='rgba(29, 185, 84, 0.3)',
+                name='Distribuição'
+            )], layout=layout)
+
+        summary = self.duration_sketches.digest().summary()
+        density = summary['density']
+        # Seleção vazia não tem densidade; a largura fica só para o layout
+        peak = density.max() if len(density) else 1.0
+
+        traces = [
+            # Contorno do violino: densidade espelhada em torno de x=0
+            dict(
+                type='scatter',
+                x=np.concatenate([density, -density[::-1]]),
+                y=np.concatenate([summary['grid'], summary['grid'][::-1]]),
+                fill='toself',
+                mode='lines',
+                line=dict(color=SPOTIFY_GREEN),
+                fillcolor='rgba(29, 185, 84, 0.3)',
+                hoverinfo='skip',
+                name='Distribuição'
+            ),
+            dict(
+                type='box',
+                x=[0],
+                q1=[summary['q1']],
+                median=[summary['median']],
+                q3=[summary['q3']],
+                lowerfence=[summary['lowerfence']],
+                upperfence=[summary['upperfence']],
+                mean=[summary['mean']],
+                width=peak * 0.2,
+                line=dict(color=SPOTIFY_GREEN),
+                fillcolor='rgba(29, 185, 84, 0.6)',
+                name='Distribuição'
+            )
+        ]
+
+        if len(summary['outliers']):
+            traces.append(dict(
+                type='scatter',
+                x=np.zeros(len(summary['outliers'])),
+                y=summary['outliers'],
+                mode='markers',
+                marker=dict(color=SPOTIFY_GREEN, size=4),
+                name='Outliers'
+            ))
+
+        # Mesma proporção do violino do Plotly: metade da largura da faixa
+        layout['xaxis'] = dict(visible=False, range=[-2 * peak, 2 * peak])
+        return spotify_figure(data=traces, layout=layout)
     
+    @timed()
     def analyze_popularity_trends(self):
         """Análise das tendências de popularidade"""
-        popularity_stats = self.df.groupby('popularity_category').agg({
-            'duration_min': 'mean',
-            'explicit': 'mean',
-            'id': 'count'
-        }).reset_index()
+        popularity_stats = self.aggregates.popularity_category_summary()[
+            ['duration_mean', 'explicit_mean', 'count']
+        ]
+        popularity_stats.columns = ['duration_min', 'explicit', 'id']
+        popularity_stats = popularity_stats.reset_index()
         
         popularity_stats['explicit_percentage'] = popularity_stats['explicit'] * 100
-        popularity_stats['count_percentage'] = (popularity_stats['id'] / len(self.df)) * 100
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            x=popularity_stats['popularity_category'],
-            y=popularity_stats['count_percentage'],
-            name='% do Total de Músicas',
-            marker_color='#1DB954',
-            yaxis='y'
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=popularity_stats['popularity_category'],
-            y=popularity_stats['duration_min'],
-            name='Duração Média (min)',
-            line=dict(color='#FFFFFF'),
-            yaxis='y2'
-        ))
-        
-        fig.update_layout(
-            title='Análise de Popularidade vs. Duração',
-            yaxis=dict(title='Porcentagem do Total'),
-            yaxis2=dict(
-                title='Duração Média (min)',
-                overlaying='y',
-                side='right',
-                titlefont=dict(color='#FFFFFF'),
-                tickfont=dict(color='#FFFFFF')
-            ),
-            barmode='group'
+        popularity_stats['count_percentage'] = (popularity_stats['id'] / self.aggregates.n_rows) * 100
+        
+        categories = popularity_stats['popularity_category'].astype(str).to_numpy()
+        fig = spotify_figure(
+            data=[
+                dict(
+                    type='bar',
+                    x=categories,
+                    y=popularity_stats['count_percentage'].to_numpy(),
+                    name='% do Total de Músicas',
+                    marker=dict(color=SPOTIFY_GREEN),
+                    yaxis='y'
+                ),
+                dict(
+                    type='scatter',
+                    x=categories,
+                    y=popularity_stats['duration_min'].to_numpy(),
+                    name='Duração Média (min)',
+                    line=dict(color=WHITE),
+                    yaxis='y2'
+                )
+            ],
+            layout=dict(
+                title=dict(text='Análise de Popularidade vs. Duração'),
+                yaxis=dict(title=dict(text='Porcentagem do Total')),
+                yaxis2=dict(
+                    title=dict(text='Duração Média (min)', font=dict(color=WHITE)),
+                    overlaying='y',
+                    side='right',
+                    tickfont=dict(color=WHITE)
+                ),
+                barmode='group'
+            )
         )
         return fig
     
+    @timed()
     def get_business_insights(self):
         """Gera insights de negócio baseados nas análises"""
+        genre_summary = self.aggregates.genre_summary()
+        category_counts = self.aggregates.by_popularity_category['count']
+        # Músicas populares (popularidade >= 60): sketches das faixas 60-100
+        popular_durations = self.duration_sketches.digest(popularity_min=60)
+        
         insights = {
-            'generos_populares': self.df.groupby('genre')['popularity'].mean().nlargest(5).to_dict(),
+            'generos_populares': genre_summary['popularity_mean'].nlargest(5).to_dict(),
             'duracao_ideal': {
-                'media': self.df[self.df['popularity'] >= 60]['duration_min'].mean(),
-                'mediana': self.df[self.df['popularity'] >= 60]['duration_min'].median()
+                'media': popular_durations.mean(),
+                'mediana': popular_durations.median()
             },
-            'explicit_impact': stats.pointbiserialr(
-                self.df['explicit'],
-                self.df['popularity']
-            ).correlation,
-            'distribuicao_popularidade': self.df['popularity_category'].value_counts().to_dict()
+            'explicit_impact': self.aggregates.explicit_popularity_corr(),
+            'distribuicao_popularidade': category_counts.sort_values(
+                ascending=False, kind='stable'
+            ).to_dict()
         }
         return insights
     
-    def generate_recommendations(self):
+    @timed()
+    def generate_recommendations(self, insights=None):
         """Gera recomendações baseadas nas análises"""
-        insights = self.get_business_insights()
+        if insights is None:
+            insights = self.get_business_insights()
         
         recommendations = {
             'composicao_playlist': {
                 'generos_recomendados': list(insights['generos_populares'].keys()),
                 'duracao_ideal': f"{insights['duracao_ideal']['media']:.2f} minutos",
                 'distribuicao_sugerida': {
-                    'musicas_populares': '40%',
-                    'musicas_trending': '30%',
-                    'musicas_descoberta': '30%'
+                    bucket: f"{share:.0%}" for bucket, share in PLAYLIST_MIX.items()
                 }
             },
             'estrategia_conteudo': {
@@ -202,18 +589,62 @@ class SpotifyAnalyzer:
         }
         return recommendations
 
+    @timed()
+    def similar_tracks(self, track_ids, k=10):
+        """As `k` músicas mais parecidas com `track_ids` (uma música ou playlist a completar).
+        
+        Levanta KeyError se algum id não estiver no dataset.
+        """
+        rows, distances = self.similarity_index.query(track_ids, k)
+        columns = ['id', 'name', 'artists', 'album', 'genre', 'popularity', 'duration_min', 'explicit']
+        similar = self.df[columns].take(rows).reset_index(drop=True)
+        similar['distance'] = distances
+        return similar
+
+    @timed()
+    def compose_playlists(self, specs, insights=None):
+        """Monta playlists concretas seguindo a composição de `generate_recommendations`.
+        
+        Cada item de `specs` é um pedido (ver `normalize_playlist_request`);
+        gêneros e duração ideal padrão vêm dos insights. Retorna, para cada
+        pedido, os ids das músicas e o relatório das restrições.
+        """
+        if insights is None:
+            insights = self.get_business_insights()
+        defaults = {
+            'genres': list(insights['generos_populares']),
+            'duration': insights['duracao_ideal']['media']
+        }
+        requests = [normalize_playlist_request(spec, defaults) for spec in specs]
+        playlists = self.playlist_composer.compose(requests)
+        
+        lengths = [len(rows) for rows, _ in playlists]
+        rows = np.concatenate([rows for rows, _ in playlists]) if playlists else np.empty(0, dtype=np.int64)
+        ids = np.split(self.df['id'].take(rows).to_numpy(), np.cumsum(lengths)[:-1])
+        return [
+            {'seed': seed, 'tracks': track_ids.tolist(), 'report': report}
+            for (_, seed), track_ids, (_, report) in zip(requests, ids, playlists)
+        ]
+
+    @timed()
     def analyze_correlations(self):
         """Análise de correlações entre variáveis numéricas e categóricas"""
-        numeric_corr = self.df[['popularity', 'duration_min']].corr()
+        corr = self.aggregates.popularity_duration_corr()
+        numeric_corr = pd.DataFrame(
+            [[1.0, corr], [corr, 1.0]],
+            index=['popularity', 'duration_min'],
+            columns=['popularity', 'duration_min']
+        )
         
-        genres = self.df['genre'].unique()
-        genre_groups = [self.df[self.df['genre'] == genre]['popularity'] for genre in genres]
-        f_statistic, p_value = stats.f_oneway(*genre_groups)
+        by_genre = self.aggregates.by_genre
+        f_statistic, p_value = one_way_anova(
+            by_genre['count'], by_genre['popularity_sum'], by_genre['popularity_sumsq']
+        )
         
-        contingency = pd.crosstab(self.df['genre'], self.df['explicit'])
+        contingency = self.aggregates.explicit_contingency()
         chi2, p_value_chi2, dof, expected = stats.chi2_contingency(contingency)
         
-        genre_trends = self.df.groupby(['genre', 'popularity_category'])['id'].count().unstack(fill_value=0)
+        genre_trends = self.aggregates.genre_by_category
         genre_trends_pct = genre_trends.div(genre_trends.sum(axis=1), axis=0) * 100
         
         results = {
@@ -230,85 +661,187 @@ class SpotifyAnalyzer:
         }
         
         # Melhorar a visualização da matriz de correlação
-        fig = go.Figure(data=go.Heatmap(
-            z=numeric_corr.values,
-            x=['Popularidade', 'Duração (min)'],
-            y=['Popularidade', 'Duração (min)'],
-            colorscale=[[0, '#282828'], [0.5, '#404040'], [1, '#1DB954']],
-            showscale=True,
-            hoverongaps=False,
-            hovertemplate='%{x} x %{y}<br>Correlação: %{z:.2f}<extra></extra>',
-            texttemplate='%{z:.2f}',
-            textfont={"color": "#FFFFFF"}
-        ))
-        
-        fig.update_layout(
-            title='Matriz de Correlação entre Variáveis',
-            xaxis_title='Variáveis',
-            yaxis_title='Variáveis',
-            width=600,
-            height=500
+        fig = spotify_figure(
+            data=[dict(
+                type='heatmap',
+                z=numeric_corr.values,
+                x=['Popularidade', 'Duração (min)'],
+                y=['Popularidade', 'Duração (min)'],
+                colorscale=GREEN_SCALE,
+                showscale=True,
+                hoverongaps=False,
+                hovertemplate='%{x} x %{y}<br>Correlação: %{z:.2f}<extra></extra>',
+                texttemplate='%{z:.2f}',
+                textfont=dict(color=WHITE)
+            )],
+            layout=dict(
+                title=dict(text='Matriz de Correlação entre Variáveis'),
+                xaxis=dict(title=dict(text='Variáveis')),
+                yaxis=dict(title=dict(text='Variáveis')),
+                width=600,
+                height=500
+            )
         )
         
         return results, fig
     
-    def analyze_genre_success_factors(self):
-        """Análise dos fatores de sucesso por gênero"""
-        success_metrics = self.df.groupby('genre').agg({
-            'popularity': ['mean', 'std', 'count'],
-            'duration_min': 'mean',
-            'explicit': 'mean'
+    @timed()
+    def analyze_genre_success_factors(self, ci_method='normal', ci_level=0.95):
+        """Análise dos fatores de sucesso por gênero
+        
+        `ci_method` define o intervalo de confiança da popularidade média:
+        'normal' (padrão), 't' (Student) ou 'bootstrap'.
+        """
+        summary = self.aggregates.genre_summary()
+        success_metrics = pd.DataFrame({
+            ('popularity', 'mean'): summary['popularity_mean'],
+            ('popularity', 'std'): summary['popularity_std'],
+            ('popularity', 'count'): summary['count'],
+            ('duration_min', 'mean'): summary['duration_mean'],
+            ('explicit', 'mean'): summary['explicit_mean']
         }).round(2)
         
-        success_metrics['popularity', 'ci_95'] = success_metrics.apply(
-            lambda x: stats.norm.interval(
-                0.95,
-                loc=x[('popularity', 'mean')],
-                scale=x[('popularity', 'std')] / np.sqrt(x[('popularity', 'count')])
-            )[1] - x[('popularity', 'mean')],
-            axis=1
+        if ci_method == 'bootstrap':
+            ci = bootstrap_halfwidth(
+                self.df['popularity'],
+                self.aggregates.genres.get_indexer(self.df['genre']),
+                len(self.aggregates.genres),
+                level=ci_level,
+                random_state=0
+            )
+        else:
+            ci = confidence_interval_halfwidth(
+                success_metrics[('popularity', 'mean')],
+                success_metrics[('popularity', 'std')],
+                success_metrics[('popularity', 'count')],
+                level=ci_level,
+                method=ci_method
+            )
+        success_metrics['popularity', 'ci_95'] = ci
+        
+        genres = success_metrics.index.to_numpy()
+        fig = spotify_figure(
+            data=[
+                dict(
+                    type='bar',
+                    name='Popularidade Média',
+                    x=genres,
+                    y=success_metrics[('popularity', 'mean')].to_numpy(),
+                    marker=dict(color=SPOTIFY_GREEN),
+                    error_y=dict(
+                        type='data',
+                        array=success_metrics[('popularity', 'ci_95')].to_numpy(),
+                        visible=True,
+                        color=WHITE
+                    )
+                ),
+                dict(
+                    type='scatter',
+                    name='Duração Média (min)',
+                    x=genres,
+                    y=success_metrics[('duration_min', 'mean')].to_numpy(),
+                    line=dict(color=WHITE),
+                    yaxis='y2'
+                )
+            ],
+            layout=dict(
+                title=dict(text='Análise de Fatores de Sucesso por Gênero'),
+                yaxis=dict(title=dict(text='Popularidade Média')),
+                yaxis2=dict(
+                    title=dict(text='Duração Média (min)', font=dict(color=WHITE)),
+                    overlaying='y',
+                    side='right',
+                    tickfont=dict(color=WHITE)
+                ),
+                showlegend=True
+            )
+        )
+        
+        return success_metrics, fig
+
+    @timed()
+    def analyze_artist_popularity(self, top=15, min_tracks=3):
+        """Artistas de maior popularidade média (com ao menos `min_tracks` faixas)"""
+        leaders = CatalogStore.leaders(self.catalog.artist_summary(), top, min_tracks).round(
+            {'popularity_mean': 2, 'explicit_share': 4}
         )
         
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            name='Popularidade Média',
-            x=success_metrics.index,
-            y=success_metrics[('popularity', 'mean')],
-            marker_color='#1DB954',
-            error_y=dict(
-                type='data',
-                array=success_metrics[('popularity', 'ci_95')],
-                visible=True,
-                color='#FFFFFF'
+        artists = leaders.index.to_numpy()
+        fig = spotify_figure(
+            data=[
+                dict(
+                    type='bar',
+                    name='Popularidade Média',
+                    x=artists,
+                    y=leaders['popularity_mean'].to_numpy(),
+                    customdata=leaders[['track_count', 'album_count', 'genre_count']].to_numpy(),
+                    hovertemplate="<br>".join([
+                        "Artista: %{x}",
+                        "Popularidade Média: %{y:.1f}",
+                        "Faixas: %{customdata[0]}",
+                        "Álbuns: %{customdata[1]}",
+                        "Gêneros: %{customdata[2]}",
+                        "<extra></extra>"
+                    ]),
+                    marker=dict(color=SPOTIFY_GREEN)
+                ),
+                dict(
+                    type='scatter',
+                    mode='markers',
+                    name='% Explícito',
+                    x=artists,
+                    y=leaders['explicit_share'].to_numpy() * 100,
+                    marker=dict(color=WHITE, size=9),
+                    yaxis='y2'
+                )
+            ],
+            layout=dict(
+                title=dict(text='Artistas em Destaque'),
+                xaxis=dict(tickangle=-45),
+                yaxis=dict(title=dict(text='Popularidade Média')),
+                yaxis2=dict(
+                    title=dict(text='% Explícito', font=dict(color=WHITE)),
+                    overlaying='y',
+                    side='right',
+                    range=[0, 100],
+                    tickfont=dict(color=WHITE)
+                ),
+                showlegend=True
             )
-        ))
-        
-        fig.add_trace(go.Scatter(
-            name='Duração Média (min)',
-            x=success_metrics.index,
-            y=success_metrics[('duration_min', 'mean')],
-            line=dict(color='#FFFFFF'),
-            yaxis='y2'
-        ))
-        
-        fig.update_layout(
-            title='Análise de Fatores de Sucesso por Gênero',
-            yaxis=dict(title='Popularidade Média'),
-            yaxis2=dict(
-                title='Duração Média (min)',
-                overlaying='y',
-                side='right',
-                titlefont=dict(color='#FFFFFF'),
-                tickfont=dict(color='#FFFFFF')
-            ),
-            showlegend=True
         )
         
-        return success_metrics, fig
+        return leaders, fig
+    
+    @timed()
+    def analyze_catalog(self, top=5, min_tracks=3):
+        """Concentração do catálogo e destaques por artista e por álbum"""
+        artists = self.catalog.artist_summary()
+        albums = self.catalog.album_summary()
+        top_albums = CatalogStore.leaders(albums, top, min_tracks)
+        
+        return {
+            'artistas': {
+                **concentration(artists['track_count']),
+                'varios_artistas': float(
+                    (np.bincount(self.catalog.pair_rows, minlength=self.catalog.n_rows) > 1).mean()
+                ) if self.catalog.n_rows else 0.0,
+                'mais_faixas': artists['track_count'].nlargest(top).to_dict()
+            },
+            'albuns': {
+                **concentration(albums['track_count']),
+                'populares': [
+                    {'album': row.album, 'artista': row.artist, 'popularidade': round(row.popularity_mean, 2)}
+                    for row in top_albums.itertuples()
+                ]
+            }
+        }
 
-    def save_visualizations(self):
-        """Gera e salva todas as visualizações"""
+    def save_visualizations(self, max_workers=None, force=False):
+        """Gera e salva todas as visualizações
+        
+        A exportação (HTML + PNG via kaleido) roda em um pool de `max_workers`
+        processos e pula figuras cujo spec não mudou desde a última exportação.
+        """
         print("Gerando visualizações...")
         
         try:
@@ -331,23 +864,19 @@ class SpotifyAnalyzer:
             success_metrics, success_fig = self.analyze_genre_success_factors()
             print("Gerado gráfico de fatores de sucesso")
             
+            _, artist_fig = self.analyze_artist_popularity()
+            print("Gerado gráfico de artistas em destaque")
+            
             # Salvar gráficos como HTML e PNG
-            for name, fig in [
-                ('genre_popularity', genre_pop_fig),
-                ('explicit_analysis', explicit_fig),
-                ('duration_distribution', duration_fig),
-                ('popularity_trends', popularity_fig),
-                ('correlation_matrix', corr_fig),
-                ('success_factors', success_fig)
-            ]:
-                html_path = self.visualization_path / f"{name}.html"
-                png_path = self.visualization_path / f"{name}.png"
-                
-                print(f"Salvando {name} em {html_path}")
-                fig.write_html(str(html_path))
-                
-                print(f"Salvando {name} em {png_path}")
-                fig.write_image(str(png_path))
+            export_figures({
+                'genre_popularity': genre_pop_fig,
+                'explicit_analysis': explicit_fig,
+                'duration_distribution': duration_fig,
+                'popularity_trends': popularity_fig,
+                'correlation_matrix': corr_fig,
+                'success_factors': success_fig,
+                'artist_leaders': artist_fig
+            }, self.visualization_path, max_workers=max_workers, force=force)
             
             print("Todas as visualizações foram salvas com sucesso!")
             
@@ -357,7 +886,8 @@ class SpotifyAnalyzer:
                 'duration_dist': duration_fig,
                 'popularity_trends': popularity_fig,
                 'correlation_matrix': corr_fig,
-                'success_factors': success_fig
+                'success_factors': success_fig,
+                'artist_leaders': artist_fig
             }
         except Exception as e:
             print(f"Erro ao gerar visualizações: {str(e)}")
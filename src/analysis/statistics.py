@@ -0,0 +1,184 @@
+import numpy as np
+from scipy import stats
+
+
+CI_METHODS = ('normal', 't', 'bootstrap')
+# Erro relativo de arredondamento (por observação) da soma dos quadrados na ANOVA
+WITHIN_TOLERANCE = 8 * np.finfo(float).eps
+# Meia-largura da faixa do histograma quando todos os valores são iguais
+DEGENERATE_HALF_RANGE = 0.5
+
+
+def confidence_interval_halfwidth(mean, std, count, level=0.95, method='normal'):
+    """Meia-largura do intervalo de confiança da média, calculada por coluna.
+
+    Recebe arrays/Series com média, desvio padrão e tamanho de cada grupo e
+    devolve `limite_superior - média` para todos os grupos de uma vez.
+    `method` pode ser 'normal' (z) ou 't' (Student, com count - 1 graus de
+    liberdade); para 'bootstrap' use `bootstrap_halfwidth`.
+    """
+    mean = np.asarray(mean, dtype=float)
+    std = np.asarray(std, dtype=float)
+    count = np.asarray(count, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = std / np.sqrt(count)
+
+        if method == 'normal':
+            upper = stats.norm.interval(level, loc=mean, scale=scale)[1]
+        elif method == 't':
+            upper = stats.t.interval(level, count - 1, loc=mean, scale=scale)[1]
+        else:
+            raise ValueError(f"Método de intervalo desconhecido: {method}")
+
+    return upper - mean
+
+
+def bootstrap_halfwidth(values, codes, n_groups, level=0.95, n_resamples=1000,
+                        random_state=None):
+    """Meia-largura do IC por bootstrap percentil, para todos os grupos ao mesmo tempo.
+
+    `values` são as observações e `codes` o código do grupo de cada uma
+    (0..n_groups-1). Em cada reamostragem, cada observação é trocada por uma
+    sorteada dentro do próprio grupo, e as médias de todos os grupos saem de
+    um único `np.bincount`. A memória fica em O(linhas + reamostragens x grupos).
+    """
+    values = np.asarray(values, dtype=float)
+    codes = np.asarray(codes)
+    rng = np.random.default_rng(random_state)
+
+    # Ordenar por grupo para que cada grupo ocupe um intervalo contíguo
+    order = np.argsort(codes, kind='stable')
+    sorted_values = values[order]
+    sorted_codes = codes[order]
+    counts = np.bincount(sorted_codes, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    row_starts = starts[sorted_codes]
+    row_counts = counts[sorted_codes]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        observed = np.bincount(sorted_codes, weights=sorted_values, minlength=n_groups) / counts
+        resampled = np.empty((n_resamples, n_groups))
+        for i in range(n_resamples):
+            picks = row_starts + (rng.random(len(sorted_values)) * row_counts).astype(np.int64)
+            resampled[i] = np.bincount(
+                sorted_codes, weights=sorted_values[picks], minlength=n_groups
+            ) / counts
+
+    upper = np.quantile(resampled, (1 + level) / 2, axis=0)
+    return upper - observed
+
+
+def one_way_anova(count, total, total_sq):
+    """ANOVA de um fator a partir de estatísticas suficientes por grupo.
+
+    Recebe contagem, soma e soma dos quadrados de cada grupo e devolve
+    (F, p-valor), equivalente a `stats.f_oneway` sobre os valores brutos,
+    sem precisar materializar as observações de cada grupo.
+    """
+    count = np.asarray(count, dtype=float)
+    total = np.asarray(total, dtype=float)
+    total_sq = np.asarray(total_sq, dtype=float)
+
+    observed = count > 0
+    count, total, total_sq = count[observed], total[observed], total_sq[observed]
+
+    n = count.sum()
+    k = len(count)
+    grand_mean = total.sum() / n
+
+    group_means = total / count
+    ss_between = np.sum(count * (group_means - grand_mean) ** 2)
+    # Em grupos constantes a diferença abaixo é só erro de arredondamento
+    # (às vezes negativo): abaixo da precisão da soma dos quadrados vale 0
+    within = total_sq - total * group_means
+    within[within <= WITHIN_TOLERANCE * count * total_sq] = 0.0
+    ss_within = np.sum(within)
+
+    df_between = k - 1
+    df_within = n - k
+    # Um único grupo (ou um valor por grupo) não tem variância: F indefinido (NaN)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        f_statistic = (ss_between / df_between) / (ss_within / df_within)
+    p_value = stats.f.sf(f_statistic, df_between, df_within)
+    return f_statistic, p_value
+
+
+def binned_kde(values, bandwidth, lower, upper, grid_size=512, weights=None):
+    """KDE gaussiano binado: histograma (opcionalmente ponderado) + convolução.
+
+    Retorna (centros da grade, densidade); custo O(n + grid_size).
+    """
+    counts, edges = np.histogram(values, bins=grid_size, range=(lower, upper), weights=weights)
+    bin_width = edges[1] - edges[0]
+    sigma = bandwidth / bin_width
+    radius = max(int(np.ceil(4 * sigma)), 1)
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2) if sigma > 0 else (offsets == 0).astype(float)
+    kernel /= kernel.sum()
+    density = np.convolve(counts, kernel, mode='same') / (counts.sum() * bin_width)
+    return (edges[:-1] + edges[1:]) / 2, density
+
+
+def distribution_summary(values, weights=None, quartiles=None, grid_size=512, max_outliers=200):
+    """Resumo de uma distribuição para violino/box sem enviar os pontos brutos.
+
+    Calcula a densidade por KDE gaussiano binado (histograma + convolução,
+    O(n + grid)) com a largura de banda de Silverman, a mesma regra usada
+    pelo violino do Plotly, além dos quartis e das cercas do box plot. Os
+    outliers são devolvidos (no máximo `max_outliers`, amostrados em ordem).
+
+    Com `weights` os valores são pontos ponderados (ex.: centroides de um
+    sketch de quantis) e os quartis devem ser informados em `quartiles`.
+    Sem valores devolve arrays vazios e estatísticas NaN; com uma linha ou
+    valores todos iguais, desvio 0, box degenerado e densidade de um ponto.
+    """
+    values = np.asarray(values, dtype=float)
+    if weights is None:
+        weights = np.ones(len(values))
+    weights = np.asarray(weights, dtype=float)
+    valid = ~np.isnan(values)
+    values, weights = values[valid], weights[valid]
+    n = weights.sum()
+    if not len(values) or n <= 0:
+        empty = np.empty(0)
+        return {'grid': empty, 'density': empty, 'q1': np.nan, 'median': np.nan, 'q3': np.nan,
+                'lowerfence': np.nan, 'upperfence': np.nan, 'mean': np.nan,
+                'outliers': empty, 'count': 0}
+
+    if quartiles is None:
+        quartiles = np.quantile(values, [0.25, 0.5, 0.75])
+    q1, median, q3 = quartiles
+    iqr = q3 - q1
+    mean = np.average(values, weights=weights)
+    std = np.sqrt(np.sum(weights * (values - mean) ** 2) / (n - 1)) if n > 1 else 0.0
+    bandwidth = 0.9 * min(std, iqr / 1.34) * n ** (-1 / 5)
+    if values.min() == values.max():
+        # Um valor só (uma linha ou coluna constante): histograma de um ponto
+        # numa faixa fixa em vez de KDE, que não tem largura de banda
+        bandwidth = 0.0
+        lower, upper = values.min() - DEGENERATE_HALF_RANGE, values.max() + DEGENERATE_HALF_RANGE
+    else:
+        lower, upper = values.min() - 2 * bandwidth, values.max() + 2 * bandwidth
+    grid, density = binned_kde(values, bandwidth, lower, upper, grid_size, weights)
+
+    is_inside = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    inside = values[is_inside]
+    order = np.argsort(values[~is_inside], kind='stable')
+    outliers = np.repeat(
+        values[~is_inside][order], np.maximum(np.round(weights[~is_inside][order]), 1).astype(int)
+    )
+    if len(outliers) > max_outliers:
+        outliers = outliers[np.linspace(0, len(outliers) - 1, max_outliers).astype(int)]
+    return {
+        'grid': grid,
+        'density': density,
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': inside.min(),
+        'upperfence': inside.max(),
+        'mean': mean,
+        'outliers': outliers,
+        'count': int(round(n))
+    }
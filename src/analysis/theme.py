@@ -0,0 +1,57 @@
+import os
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+SPOTIFY_GREEN = '#1DB954'
+SPOTIFY_BLACK = '#121212'
+DARK_GRAY = '#282828'
+GRID_GRAY = '#404040'
+WHITE = '#FFFFFF'
+GREEN_SCALE = [[0, DARK_GRAY], [0.5, GRID_GRAY], [1, SPOTIFY_GREEN]]
+
+TEMPLATE_NAME = 'spotify'
+
+# DASHBOARD_VALIDATE_FIGURES=1 faz as figuras do dashboard passarem pelos
+# validadores do plotly (útil ao alterar um gráfico; mais lento)
+VALIDATE_FIGURES = os.environ.get('DASHBOARD_VALIDATE_FIGURES', '0') in ('1', 'true')
+
+
+def _build_template():
+    """Template 'plotly' com as cores do Spotify (o antigo apply_spotify_theme)"""
+    template = go.layout.Template(pio.templates['plotly'])
+    template.layout.update(
+        paper_bgcolor=SPOTIFY_BLACK,
+        plot_bgcolor=DARK_GRAY,
+        font_color=WHITE,
+        title_font_color=SPOTIFY_GREEN,
+        title_x=0.5,
+        margin=dict(t=50, r=50, b=50, l=50),
+        showlegend=True,
+        legend=dict(font=dict(color=WHITE), bgcolor='rgba(0,0,0,0)', bordercolor=GRID_GRAY)
+    )
+    # Os eixos do template valem para todos os eixos da figura (yaxis2 inclusive)
+    axis = dict(gridcolor=GRID_GRAY, linecolor=GRID_GRAY, tickfont=dict(color=WHITE))
+    template.layout.xaxis.update(axis)
+    template.layout.yaxis.update(axis)
+    return template
+
+
+pio.templates[TEMPLATE_NAME] = _build_template()
+
+# Template já validado e convertido uma única vez, embutido nas figuras sem validação
+TEMPLATE_JSON = pio.templates[TEMPLATE_NAME].to_plotly_json()
+
+
+def spotify_figure(data=(), layout=None, validate=None):
+    """Figura com o tema do Spotify a partir de traços e layout em dicionários.
+
+    Os gráficos do dashboard são montados com dados internos, então por
+    padrão a figura é criada sem passar pelos validadores do plotly (o spec
+    vai como está para o JSON). Use a forma completa das propriedades
+    (ex.: `title=dict(text=...)`), pois sem validação os atalhos não são
+    expandidos.
+    """
+    validate = VALIDATE_FIGURES if validate is None else validate
+    layout = {**(layout or {}), 'template': TEMPLATE_NAME if validate else TEMPLATE_JSON}
+    return go.Figure(data=list(data), layout=layout, _validate=validate)
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # sem pyarrow a normalização usa os métodos de string do pandas
+    pa = None
+
+# Diferença máxima de duração entre duas versões da mesma música
+DURATION_TOLERANCE_MS = 2_000
+# Tudo que não é letra ou dígito vira um espaço ao normalizar nomes e artistas
+SEPARATORS_RE2 = r'[^\p{L}\p{N}]+'
+SEPARATORS_RE = r'[\W_]+'
+KEY_SEPARATOR = '\x1f'
+
+
+def _encoded_keys(df):
+    """Códigos por linha da chave (nome, artistas) normalizada e as chaves distintas"""
+    if pa is not None:
+        parts = []
+        for column in ('name', 'artists'):
+            array = pa.array(df[column], from_pandas=True)
+            if isinstance(array, pa.ChunkedArray):
+                array = array.combine_chunks()
+            text = pc.utf8_lower(pc.cast(array, pa.large_string()))
+            text = pc.utf8_trim_whitespace(pc.replace_substring_regex(text, SEPARATORS_RE2, ' '))
+            parts.append(pc.fill_null(text, ''))
+        separator = pa.scalar(KEY_SEPARATOR, pa.large_string())
+        encoded = pc.dictionary_encode(pc.binary_join_element_wise(parts[0], parts[1], separator))
+        return (encoded.indices.to_numpy().astype(np.int64),
+                encoded.dictionary.to_numpy(zero_copy_only=False))
+
+    parts = [
+        df[column].fillna('').astype(str).str.lower()
+        .str.replace(SEPARATORS_RE, ' ', regex=True).str.strip()
+        for column in ('name', 'artists')
+    ]
+    codes, uniques = pd.factorize(parts[0] + KEY_SEPARATOR + parts[1])
+    return codes.astype(np.int64), np.asarray(uniques, dtype=object)
+
+
+def normalized_keys(df):
+    """Código inteiro por linha da chave (nome, artistas) normalizada.
+
+    Nome e artistas vão para minúsculas, com pontuação e espaços repetidos
+    reduzidos a um espaço. A chave é codificada por tabela hash
+    (`dictionary_encode` / `pd.factorize`): linhas com o mesmo código formam
+    um bloco de candidatas a duplicata.
+    """
+    return _encoded_keys(df)[0]
+
+
+def block_hashes(df):
+    """Hash estável (uint64) da chave normalizada de cada linha.
+
+    Ao contrário dos códigos de `normalized_keys`, não depende das outras
+    linhas: identifica o bloco entre execuções (ex.: ingestão incremental).
+    """
+    codes, keys = _encoded_keys(df)
+    return pd.util.hash_array(keys)[codes]
+
+
+def find_duplicates(df, tolerance_ms=DURATION_TOLERANCE_MS):
+    """Agrupa as versões da mesma música e escolhe a canônica de cada grupo.
+
+    Dentro de cada bloco de (nome, artistas) normalizados, as faixas são
+    ordenadas pela duração e cada grupo vai da sua âncora (a faixa mais
+    curta) até a última faixa a no máximo `tolerance_ms` dela: duas faixas
+    do mesmo grupo nunca diferem mais que a tolerância, sem o encadeamento
+    A~B, B~C do single-linkage. O(n log n), sem comparar pares; só blocos
+    mais largos que a tolerância percorrem as âncoras uma a uma. A faixa
+    canônica é a mais popular do grupo; empates são decididos pelo hash do
+    id, o que não depende da ordem das linhas.
+
+    Retorna um DataFrame alinhado às linhas de `df` com `id`, `genre`,
+    `block` (ver `block_hashes`), `track_group`, `canonical_id` e
+    `duplicate`, que marca as linhas a descartar numa análise sem
+    duplicatas: fica uma por grupo e gênero.
+    """
+    n_rows = len(df)
+    blocks, keys = _encoded_keys(df)
+    duration = df['duration_ms'].to_numpy(dtype=np.int64)
+
+    order = np.lexsort((duration, blocks))
+    sorted_duration = duration[order]
+    starts = np.ones(n_rows, dtype=bool)
+    if n_rows:
+        starts[1:] = np.diff(blocks[order]) != 0
+    block_starts = np.flatnonzero(starts)
+    block_ends = np.r_[block_starts[1:], n_rows] if n_rows else block_starts
+    # Blocos cuja faixa mais longa está a até `tolerance_ms` da mais curta são um grupo só
+    wide = sorted_duration[block_ends - 1] - sorted_duration[block_starts] > tolerance_ms
+    for lo, hi in zip(block_starts[wide], block_ends[wide]):
+        anchor = lo
+        while True:
+            anchor = lo + np.searchsorted(sorted_duration[lo:hi], sorted_duration[anchor] + tolerance_ms,
+                                          side='right')
+            if anchor >= hi:
+                break
+            starts[anchor] = True
+    groups = np.empty(n_rows, dtype=np.int64)
+    groups[order] = np.cumsum(starts) - 1
+
+    # Prioridade dentro do grupo: maior popularidade, depois o hash do id (e a
+    # ordem das linhas, só para linhas repetidas com o mesmo id)
+    rows = np.arange(n_rows)
+    ids = df['id'].to_numpy()
+    tiebreak = pd.util.hash_array(np.asarray(ids, dtype=object))
+    popularity = df['popularity'].to_numpy(dtype=np.int64)
+    genres = pd.factorize(df['genre'])[0]
+    order = np.lexsort((rows, tiebreak, -popularity, genres, groups))
+    first = np.ones(n_rows, dtype=bool)
+    if n_rows:
+        first[1:] = (np.diff(groups[order]) != 0) | (np.diff(genres[order]) != 0)
+    duplicate = np.empty(n_rows, dtype=bool)
+    duplicate[order] = ~first
+
+    order = np.lexsort((rows, tiebreak, -popularity, groups))
+    first = np.r_[True, np.diff(groups[order]) != 0] if n_rows else first
+    canonical = np.empty(int(starts.sum()), dtype=np.int64)
+    canonical[groups[order][first]] = order[first]
+
+    return pd.DataFrame({
+        'id': ids,
+        'genre': df['genre'].to_numpy(),
+        'block': pd.util.hash_array(keys)[blocks],
+        'track_group': groups,
+        'canonical_id': ids[canonical[groups]],
+        'duplicate': duplicate
+    })
+
+
+def update_duplicates(mapping, df, tolerance_ms=DURATION_TOLERANCE_MS):
+    """Mapeamento atualizado só nos blocos das faixas de `df`.
+
+    `mapping` é o mapeamento anterior sem as linhas dos blocos tocados e
+    `df` traz todas as faixas atuais desses blocos: como grupos nunca
+    atravessam blocos, refazer só eles dá o mesmo resultado que
+    `find_duplicates` sobre o dataset inteiro. Os grupos são renumerados.
+    """
+    recomputed = find_duplicates(df, tolerance_ms)
+    if len(mapping):
+        recomputed['track_group'] += mapping['track_group'].max() + 1
+    merged = pd.concat([mapping, recomputed], ignore_index=True)
+    merged['track_group'] = pd.factorize(merged['track_group'])[0]
+    return merged
+
+
+def duplicates_summary(mapping):
+    """Contagens do mapeamento de `find_duplicates`"""
+    sizes = np.bincount(mapping['track_group'].to_numpy()) if len(mapping) else np.zeros(0, dtype=np.int64)
+    return {
+        'linhas': int(len(mapping)),
+        'grupos': int(len(sizes)),
+        'grupos_com_versoes': int((sizes > 1).sum()),
+        'duplicatas': int(mapping['duplicate'].sum())
+    }
@@ -1,12 +1,43 @@
 import os
+import time
+import importlib.util
 import pandas as pd
 import numpy as np
+from src.etl.profiling import DataProfile
+from src.etl.deduplication import find_duplicates, update_duplicates, block_hashes, duplicates_summary
+from src.analysis.delta_parts import (
+    KEY_COLUMNS, MAX_DELTA_PARTS, delta_files, write_delta, clear_deltas, latest_rows
+)
+from src.analysis.aggregations import GroupAggregates, add_categories
+from src.analysis.dataset_cache import content_hash
+
+# Formato colunar (Parquet) é opcional: sem pyarrow o ETL grava apenas CSV
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# Tipos compactos do dataset processado. duration_min não é gravado no
+# formato colunar: é derivado de duration_ms na leitura.
+COMPACT_DTYPES = {
+    'genre': 'category',
+    'popularity': 'uint8',
+    'explicit': 'bool',
+    'duration_ms': 'int32'
+}
+
+# Colunas comparadas para detectar faixas alteradas entre snapshots
+VALUE_COLUMNS = ['name', 'artists', 'album', 'popularity', 'duration_ms', 'explicit']
+# Colunas usadas na detecção de faixas duplicadas
+DEDUP_COLUMNS = ['id', 'name', 'genre', 'artists', 'popularity', 'duration_ms']
 
 class SpotifyDataLoader:
     def __init__(self):
         self.raw_data_path = 'data/raw'
         self.processed_data_path = 'data/processed'
         self.input_file = os.path.join(self.raw_data_path, 'spoty_tracks.csv')
+        self.output_csv = os.path.join(self.processed_data_path, 'processed_spotify.csv')
+        self.output_columnar = os.path.join(self.processed_data_path, 'processed_spotify.parquet')
+        self.output_aggregates = os.path.join(self.processed_data_path, 'processed_spotify.aggregates.pkl')
+        canonical = 'processed_spotify.canonical.parquet' if HAS_PYARROW else 'processed_spotify.canonical.csv'
+        self.output_canonical = os.path.join(self.processed_data_path, canonical)
         
     def analyze_data_types(self, df):
         """Análise detalhada dos tipos de dados e estatísticas básicas"""
@@ -40,6 +71,107 @@ class SpotifyDataLoader:
             'unique_counts': df.nunique().to_dict()
         }
     
+    @staticmethod
+    def to_compact_dtypes(df):
+        """Converte o dataset processado para os tipos compactos do formato colunar"""
+        df = df.drop(columns=['duration_min'], errors='ignore')
+        return df.astype({col: dtype for col, dtype in COMPACT_DTYPES.items() if col in df.columns})
+    
+    def save_processed(self, df, write_csv=True):
+        """Grava o dataset processado em Parquet (tipos compactos) e, opcionalmente, em CSV"""
+        os.makedirs(self.processed_data_path, exist_ok=True)
+        
+        if HAS_PYARROW:
+            self.to_compact_dtypes(df).to_parquet(self.output_columnar, index=False)
+            # O arquivo base já tem todas as faixas: as partes incrementais caducam
+            clear_deltas(self.output_columnar)
+            print(f"Dados processados salvos em: {self.output_columnar}")
+        
+        # CSV continua sendo o formato de fallback (e o único sem pyarrow)
+        if write_csv or not HAS_PYARROW:
+            df.to_csv(self.output_csv, index=False)
+            print(f"Dados processados salvos em: {self.output_csv}")
+        
+        self.save_aggregates(self.compute_aggregates(df))
+    
+    @staticmethod
+    def compute_aggregates(df):
+        """Agregados por gênero/categoria de um conjunto de faixas processadas"""
+        return GroupAggregates(add_categories(df[
+            ['genre', 'popularity', 'duration_min', 'explicit']
+        ].copy()))
+    
+    def _source_versions(self):
+        return {
+            os.path.basename(path): content_hash(path)
+            for path in (self.output_csv, self.output_columnar)
+            if os.path.exists(path)
+        }
+    
+    def save_aggregates(self, aggregates):
+        """Persiste os agregados junto com o hash dos arquivos processados atuais"""
+        aggregates.save(self.output_aggregates, self._source_versions())
+        print(f"Agregados salvos em: {self.output_aggregates}")
+    
+    def load_aggregates(self):
+        """Agregados persistidos, se ainda corresponderem aos arquivos processados"""
+        if not os.path.exists(self.output_aggregates):
+            return None
+        aggregates, versions = GroupAggregates.load(self.output_aggregates)
+        if versions != self._source_versions():
+            return None
+        return aggregates
+    
+    def save_canonical_mapping(self, df):
+        """Detecta as versões duplicadas das faixas e grava o mapeamento para a faixa canônica
+        
+        Uma linha por faixa processada com (id, genre, block, track_group,
+        canonical_id, duplicate); ver `find_duplicates`.
+        """
+        return self._write_canonical_mapping(find_duplicates(df))
+    
+    def load_canonical_mapping(self):
+        """Mapeamento para as faixas canônicas gravado pelo ETL (None se não existir)"""
+        if not os.path.exists(self.output_canonical):
+            return None
+        if HAS_PYARROW:
+            return pd.read_parquet(self.output_canonical)
+        return pd.read_csv(self.output_canonical)
+    
+    def update_canonical_mapping(self, store, changed, replaced, store_keys=None):
+        """Atualiza o mapeamento só nos blocos de duplicatas tocados por uma ingestão
+        
+        `store` é o dataset já atualizado, `changed` as faixas inseridas ou
+        alteradas e `replaced` as versões anteriores das alteradas (cujo
+        bloco antigo pode ter perdido a faixa). Só as faixas desses blocos
+        passam de novo por `find_duplicates`. `store_keys` evita recalcular
+        as chaves (id, gênero) do dataset.
+        """
+        mapping = self.load_canonical_mapping()
+        # Sem mapeamento, num formato antigo ou de outra versão do dataset: refaz tudo
+        previous_rows = len(store) - len(changed) + len(replaced)
+        if mapping is None or 'block' not in mapping.columns or len(mapping) != previous_rows:
+            return self.save_canonical_mapping(store)
+        
+        touched = np.union1d(block_hashes(changed), block_hashes(replaced))
+        affected = mapping['block'].isin(touched).to_numpy()
+        keys = self._keys(mapping[affected]).union(self._keys(changed))
+        if store_keys is None:
+            store_keys = self._keys(store)
+        rows = store[store_keys.isin(keys)]
+        return self._write_canonical_mapping(update_duplicates(mapping[~affected], rows))
+    
+    def _write_canonical_mapping(self, mapping):
+        if HAS_PYARROW:
+            mapping.to_parquet(self.output_canonical, index=False)
+        else:
+            mapping.to_csv(self.output_canonical, index=False)
+        summary = duplicates_summary(mapping)
+        print(f"Duplicatas: {summary['grupos_com_versoes']} músicas com mais de uma versão, "
+              f"{summary['duplicatas']} linhas repetidas no mesmo gênero")
+        print(f"Mapeamento para as faixas canônicas salvo em: {self.output_canonical}")
+        return mapping
+    
     def process_data(self):
         """Processamento inicial dos dados"""
         print("Processando dados...")
@@ -68,13 +200,259 @@ class SpotifyDataLoader:
         data_analysis = self.analyze_data_types(df)
         
         # Salvando dados processados
-        output_file = os.path.join(self.processed_data_path, 'processed_spotify.csv')
-        os.makedirs(self.processed_data_path, exist_ok=True)
-        df.to_csv(output_file, index=False)
-        print(f"\nDados processados salvos em: {output_file}")
+        print()
+        self.save_processed(df)
+        self.save_canonical_mapping(df)
         return df, data_analysis
 
+    @staticmethod
+    def clean_chunk(df):
+        """Limpeza aplicada a cada bloco: remove nulos e deriva duration_min"""
+        df = df.dropna()
+        if 'duration_ms' in df.columns:
+            df = df.assign(duration_min=df['duration_ms'] / 60000)
+        return df
+    
+    def _columnar_writer(self, df):
+        """Abre o ParquetWriter com esquema fixo derivado do primeiro bloco"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = pa.Schema.from_pandas(self.to_compact_dtypes(df), preserve_index=False)
+        if 'genre' in schema.names:
+            # Índices int32: os blocos seguintes podem ter mais gêneros que o primeiro
+            schema = schema.set(
+                schema.get_field_index('genre'),
+                pa.field('genre', pa.dictionary(pa.int32(), pa.string()))
+            )
+        return pq.ParquetWriter(self.output_columnar, schema)
+    
+    def process_data_streaming(self, chunksize=100_000, write_csv=True):
+        """Processamento em blocos para arquivos brutos maiores que a memória
+        
+        Lê `data/raw` em blocos de `chunksize` linhas, limpa cada bloco e grava
+        a saída incrementalmente. O perfil de tipos/nulos/únicos/estatísticas é
+        acumulado com estatísticas combináveis (HyperLogLog para distintos),
+        então o pico de memória depende apenas do tamanho do bloco.
+        """
+        print("Processando dados em blocos...")
+        
+        if not os.path.exists(self.input_file):
+            raise FileNotFoundError(f"Arquivo {self.input_file} não encontrado. Por favor, coloque o arquivo spotify_dataset.csv na pasta data/raw/")
+        
+        os.makedirs(self.processed_data_path, exist_ok=True)
+        profile = DataProfile()
+        aggregates = []
+        rows_read = 0
+        writer = None
+        write_csv = write_csv or not HAS_PYARROW
+        
+        try:
+            for i, chunk in enumerate(pd.read_csv(self.input_file, chunksize=chunksize)):
+                rows_read += len(chunk)
+                chunk = self.clean_chunk(chunk)
+                profile.update(chunk)
+                aggregates.append(self.compute_aggregates(chunk))
+                
+                if HAS_PYARROW:
+                    import pyarrow as pa
+                    
+                    if writer is None:
+                        writer = self._columnar_writer(chunk)
+                    table = pa.Table.from_pandas(
+                        self.to_compact_dtypes(chunk), preserve_index=False
+                    ).cast(writer.schema)
+                    writer.write_table(table)
+                
+                if write_csv:
+                    chunk.to_csv(self.output_csv, mode='w' if i == 0 else 'a',
+                                 header=(i == 0), index=False)
+                
+                print(f"Bloco {i + 1}: {rows_read} registros lidos, {profile.rows} mantidos")
+        finally:
+            if writer is not None:
+                writer.close()
+                clear_deltas(self.output_columnar)
+        
+        print(f"\nDataset após limpeza: {profile.rows} de {rows_read} registros")
+        data_analysis = profile.report()
+        
+        if HAS_PYARROW:
+            print(f"\nDados processados salvos em: {self.output_columnar}")
+        if write_csv:
+            print(f"Dados processados salvos em: {self.output_csv}")
+        self.save_aggregates(GroupAggregates.merge(aggregates))
+        # A detecção de duplicatas precisa de todas as linhas: relê só as colunas usadas
+        self.save_canonical_mapping(self.load_processed(DEDUP_COLUMNS))
+        return data_analysis
+    
+    def load_processed(self, columns=None):
+        """Lê o dataset processado atual (Parquet quando disponível, senão CSV)
+        
+        As partes da ingestão incremental são aplicadas sobre o Parquet base:
+        vale a versão mais recente de cada (id, gênero).
+        """
+        if HAS_PYARROW and os.path.exists(self.output_columnar):
+            deltas = delta_files(self.output_columnar)
+            if deltas:
+                read = None if columns is None else list(dict.fromkeys([*columns, *KEY_COLUMNS]))
+                frames = [pd.read_parquet(file, columns=read) for file in [self.output_columnar, *deltas]]
+                keep = latest_rows(frames[0][KEY_COLUMNS], [frame[KEY_COLUMNS] for frame in frames[1:]])
+                df = pd.concat(frames, ignore_index=True)[keep].reset_index(drop=True)
+                if columns is not None:
+                    df = df[columns]
+            else:
+                df = pd.read_parquet(self.output_columnar, columns=columns)
+            # Volta aos tipos do CSV para comparar/atualizar com os snapshots
+            dtypes = {'genre': str, 'popularity': np.int64, 'duration_ms': np.int64}
+            df = df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns})
+            if columns is None:
+                df['duration_min'] = df['duration_ms'] / 60000
+            return df
+        return pd.read_csv(self.output_csv, usecols=columns)
+    
+    @staticmethod
+    def _keys(df):
+        return pd.MultiIndex.from_arrays([df[col].astype(str) for col in KEY_COLUMNS])
+    
+    @staticmethod
+    def row_hashes(df):
+        """Hash do conteúdo de cada linha, independente dos tipos usados no armazenamento"""
+        normalized = pd.DataFrame({
+            'name': df['name'].astype(str).to_numpy(dtype=object),
+            'artists': df['artists'].astype(str).to_numpy(dtype=object),
+            'album': df['album'].astype(str).to_numpy(dtype=object),
+            'popularity': df['popularity'].to_numpy(dtype=np.int64),
+            'duration_ms': df['duration_ms'].to_numpy(dtype=np.int64),
+            'explicit': df['explicit'].to_numpy(dtype=bool)
+        })
+        return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+    
+    def ingest_incremental(self, snapshot_file, compare_full=False, write_csv=True):
+        """Ingestão incremental de um novo snapshot de faixas
+        
+        Compara o snapshot com o dataset processado pela chave (id, gênero):
+        faixas novas são anexadas, faixas com conteúdo diferente são
+        atualizadas e as demais ignoradas. Os agregados persistidos são
+        atualizados por delta (soma das linhas novas, troca das alteradas) em
+        vez de recalculados.
+        
+        Com pyarrow, as faixas inseridas e alteradas vão para uma nova parte
+        ao lado do Parquet base, que não é reescrito (ver `delta_files`);
+        passando de `MAX_DELTA_PARTS` partes, base e partes são compactadas
+        num único arquivo. O mapeamento de duplicatas é refeito só nos blocos
+        de (nome, artistas) tocados. Com `write_csv=False` o CSV de fallback
+        não é atualizado, evitando reescrevê-lo quando há faixas alteradas.
+        
+        Com `compare_full=True` também mede o caminho completo (agregados,
+        duplicatas e Parquet refeitos sobre todas as faixas), para reportar o
+        tempo economizado.
+        """
+        start = time.perf_counter()
+        
+        snapshot = self.clean_chunk(pd.read_csv(snapshot_file))
+        snapshot = snapshot.drop_duplicates(KEY_COLUMNS, keep='last').reset_index(drop=True)
+        store = self.load_processed()
+        
+        aggregates = self.load_aggregates()
+        if aggregates is None:
+            print("Agregados persistidos ausentes ou desatualizados; recalculando a base")
+            aggregates = self.compute_aggregates(store)
+        
+        store_keys = self._keys(store)
+        positions = store_keys.get_indexer(self._keys(snapshot))
+        is_new = positions < 0
+        existing = snapshot[~is_new]
+        existing_positions = positions[~is_new]
+        changed = self.row_hashes(store.iloc[existing_positions]) != self.row_hashes(existing)
+        
+        inserted = snapshot[is_new]
+        updated = existing[changed]
+        replaced = store.iloc[existing_positions[changed]]
+        
+        delta_start = time.perf_counter()
+        aggregates = aggregates.apply_delta(
+            added=self.compute_aggregates(pd.concat([inserted, updated])),
+            removed=self.compute_aggregates(replaced)
+        )
+        delta_time = time.perf_counter() - delta_start
+        
+        report = {
+            'inseridas': int(len(inserted)),
+            'atualizadas': int(len(updated)),
+            'inalteradas': int(len(existing) - len(updated)),
+            'compactado': False
+        }
+        
+        write_time = 0.0
+        if len(inserted) or len(updated):
+            columns = list(store.columns)
+            delta = pd.concat([updated[columns], inserted[columns]], ignore_index=True)
+            if len(updated):
+                rows = existing_positions[changed]
+                for col in columns:
+                    store.iloc[rows, store.columns.get_loc(col)] = updated[col].to_numpy()
+            store = pd.concat([store, inserted[columns]], ignore_index=True)
+            # Alterações mantêm a chave; inserções vão para o fim
+            store_keys = store_keys.append(self._keys(inserted))
+            
+            write_start = time.perf_counter()
+            os.makedirs(self.processed_data_path, exist_ok=True)
+            if HAS_PYARROW:
+                if not os.path.exists(self.output_columnar):
+                    self.to_compact_dtypes(store).to_parquet(self.output_columnar, index=False)
+                elif len(delta_files(self.output_columnar)) >= MAX_DELTA_PARTS:
+                    # Compactação: base reescrita com todas as faixas, partes removidas
+                    self.to_compact_dtypes(store).to_parquet(self.output_columnar, index=False)
+                    clear_deltas(self.output_columnar)
+                    report['compactado'] = True
+                else:
+                    write_delta(self.to_compact_dtypes(delta), self.output_columnar)
+            if write_csv or not HAS_PYARROW:
+                if len(updated) or not os.path.exists(self.output_csv):
+                    store.to_csv(self.output_csv, index=False)
+                else:
+                    # Só inserções: o CSV recebe apenas as linhas novas
+                    inserted[columns].to_csv(self.output_csv, mode='a', header=False, index=False)
+            self.save_aggregates(aggregates)
+            self.update_canonical_mapping(store, delta, replaced, store_keys)
+            write_time = time.perf_counter() - write_start
+        
+        report['total'] = int(len(store))
+        report['tempo_agregados_delta_s'] = delta_time
+        report['tempo_gravacao_s'] = write_time
+        report['tempo_total_s'] = time.perf_counter() - start
+        
+        if compare_full:
+            full_start = time.perf_counter()
+            self.compute_aggregates(store)
+            full_time = time.perf_counter() - full_start
+            report['tempo_agregados_completo_s'] = full_time
+            
+            full_start = time.perf_counter()
+            find_duplicates(store)
+            if HAS_PYARROW:
+                scratch = os.path.join(self.processed_data_path, '.compare_full.parquet')
+                self.to_compact_dtypes(store).to_parquet(scratch, index=False)
+                os.remove(scratch)
+            report['tempo_gravacao_completa_s'] = time.perf_counter() - full_start
+            report['tempo_economizado_s'] = (
+                full_time + report['tempo_gravacao_completa_s'] - delta_time - write_time
+            )
+        
+        print(f"Snapshot {snapshot_file}: {report['inseridas']} inseridas, "
+              f"{report['atualizadas']} atualizadas, {report['inalteradas']} inalteradas")
+        return report
+
 if __name__ == "__main__":
+    import sys
+    
     loader = SpotifyDataLoader()
-    df, analysis = loader.process_data()
+    if '--incremental' in sys.argv:
+        snapshot = sys.argv[sys.argv.index('--incremental') + 1]
+        print(loader.ingest_incremental(snapshot, compare_full=True))
+    elif '--streaming' in sys.argv:
+        analysis = loader.process_data_streaming()
+    else:
+        df, analysis = loader.process_data()
     print("\nAnálise concluída! Os dados estão prontos para processamento posterior.")
\ No newline at end of file
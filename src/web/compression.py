@@ -0,0 +1,31 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele as respostas usam gzip
+    brotli = None
+
+
+def negotiate_encoding(accept_encoding):
+    """Escolhe a codificação da resposta a partir do cabeçalho Accept-Encoding"""
+    accepted = set()
+    for token in (accept_encoding or '').split(','):
+        coding, _, params = token.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(coding.strip().lower())
+
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding, brotli_quality=11):
+    """Comprime `body` (bytes); com encoding None devolve o corpo original"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=brotli_quality)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    return body
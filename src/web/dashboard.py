@@ -0,0 +1,60 @@
+import logging
+
+from src.analysis.instrumentation import span
+from src.web.serialization import figure_to_json
+
+logger = logging.getLogger(__name__)
+
+# Gráficos do dashboard: nome (id do container no template) -> método do analyzer
+CHARTS = {
+    'genre_popularity': 'analyze_genre_popularity',
+    'explicit_analysis': 'analyze_explicit_by_genre',
+    'duration_dist': 'analyze_duration_distribution',
+    'popularity_trends': 'analyze_popularity_trends',
+    'correlation_matrix': 'analyze_correlations',
+    'success_factors': 'analyze_genre_success_factors',
+    'artist_leaders': 'analyze_artist_popularity'
+}
+
+# Casas decimais mantidas nos floats dos gráficos servidos pela API
+CHART_DECIMALS = 4
+
+
+def build_dashboard_payload(analyzer):
+    """Calcula gráficos (já com tema e serializados), insights e tabelas do dashboard"""
+    if analyzer.df.empty:
+        return {'charts': {}, 'insights': {}, 'recommendations': {}, 'catalog': {},
+                'success_metrics': "", 'rows': 0, 'compressed': {}}
+
+    charts = {}
+    results = {}
+
+    for name, method in CHARTS.items():
+        try:
+            fig = getattr(analyzer, method)()
+            if isinstance(fig, tuple):
+                results[name], fig = fig
+            with span('serialize'):
+                charts[name] = figure_to_json(fig, decimals=CHART_DECIMALS)
+        except Exception:
+            logger.exception("Erro ao gerar %s", name)
+
+    # Gerar insights e recomendações
+    insights = analyzer.get_business_insights()
+    recommendations = analyzer.generate_recommendations(insights)
+    catalog = analyzer.analyze_catalog()
+
+    success_metrics = results.get('success_factors')
+    return {
+        'charts': charts,
+        'insights': insights,
+        'recommendations': recommendations,
+        'catalog': catalog,
+        'success_metrics': success_metrics.to_html(
+            classes='table table-dark table-striped',
+            justify='left'
+        ) if success_metrics is not None else "",
+        'rows': len(analyzer.df),
+        # Corpos comprimidos, preenchidos sob demanda por (recurso, codificação)
+        'compressed': {}
+    }
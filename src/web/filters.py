@@ -0,0 +1,124 @@
+from urllib.parse import urlencode
+
+from src.analysis.filter_index import normalize_filters
+
+TRUE_VALUES = {'1', 'true', 'sim', 'yes'}
+FALSE_VALUES = {'0', 'false', 'nao', 'não', 'no'}
+
+
+def _list_arg(args, name):
+    """Valores de um parâmetro repetido (?genre=a&genre=b) ou separado por vírgula"""
+    values = []
+    for value in args.getlist(name):
+        values.extend(v.strip() for v in value.split(',') if v.strip())
+    return values
+
+
+def _int_arg(args, name):
+    value = args.get(name, '').strip()
+    if not value:
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f"{name} deve ser um inteiro entre 0 e 100")
+    if not 0 <= value <= 100:
+        raise ValueError(f"{name} deve ser um inteiro entre 0 e 100")
+    return value
+
+
+def _bool_arg(args, name):
+    value = args.get(name, '').strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    if value:
+        raise ValueError(f"{name} deve ser true ou false")
+    return None
+
+
+def filters_from_args(args):
+    """Filtro normalizado a partir dos parâmetros da query string.
+
+    Parâmetros: genre (repetido ou separado por vírgula), popularity_min,
+    popularity_max, explicit (true/false), duration (categorias de duração)
+    e dedup (true para analisar sem as versões duplicadas das faixas).
+    Levanta ValueError para valores inválidos.
+    """
+    explicit = _bool_arg(args, 'explicit')
+
+    popularity_min = _int_arg(args, 'popularity_min')
+    popularity_max = _int_arg(args, 'popularity_max')
+    if popularity_min is not None and popularity_max is not None and popularity_min > popularity_max:
+        raise ValueError("popularity_min não pode ser maior que popularity_max")
+
+    return normalize_filters(
+        genres=_list_arg(args, 'genre'),
+        popularity_min=popularity_min,
+        popularity_max=popularity_max,
+        explicit=explicit,
+        duration=_list_arg(args, 'duration'),
+        dedup=bool(_bool_arg(args, 'dedup'))
+    )
+
+
+def filters_query(filters):
+    """Query string equivalente a um filtro normalizado (sem o '?')"""
+    params = []
+    for name, value in filters:
+        if name == 'genres':
+            params.extend(('genre', genre) for genre in value)
+        elif name == 'duration':
+            params.extend(('duration', category) for category in value)
+        elif name in ('explicit', 'dedup'):
+            params.append((name, 'true' if value else 'false'))
+        else:
+            params.append((name, value))
+    return urlencode(params)
+
+
+def similar_from_args(args, max_k=100):
+    """Músicas-semente (?track=, repetido ou separado por vírgula) e `k` de /api/similar.
+
+    Levanta ValueError sem sementes ou com `k` fora de 1..`max_k`.
+    """
+    tracks = list(dict.fromkeys(_list_arg(args, 'track')))
+    if not tracks:
+        raise ValueError("Informe ao menos uma música em track")
+    k = args.get('k', '10').strip() or '10'
+    try:
+        k = int(k)
+    except ValueError:
+        raise ValueError(f"k deve ser um inteiro entre 1 e {max_k}")
+    if not 1 <= k <= max_k:
+        raise ValueError(f"k deve ser um inteiro entre 1 e {max_k}")
+    return tracks, k
+
+
+def playlist_specs(body, max_batch):
+    """Pedidos de playlist do corpo JSON de /api/playlists.
+
+    Aceita {"playlists": [pedido, ...]} ou um único pedido com "count",
+    que gera `count` playlists com as sementes seed, seed + 1, ... Levanta
+    ValueError para corpos inválidos ou lotes maiores que `max_batch`.
+    """
+    if not isinstance(body, dict):
+        raise ValueError("O corpo deve ser um objeto JSON")
+    if 'playlists' in body:
+        specs = body['playlists']
+        if not isinstance(specs, list) or not specs:
+            raise ValueError("playlists deve ser uma lista não vazia")
+    else:
+        spec = {key: value for key, value in body.items() if key != 'count'}
+        try:
+            count = int(body.get('count', 1))
+            seed = int(spec.get('seed', 0))
+        except (TypeError, ValueError):
+            raise ValueError("count e seed devem ser inteiros")
+        if count < 1:
+            raise ValueError("count deve ser positivo")
+        specs = [{**spec, 'seed': seed + i} for i in range(min(count, max_batch + 1))]
+    if len(specs) > max_batch:
+        raise ValueError(f"No máximo {max_batch} playlists por pedido")
+    return specs
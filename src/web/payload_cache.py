@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class PayloadCache:
+    """Cache de payloads pré-computados, indexado pela versão dos dados.
+
+    Guarda as últimas `max_entries` versões; quando o dataset muda a nova
+    versão gera uma nova chave e as antigas são descartadas por ordem de uso.
+    Faltas simultâneas da mesma chave são coalescidas: só a primeira chama
+    o `builder` e as demais esperam o resultado dela.
+    """
+
+    def __init__(self, max_entries=4):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._counters = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+    def get_or_build(self, key, builder):
+        """Retorna o payload de `key`, chamando `builder()` apenas na primeira vez"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return self._entries[key]
+            pending = self._pending.get(key)
+            building = pending is None
+            if building:
+                self._counters['misses'] += 1
+                pending = self._pending[key] = Future()
+            else:
+                self._counters['coalesced'] += 1
+        if not building:
+            # Outra requisição já está calculando esta chave
+            return pending.result()
+
+        try:
+            payload = builder()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            del self._pending[key]
+        pending.set_result(payload)
+        return payload
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, 'entries': len(self._entries)}
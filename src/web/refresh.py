@@ -0,0 +1,124 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardRefresher:
+    """Reconstrói os artefatos do dashboard quando a versão dos dados muda.
+
+    `signature()` deve ser barata (ex.: mtime/tamanho do arquivo) e indicar
+    que os dados podem ter mudado; `rebuild()` recalcula os artefatos e
+    devolve um dicionário descrevendo a versão construída (com ao menos
+    'version').
+
+    Modos:
+      background - uma thread por processo confere a assinatura a cada
+                   `interval` segundos e reconstrói fora das requisições;
+                   até a nova versão ficar pronta as requisições continuam
+                   recebendo a última versão boa (stale-while-revalidate)
+      sync       - a assinatura é conferida a cada requisição e a
+                   reconstrução acontece na própria requisição
+
+    Nos dois modos reconstruções simultâneas são coalescidas: só uma roda
+    e as demais esperam o resultado dela.
+    """
+
+    def __init__(self, signature, rebuild, mode='background', interval=5.0):
+        self.signature = signature
+        self.rebuild = rebuild
+        self.mode = mode
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._current = None
+        self._signature = None
+        self._refreshing = False
+        self._last_error = None
+        self._refreshes = 0
+        self._thread_pid = None
+
+    def current(self):
+        """Última versão boa dos artefatos (dicionário de `rebuild` + 'built_at').
+
+        Na primeira chamada (sem artefato) a reconstrução é síncrona.
+        """
+        if self._current is None:
+            self._refresh(force=True)
+        elif self.mode == 'sync':
+            self._refresh()
+        else:
+            self.ensure_started()
+        if self._current is None:
+            raise RuntimeError(f"Dashboard indisponível: {self._last_error}")
+        return self._current
+
+    def _refresh(self, force=False):
+        """Reconstrói se a assinatura mudou; chamadas simultâneas esperam a que está rodando"""
+        signature = self.signature()
+        if not force and signature == self._signature:
+            return
+        with self._build_lock:
+            # Outra thread pode ter reconstruído enquanto esta esperava
+            if self._current is not None and signature == self._signature:
+                return
+            self._refreshing = True
+            try:
+                artifact = self.rebuild()
+            except Exception as e:
+                # Mantém a última versão boa; a próxima verificação tenta de novo
+                self._last_error = f"{type(e).__name__}: {e}"
+                logger.exception("Erro ao reconstruir o dashboard")
+                return
+            finally:
+                self._refreshing = False
+            with self._lock:
+                self._signature = signature
+                self._last_error = None
+                self._refreshes += 1
+                self._current = {**artifact, 'built_at': time.time()}
+
+    def ensure_started(self):
+        """Inicia a thread de atualização neste processo (de novo após um fork)"""
+        if self.mode != 'background' or self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+            threading.Thread(target=self._run, name='dashboard-refresh', daemon=True).start()
+
+    def trigger(self):
+        """Pede uma verificação imediata à thread de atualização"""
+        self.ensure_started()
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self._refresh()
+            except Exception as e:
+                self._last_error = f"{type(e).__name__}: {e}"
+                logger.exception("Erro na verificação dos dados do dashboard")
+
+    def health(self):
+        """Versão atual dos artefatos, idade e estado da atualização"""
+        current = self._current
+        return {
+            'status': 'ok' if current and not self._last_error else
+                      'degraded' if current else 'starting',
+            'mode': self.mode,
+            'version': current['version'] if current else None,
+            'data_mtime': current.get('data_mtime') if current else None,
+            'built_at': current['built_at'] if current else None,
+            'age_seconds': round(time.time() - current['built_at'], 3) if current else None,
+            'refreshing': self._refreshing,
+            'refreshes': self._refreshes,
+            'last_error': self._last_error,
+            'pid': os.getpid()
+        }
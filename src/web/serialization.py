@@ -0,0 +1,116 @@
+import base64
+import json
+
+import numpy as np
+from plotly.utils import PlotlyJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usa o json da biblioteca padrão
+    orjson = None
+
+# Arrays numéricos a partir deste tamanho vão como typed array base64 do plotly.js
+TYPED_ARRAY_MIN_SIZE = 256
+
+# Tipos aceitos pelo plotly.js em {'dtype', 'bdata'}, do mais compacto ao mais largo
+_INT_TYPES = [('i1', np.int8), ('u1', np.uint8), ('i2', np.int16),
+              ('u2', np.uint16), ('i4', np.int32), ('u4', np.uint32)]
+
+
+def round_floats(obj, decimals):
+    """Arredonda recursivamente os floats (e arrays de float) de um spec de figura"""
+    if isinstance(obj, dict):
+        return {key: round_floats(value, decimals) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [round_floats(value, decimals) for value in obj]
+    if isinstance(obj, np.ndarray) and obj.dtype.kind == 'f':
+        return np.round(obj, decimals)
+    if isinstance(obj, (float, np.floating)):
+        return round(float(obj), decimals)
+    return obj
+
+
+def typed_array(values):
+    """Array numpy na forma base64 do plotly.js ({'dtype', 'bdata', 'shape'}).
+
+    Inteiros usam o menor tipo que comporta os valores; retorna None para
+    arrays que o plotly.js não aceita nessa forma (bool, texto, datas, int64
+    fora da faixa de 32 bits).
+    """
+    kind = values.dtype.kind
+    if kind == 'f':
+        code, dtype = ('f4', np.float32) if values.dtype == np.float32 else ('f8', np.float64)
+    elif kind in 'iu':
+        low, high = (values.min(), values.max()) if values.size else (0, 0)
+        for code, dtype in _INT_TYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                break
+        else:
+            return None
+    else:
+        return None
+
+    data = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder('<'))
+    spec = {'dtype': code, 'bdata': base64.b64encode(data.tobytes()).decode('ascii')}
+    if values.ndim > 1:
+        spec['shape'] = ','.join(str(n) for n in values.shape)
+    return spec
+
+
+def encode_typed_arrays(obj, min_size=TYPED_ARRAY_MIN_SIZE, floats=True):
+    """Troca recursivamente arrays numéricos grandes pela forma typed array"""
+    if isinstance(obj, dict):
+        return {key: encode_typed_arrays(value, min_size, floats) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [encode_typed_arrays(value, min_size, floats) for value in obj]
+    if (isinstance(obj, np.ndarray) and obj.size >= min_size
+            and (floats or obj.dtype.kind != 'f')):
+        spec = typed_array(obj)
+        return obj if spec is None else spec
+    return obj
+
+
+def _default(obj):
+    # Tipos que o orjson não conhece (pandas, datas, arrays não contíguos...)
+    return PlotlyJSONEncoder().default(obj)
+
+
+def dumps(obj):
+    """JSON compacto com suporte a numpy/pandas (orjson, quando instalado)"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+    return json.dumps(obj, cls=PlotlyJSONEncoder, separators=(',', ':'))
+
+
+def figure_to_json(fig, decimals=None, typed_arrays=True):
+    """Serializa a figura em JSON compacto, opcionalmente arredondando os floats.
+
+    Com `typed_arrays`, arrays numéricos grandes vão em base64 (plotly.js >= 2.28).
+    Floats arredondados continuam como texto: com poucas casas decimais o
+    texto é menor (e comprime melhor) que os 8 bytes de cada float64.
+    """
+    spec = fig.to_plotly_json()
+    if decimals is not None:
+        spec = round_floats(spec, decimals)
+    if typed_arrays:
+        spec = encode_typed_arrays(spec, floats=decimals is None)
+    return dumps(spec)
+
+
+def to_json(obj):
+    """JSON de objetos com tipos numpy/pandas (insights, recomendações)"""
+    return dumps(obj)
+
+
+def script_safe(json_text):
+    """JSON pronto para ser embutido num <script> sem nova codificação.
+
+    `<`, `>` e `&` só aparecem dentro de strings no JSON, onde os escapes
+    unicode são equivalentes.
+    """
+    return (json_text.replace('<', '\\u003c').replace('>', '\\u003e')
+            .replace('&', '\\u0026'))
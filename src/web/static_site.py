@@ -0,0 +1,358 @@
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+
+from src.analysis.dataset_cache import content_hash
+from src.analysis.datasets import dataset_registry, DEFAULT_DATASET
+from src.web.compression import brotli, compress
+from src.web.dashboard import build_dashboard_payload
+from src.web.serialization import to_json, script_safe
+
+# Muda quando o formato da saída muda: força a reconstrução de tudo
+BUILD_VERSION = 1
+MANIFEST = 'build-manifest.json'
+FINGERPRINT_LENGTH = 12
+# Arquivos de texto gravados também pré-comprimidos (.gz e, com brotli, .br)
+COMPRESSIBLE = {'.html', '.js', '.css', '.json', '.svg'}
+SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+# Arquivos de static/ usados pela página: imagens de cabeçalho, ícones e os
+# PNGs dos gráficos. O `app.py --build` também grava em visualization/ os HTML
+# exportados, o plotly.min.js que eles carregam e o manifesto da exportação;
+# a página não usa nenhum deles (o plotly.js vem de `build_plotly`)
+STATIC_FILES = ('img/*', 'icons/*', 'visualization/*.png')
+
+_PRESERVED = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2>)', re.S | re.I)
+_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+
+
+def minify_css(css):
+    """Remove comentários e espaços desnecessários de um bloco CSS"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_js(js):
+    """Minificação conservadora: tira a indentação, linhas vazias e linhas só de comentário.
+
+    As quebras de linha ficam (a inserção automática de ponto e vírgula
+    continua valendo) e nada dentro das linhas é alterado.
+    """
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+
+def _collapse(markup):
+    return re.sub(r'\s+', ' ', _COMMENT.sub('', markup))
+
+
+def minify_html(html):
+    """Remove comentários e colapsa espaços do HTML, minificando os <style> e <script> embutidos"""
+    parts, last = [], 0
+    for match in _PRESERVED.finditer(html):
+        open_tag, tag, body, close_tag = match.groups()
+        tag = tag.lower()
+        if tag == 'style':
+            body = minify_css(body)
+        elif tag == 'script':
+            body = minify_js(body)
+        parts.append(_collapse(html[last:match.start()]) + _collapse(open_tag) + body + close_tag)
+        last = match.end()
+    parts.append(_collapse(html[last:]))
+    return ''.join(parts).strip()
+
+
+def fingerprint(name, body):
+    """Nome com o hash do conteúdo antes da extensão (app.js -> app.<hash>.js)"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(body).hexdigest()[:FINGERPRINT_LENGTH]}{ext}"
+
+
+def code_version(root='src'):
+    """Hash do código das análises e da serialização (entrada dos artefatos de dados)"""
+    digest = hashlib.sha256()
+    for path in sorted(Path(root).rglob('*.py')):
+        digest.update(path.as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def page_path(dataset_id):
+    """Caminho da página de um catálogo, relativo à raiz do site"""
+    return 'index.html' if dataset_id == DEFAULT_DATASET else f"{dataset_id}/index.html"
+
+
+class StaticSiteBuilder:
+    """Build do site estático do dashboard (GitHub Pages).
+
+    Renderiza o template uma vez por catálogo, com os gráficos e os
+    insights da versão atual dos dados, sem importar o app Flask. Cada
+    saída é um artefato com entradas conhecidas:
+
+    - plotly.js: versão do pacote plotly (um único arquivo, compartilhado
+      por todas as páginas);
+    - arquivos de static/: conteúdo de cada arquivo;
+    - dados de um catálogo (JSON dos gráficos e dos insights): hash do
+      arquivo processado e do código em src/;
+    - página de um catálogo: template, dados e URLs dos demais artefatos.
+
+    O manifesto (`build-manifest.json`) guarda o hash das entradas e os
+    arquivos de cada artefato; um novo build só refaz os artefatos cujas
+    entradas mudaram. Os arquivos (exceto as páginas) levam o hash do
+    conteúdo no nome e os de texto são gravados também em .gz/.br.
+    """
+
+    def __init__(self, output_dir='docs', static_dir='static', template_dir='templates',
+                 dataset_ids=None, registry=dataset_registry, force=False, brotli_quality=11):
+        self.output_dir = Path(output_dir)
+        self.static_dir = Path(static_dir)
+        self.template_dir = Path(template_dir)
+        self.registry = registry
+        self.dataset_ids = list(dataset_ids or registry.ids())
+        self.brotli_quality = brotli_quality
+        manifest = self._load_manifest()
+        # Arquivos do build anterior: os únicos que `prune` pode remover
+        self.previous_files = None if manifest is None else {
+            name for artifact in manifest['artifacts'].values() for name in artifact.get('files', [])
+        }
+        reusable = not force and manifest is not None and manifest.get('version') == BUILD_VERSION
+        self.previous = manifest['artifacts'] if reusable else {}
+        self.artifacts = {}
+        self.report = []
+        self._written = None
+
+    def _load_manifest(self):
+        """Manifesto do build anterior em `output_dir` (None se não houver)"""
+        path = self.output_dir / MANIFEST
+        if not path.exists():
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write(self, relpath, body):
+        """Grava `body` (bytes) e, para arquivos de texto, as versões pré-comprimidas"""
+        path = self.output_dir / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        outputs = [(relpath, body)]
+        if path.suffix in COMPRESSIBLE:
+            outputs.append((relpath + SUFFIXES['gzip'], compress(body, 'gzip')))
+            if brotli is not None:
+                outputs.append((relpath + SUFFIXES['br'], compress(body, 'br', self.brotli_quality)))
+        for name, data in outputs:
+            (self.output_dir / name).write_bytes(data)
+            self._written.append(name)
+        return relpath
+
+    def _write_asset(self, directory, name, body):
+        """Grava um arquivo com fingerprint em `directory` e devolve seu caminho no site"""
+        return self._write(f"{directory}/{fingerprint(name, body)}", body)
+
+    def _artifact(self, key, inputs, build):
+        """Artefato `key`: reaproveitado se as entradas e os arquivos não mudaram, senão `build()`"""
+        start = time.perf_counter()
+        digest = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+        previous = self.previous.get(key)
+        if (previous is not None and previous['inputs'] == digest
+                and all((self.output_dir / name).exists() for name in previous['files'])):
+            artifact, status = previous, 'reaproveitado'
+        else:
+            self._written = []
+            artifact = {**build(), 'inputs': digest, 'files': self._written}
+            status = 'gerado'
+        self.artifacts[key] = artifact
+
+        sizes = {'bytes': 0, 'gzip': 0, 'br': 0}
+        for name in artifact['files']:
+            encoding = next((e for e, suffix in SUFFIXES.items() if name.endswith(suffix)), 'bytes')
+            sizes[encoding] += (self.output_dir / name).stat().st_size
+        self.report.append({'artefato': key, 'estado': status,
+                            'tempo_s': time.perf_counter() - start, **sizes})
+        return artifact
+
+    def build_plotly(self):
+        """plotly.js do pacote plotly instalado, uma cópia para todas as páginas"""
+        from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+        version = get_plotlyjs_version()
+
+        def build():
+            body = get_plotlyjs().encode('utf-8')
+            return {'url': self._write_asset('assets/vendor', f"plotly-{version}.min.js", body)}
+
+        return self._artifact('plotly.js', {'plotly': version}, build)['url']
+
+    def build_static(self):
+        """Arquivos de static/ com fingerprint: {caminho em static/: caminho no site}"""
+        urls = {}
+        for pattern in STATIC_FILES:
+            for path in sorted(self.static_dir.glob(pattern)):
+                if not path.is_file():
+                    continue
+                filename = path.relative_to(self.static_dir).as_posix()
+
+                def build(path=path, filename=filename):
+                    body = path.read_bytes()
+                    return {'url': self._write_asset(f"assets/{os.path.dirname(filename)}", path.name, body)}
+
+                urls[filename] = self._artifact(
+                    f"static/{filename}", {'content': content_hash(path)}, build
+                )['url']
+        return urls
+
+    def build_data(self, dataset_id, code):
+        """JSON dos gráficos e dos insights de um catálogo (versão atual dos dados)"""
+        from src.analysis.spotify_analyzer import SpotifyAnalyzer
+
+        data_path = self.registry.path(dataset_id)
+        data_version = content_hash(data_path)
+
+        def build():
+            # O arquivo vem do registro do build (que pode não ser o global)
+            analyzer = SpotifyAnalyzer()
+            analyzer.dataset_id, analyzer.data_path = dataset_id, data_path
+            # Confere o arquivo mesmo se o cache do processo estiver sem revalidação
+            analyzer.load_data(revalidate=True)
+            payload = build_dashboard_payload(analyzer)
+            directory = f"assets/data/{dataset_id}"
+            charts = {
+                name: self._write_asset(directory, f"{name}.json", spec.encode('utf-8'))
+                for name, spec in payload['charts'].items()
+            }
+            insights = to_json({key: payload[key] for key in
+                                ('rows', 'insights', 'recommendations', 'catalog', 'success_metrics')})
+            return {
+                'data_version': data_version,
+                'rows': payload['rows'],
+                'charts': charts,
+                'insights': self._write_asset(directory, 'insights.json', insights.encode('utf-8'))
+            }
+
+        return self._artifact(f"dados/{dataset_id}", {'data': data_version, 'code': code}, build)
+
+    def _environment(self):
+        env = Environment(loader=FileSystemLoader(self.template_dir), autoescape=select_autoescape(['html']))
+        env.filters['embed_json'] = lambda json_text: Markup(script_safe(json_text))
+        return env
+
+    def build_page(self, dataset_id, data, plotly_url, static_urls):
+        """Página de um catálogo, com os insights já renderizados e os gráficos em JSON"""
+        template_path = self.template_dir / 'index.html'
+        prefix = '../' * page_path(dataset_id).count('/')
+        pages = {d: prefix + page_path(d) for d in self.dataset_ids}
+
+        def url_for(endpoint, **values):
+            if endpoint == 'static':
+                filename = values['filename']
+                return prefix + static_urls.get(filename, f"static/{filename}")
+            if endpoint == 'plotly_js':
+                return prefix + plotly_url
+            if endpoint == 'index':
+                return pages.get(values.get('dataset') or dataset_id, '#')
+            return '#'
+
+        def build():
+            with open(self.output_dir / data['insights'], encoding='utf-8') as f:
+                payload = json.load(f)
+            html = self._environment().get_template('index.html').render(
+                url_for=url_for,
+                request=SimpleNamespace(script_root=''),
+                plotly_version=os.path.basename(plotly_url),
+                static_site=True,
+                graphs={},
+                chart_names=list(data['charts']),
+                chart_urls={name: prefix + url for name, url in data['charts'].items()},
+                insights=payload['insights'],
+                recommendations=payload['recommendations'],
+                catalog=payload['catalog'],
+                success_metrics=payload['success_metrics'],
+                filters={},
+                api_query='',
+                dataset_id=dataset_id,
+                datasets={d: self.registry.title(d) for d in self.dataset_ids},
+                dataset_pages=pages,
+                genres=[],
+                rows=payload['rows']
+            )
+            return {'url': self._write(page_path(dataset_id), minify_html(html).encode('utf-8'))}
+
+        inputs = {
+            'template': content_hash(template_path),
+            'data': data['inputs'],
+            'plotly': plotly_url,
+            'static': static_urls,
+            'datasets': {d: self.registry.title(d) for d in self.dataset_ids}
+        }
+        return self._artifact(f"pagina/{dataset_id}", inputs, build)
+
+    def prune(self):
+        """Remove os arquivos do build anterior que nenhum artefato atual usa.
+
+        Só são candidatos os arquivos listados no manifesto anterior: o que
+        não foi gerado pelo build (CNAME, .nojekyll, o repositório quando a
+        saída é '.') nunca é tocado. Sem manifesto anterior nada é removido.
+        Devolve o número de arquivos removidos.
+        """
+        if self.previous_files is None:
+            return 0
+        keep = {name for artifact in self.artifacts.values() for name in artifact['files']}
+        root = self.output_dir.resolve()
+        removed = 0
+        for name in sorted(self.previous_files - keep):
+            path = (self.output_dir / name).resolve()
+            # Manifesto editado à mão: nada fora da saída
+            if root not in path.parents or not path.is_file():
+                continue
+            path.unlink()
+            removed += 1
+            # Diretórios que ficaram vazios por causa da remoção
+            for parent in path.parents:
+                if parent == root or any(parent.iterdir()):
+                    break
+                parent.rmdir()
+        return removed
+
+    def build(self):
+        """Executa o build e devolve o relatório (tempo e tamanho de cada artefato)"""
+        start = time.perf_counter()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        plotly_url = self.build_plotly()
+        static_urls = self.build_static()
+        code = code_version()
+        for dataset_id in self.dataset_ids:
+            data = self.build_data(dataset_id, code)
+            self.build_page(dataset_id, data, plotly_url, static_urls)
+        removed = self.prune()
+
+        report = {
+            'artefatos': self.report,
+            'gerados': sum(row['estado'] == 'gerado' for row in self.report),
+            'reaproveitados': sum(row['estado'] == 'reaproveitado' for row in self.report),
+            'removidos': removed,
+            'tempo_total_s': time.perf_counter() - start,
+            **{key: sum(row[key] for row in self.report) for key in ('bytes', 'gzip', 'br')}
+        }
+        with open(self.output_dir / MANIFEST, 'w', encoding='utf-8') as f:
+            json.dump({'version': BUILD_VERSION, 'artifacts': self.artifacts, 'report': report},
+                      f, indent=2, ensure_ascii=False)
+        return report
+
+
+def print_report(report):
+    """Tabela do relatório de build: estado, tempo e tamanhos (original, gzip, brotli)"""
+    print(f"{'artefato':<48} {'estado':>13} {'tempo s':>8} {'KB':>9} {'gzip KB':>9} {'br KB':>9}")
+    for row in report['artefatos']:
+        print(f"{row['artefato']:<48} {row['estado']:>13} {row['tempo_s']:>8.2f} "
+              f"{row['bytes'] / 1024:>9.1f} {row['gzip'] / 1024:>9.1f} {row['br'] / 1024:>9.1f}")
+    print(f"{'total':<48} {'':>13} {report['tempo_total_s']:>8.2f} "
+          f"{report['bytes'] / 1024:>9.1f} {report['gzip'] / 1024:>9.1f} {report['br'] / 1024:>9.1f}")
+    print(f"{report['gerados']} artefatos gerados, {report['reaproveitados']} reaproveitados, "
+          f"{report['removidos']} arquivos antigos removidos")
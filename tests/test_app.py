@@ -0,0 +1,62 @@
+import json
+import re
+from urllib.parse import parse_qs
+
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from src.analysis.datasets import dataset_registry
+from src.web.filters import filters_from_args
+
+pytestmark = pytest.mark.skipif(not dataset_registry.path().exists(), reason='dataset processado ausente')
+
+
+@pytest.fixture(scope='module')
+def client():
+    from app import app
+    return app.test_client()
+
+
+def test_health_responde_antes_do_primeiro_acesso(client):
+    response = client.get('/health')
+    assert response.status_code == 200
+    assert response.get_json()['status'] in ('starting', 'ok')
+
+
+def test_versao_segue_o_frame_carregado(client):
+    from app import published_analyzer
+
+    analyzer, data_version, _ = published_analyzer()
+    assert data_version == analyzer.snapshot.version
+    assert analyzer.filter_index is analyzer.snapshot.derived('filter_index', None)
+
+
+@pytest.mark.parametrize('query', ['', '?genre=rock&explicit=true&duration=Longa'])
+def test_grafico_de_duracao(client, query):
+    response = client.get(f'/api/charts/duration_dist{query}')
+    assert response.status_code == 200
+    assert response.headers['ETag']
+
+
+def chart_query(html):
+    """Parâmetros da query string que a página usa para buscar os gráficos"""
+    query = json.loads(re.search(r'const apiQuery = (".*?");', html).group(1))
+    return MultiDict([(name, value) for name, values in parse_qs(query).items() for value in values])
+
+
+def test_graficos_recebem_todos_os_filtros(client):
+    query = 'genre=rock&genre=pop&explicit=true&duration=Longa&dedup=true'
+    response = client.get(f'/?{query}')
+    assert response.status_code == 200
+    args = chart_query(response.get_data(as_text=True))
+    assert filters_from_args(args) == filters_from_args(MultiDict(parse_qs(query)))
+    assert len(filters_from_args(args)) == 4
+
+
+def test_graficos_recebem_o_dataset(client, monkeypatch):
+    monkeypatch.setitem(dataset_registry._datasets, 'outro', {'path': dataset_registry.path(), 'title': 'Outro'})
+    response = client.get('/?dataset=outro&genre=rock&explicit=false')
+    assert response.status_code == 200
+    args = chart_query(response.get_data(as_text=True))
+    assert args.get('dataset') == 'outro'
+    assert filters_from_args(args) == (('genres', ('rock',)), ('explicit', False))
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.analysis import dataset_cache
+from src.analysis.column_store import pa
+from src.analysis.dataset_cache import DatasetCache, _project_path
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = tmp_path / 'tracks.csv'
+    pd.DataFrame({
+        'name': ['a', 'b', 'c'],
+        'genre': ['rock', 'pop', 'rock'],
+        'popularity': [10, 20, 30],
+    }).to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize('copy_on_write', [pytest.param(False, marks=pytest.mark.skipif(
+    int(pd.__version__.split('.')[0]) >= 3, reason='Copy-on-Write sempre ativo')), True])
+@pytest.mark.parametrize('column_store', [False, pytest.param(True, marks=pytest.mark.skipif(
+    pa is None, reason='pyarrow não instalado'))])
+def test_get_nao_altera_o_cache(tmp_path, dataset, column_store, copy_on_write, monkeypatch):
+    # O app liga o Copy-on-Write; a ETL e os scripts usam o padrão do pandas
+    monkeypatch.setattr(pd.options.mode, 'copy_on_write', copy_on_write)
+    assert dataset_cache.copy_on_write() == copy_on_write
+    cache = DatasetCache(store_dir=tmp_path / 'columns' if column_store else None)
+    view = cache.get(dataset, pd.read_csv)
+    view.loc[0, 'popularity'] = 999
+    view.loc[1, 'name'] = 'z'
+    view['extra'] = 1
+
+    fresh = cache.get(dataset, pd.read_csv)
+    assert fresh['popularity'].tolist() == [10, 20, 30]
+    assert fresh['name'].tolist() == ['a', 'b', 'c']
+    assert 'extra' not in fresh
+    assert view.loc[0, 'popularity'] == 999
+
+
+def test_get_recarrega_quando_o_conteudo_muda(dataset):
+    cache = DatasetCache()
+    first, _ = cache.version(dataset, pd.read_csv)
+    pd.read_csv(dataset).assign(popularity=0).to_csv(dataset, index=False)
+    assert cache.version(dataset, pd.read_csv)[0] != first
+    assert cache.get(dataset, pd.read_csv)['popularity'].eq(0).all()
+
+
+def test_snapshot_fica_na_versao_carregada(dataset):
+    cache = DatasetCache()
+    cache.revalidate = False
+    snapshot = cache.snapshot(dataset, pd.read_csv)
+
+    # Outra thread (a de atualização do dashboard) recarrega uma versão nova
+    pd.read_csv(dataset).assign(popularity=0).to_csv(dataset, index=False)
+    cache.version(dataset, pd.read_csv, revalidate=True)
+
+    assert snapshot.frame()['popularity'].tolist() == [10, 20, 30]
+    assert snapshot.derived('total', lambda df: df['popularity'].sum()) == 60
+    current = cache.snapshot(dataset, pd.read_csv)
+    assert current.version != snapshot.version
+    assert current.derived('total', lambda df: df['popularity'].sum()) == 0
+
+
+def test_store_dir_relativo_a_raiz_do_projeto(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    root = Path(__file__).resolve().parent.parent
+    assert _project_path('data/cache/columns') == root / 'data/cache/columns'
+    assert _project_path(str(tmp_path)) == tmp_path
+    assert _project_path('') is None
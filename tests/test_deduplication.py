@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.spotify_analyzer import SpotifyAnalyzer
+from src.etl.deduplication import DURATION_TOLERANCE_MS, find_duplicates
+
+
+def versions(durations, name='Song', artists='Artist'):
+    n_rows = len(durations)
+    return pd.DataFrame({
+        'id': [f"{name}{i}" for i in range(n_rows)],
+        'name': name,
+        'genre': 'rock',
+        'artists': artists,
+        'popularity': np.arange(n_rows),
+        'duration_ms': durations,
+        'duration_min': np.asarray(durations) / 60000,
+    })
+
+
+def test_grupo_nao_encadeia_versoes():
+    # A~B e B~C, mas C está além da tolerância de A
+    step = DURATION_TOLERANCE_MS * 3 // 4
+    result = find_duplicates(versions([180_000, 180_000 + step, 180_000 + 2 * step]))
+    assert result['track_group'].tolist() == [0, 0, 1]
+    assert result['duplicate'].tolist() == [True, False, False]
+
+
+def test_grupos_respeitam_a_tolerancia():
+    rng = np.random.default_rng(0)
+    df = pd.concat([versions(np.sort(rng.integers(180_000, 200_000, 40)), name=f"S{i}") for i in range(20)],
+                   ignore_index=True)
+    shuffled = df.sample(frac=1, random_state=0)
+    result = find_duplicates(shuffled)
+    span = (result.assign(duration=shuffled['duration_ms'].to_numpy())
+            .groupby('track_group')['duration'].agg(np.ptp))
+    assert span.max() <= DURATION_TOLERANCE_MS
+    assert result['track_group'].nunique() < len(df)
+
+
+def test_sem_faixas():
+    assert len(find_duplicates(versions([]))) == 0
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df = pd.concat([versions([180_000, 180_500, 250_000]), versions([200_000], name='Other')],
+                   ignore_index=True)
+    df.to_csv(tmp_path / 'processed_spotify.csv', index=False)
+    analyzer = SpotifyAnalyzer()
+    analyzer.data_path = tmp_path / 'processed_spotify.csv'
+    return analyzer, df
+
+
+def test_analyzer_usa_o_mapeamento_do_etl(analyzer):
+    analyzer, df = analyzer
+    mapping = find_duplicates(df)
+    # Marca diferente do cálculo em tempo de execução, em outra ordem de linhas
+    mapping.loc[3, 'duplicate'] = True
+    mapping.iloc[::-1].to_csv(analyzer.data_path.with_name('processed_spotify.canonical.csv'), index=False)
+
+    analyzer.load_data(revalidate=True)
+    assert analyzer.duplicates.tolist() == mapping['duplicate'].tolist()
+
+
+def test_analyzer_ignora_mapeamento_de_outra_versao(analyzer):
+    analyzer, df = analyzer
+    mapping = find_duplicates(df)
+    mapping.assign(duplicate=True).head(3).to_csv(
+        analyzer.data_path.with_name('processed_spotify.canonical.csv'), index=False)
+
+    analyzer.load_data(revalidate=True)
+    assert analyzer.duplicates.tolist() == mapping['duplicate'].tolist()
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.etl.spotify_data_loader as spotify_data_loader
+from src.analysis.delta_parts import delta_files
+from src.analysis.spotify_analyzer import SpotifyAnalyzer
+from src.etl.deduplication import find_duplicates
+from src.etl.spotify_data_loader import SpotifyDataLoader
+
+pytestmark = pytest.mark.skipif(not spotify_data_loader.HAS_PYARROW, reason='pyarrow não instalado')
+
+
+def tracks(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    # Poucos nomes e artistas: vários blocos com versões da mesma música
+    names = rng.integers(0, n_rows // 4, n_rows)
+    duration_ms = rng.integers(180_000, 186_000, n_rows)
+    return pd.DataFrame({
+        'id': [f"t{i:05d}" for i in range(n_rows)],
+        'name': [f"Track {i}" for i in names],
+        'genre': rng.choice(['rock', 'pop', 'jazz'], n_rows),
+        'artists': [f"Artist {i % 7}" for i in names],
+        'album': 'Album',
+        'popularity': rng.integers(0, 101, n_rows),
+        'duration_ms': duration_ms,
+        'explicit': rng.random(n_rows) < 0.2,
+        'duration_min': duration_ms / 60000,
+    })
+
+
+def by_key(df):
+    return df.sort_values(['id', 'genre']).reset_index(drop=True)
+
+
+@pytest.fixture
+def loader(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(spotify_data_loader, 'MAX_DELTA_PARTS', 2)
+    loader = SpotifyDataLoader()
+    df = tracks(2_000)
+    loader.save_processed(df, write_csv=False)
+    loader.save_canonical_mapping(df)
+    return loader
+
+
+def test_ingestao_grava_partes_e_atualiza_duplicatas(loader, tmp_path):
+    expected = loader.load_processed()
+    for step in range(4):
+        snapshot = expected.drop(columns=['duration_min']).sample(100, random_state=step)
+        snapshot.iloc[:50, snapshot.columns.get_loc('id')] += f"n{step}"
+        snapshot.iloc[50:, snapshot.columns.get_loc('popularity')] = (snapshot['popularity'].iloc[50:] + 1) % 101
+        snapshot.iloc[50:60, snapshot.columns.get_loc('name')] = 'Track 0'
+        snapshot.to_csv(tmp_path / 'snapshot.csv', index=False)
+
+        report = loader.ingest_incremental(tmp_path / 'snapshot.csv', write_csv=False)
+        assert (report['inseridas'], report['atualizadas']) == (50, 50)
+        # Até MAX_DELTA_PARTS partes; a ingestão seguinte compacta
+        assert len(delta_files(loader.output_columnar)) == (0 if report['compactado'] else step % 3 + 1)
+
+        keyed = expected.set_index(['id', 'genre'])
+        changes = snapshot.assign(duration_min=snapshot['duration_ms'] / 60000).set_index(['id', 'genre'])
+        expected = pd.concat([keyed.drop(changes.index, errors='ignore'), changes]).reset_index()
+
+        current = loader.load_processed()
+        pd.testing.assert_frame_equal(by_key(current), by_key(expected[current.columns]), check_dtype=False)
+
+        mapping, full = by_key(loader.load_canonical_mapping()), by_key(find_duplicates(current))
+        np.testing.assert_array_equal(mapping['duplicate'], full['duplicate'])
+        np.testing.assert_array_equal(mapping['block'], full['block'])
+        np.testing.assert_array_equal(mapping['canonical_id'], full['canonical_id'])
+        groups = pd.DataFrame({'incremental': mapping['track_group'], 'completo': full['track_group']})
+        assert groups.groupby('incremental')['completo'].nunique().max() == 1
+        assert groups.groupby('completo')['incremental'].nunique().max() == 1
+
+
+def test_leitores_aplicam_as_partes(loader, tmp_path):
+    snapshot = loader.load_processed().drop(columns=['duration_min']).head(10)
+    snapshot['popularity'] = 100
+    snapshot.to_csv(tmp_path / 'snapshot.csv', index=False)
+    loader.ingest_incremental(tmp_path / 'snapshot.csv', write_csv=False)
+
+    df = SpotifyAnalyzer.read_raw(loader.output_columnar)
+    assert len(df) == 2_000
+    assert df.set_index('id').loc[snapshot['id'], 'popularity'].eq(100).all()
+
+    columns = ['genre', 'popularity', 'duration_min']
+    chunks = pd.concat(SpotifyAnalyzer.iter_raw_chunks(loader.output_columnar, columns, chunksize=300))
+    assert len(chunks) == 2_000
+    assert chunks['popularity'].sum() == df['popularity'].sum()
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.etl.profiling import DataProfile, HyperLogLog
+
+
+def test_hyperloglog_erro_pequeno():
+    sketch = HyperLogLog()
+    sketch.update(np.arange(100_000))
+    assert sketch.count() == pytest.approx(100_000, rel=0.03)
+
+
+NAMES = [f"g{i}" for i in range(5_000)]
+
+
+@pytest.mark.parametrize('first, second', [
+    (pd.Series(np.arange(5_000)), pd.Series(np.arange(5_000), dtype=float)),
+    (pd.Series(np.arange(5_000), dtype=np.int32), pd.Series(np.arange(5_000), dtype='Int64')),
+    (pd.Series(NAMES), pd.Series(NAMES, dtype='category')),
+], ids=['int e float', 'int32 e Int64', 'str e category'])
+def test_hyperloglog_mesmo_valor_em_tipos_diferentes(first, second):
+    sketch = HyperLogLog()
+    sketch.update(first)
+    sketch.update(second)
+    assert sketch.count() == pytest.approx(5_000, rel=0.03)
+
+
+def test_perfil_em_blocos_com_tipo_mudando():
+    # O segundo bloco tem um nulo e a coluna passa a float
+    chunks = [pd.DataFrame({'popularity': np.arange(0, 60)}),
+              pd.DataFrame({'popularity': [*np.arange(30, 90), np.nan]})]
+    profile = DataProfile()
+    for chunk in chunks:
+        profile.update(chunk)
+    column = profile.columns['popularity']
+    assert column.dtype == np.float64
+    assert column.distinct.count() == 90
+    assert column.nulls == 1
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.sketches import QuantileSketches, TDigest
+
+QUANTILES = [0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99]
+MAX_RANK_ERROR = 0.01
+
+
+def rank_error(values, estimate, exact):
+    """Distância, em fração dos valores, entre os ranks do valor estimado e do exato"""
+    values = np.sort(values)
+    return np.abs(np.searchsorted(values, estimate) - np.searchsorted(values, exact)) / len(values)
+
+
+@pytest.fixture(scope='module')
+def tracks():
+    rng = np.random.default_rng(0)
+    n_rows = 50_000
+    return pd.DataFrame({
+        'genre': rng.choice(['rock', 'pop', 'jazz', 'metal'], n_rows),
+        'popularity': rng.integers(0, 101, n_rows),
+        'duration_min': rng.lognormal(1.2, 0.35, n_rows),
+    })
+
+
+def test_quantis_dentro_do_erro_de_rank(tracks):
+    values = tracks['duration_min'].to_numpy()
+    estimate = TDigest.from_values(values).quantile(QUANTILES)
+    assert rank_error(values, estimate, np.quantile(values, QUANTILES)).max() <= MAX_RANK_ERROR
+
+
+@pytest.mark.parametrize('query', [
+    {},
+    {'genres': ['rock']},
+    {'popularity_min': 60},
+    {'genres': ['jazz', 'metal'], 'popularity_min': 20, 'popularity_max': 49},
+])
+def test_sketches_por_celula(tracks, query):
+    subset = tracks
+    if 'genres' in query:
+        subset = subset[subset['genre'].isin(query['genres'])]
+    subset = subset[subset['popularity'].between(query.get('popularity_min', 0),
+                                                 query.get('popularity_max', 100))]
+    values = subset['duration_min'].to_numpy()
+
+    digest = QuantileSketches(tracks).digest(**query)
+    assert digest.count == len(values)
+    assert digest.min == values.min() and digest.max == values.max()
+    estimate = digest.quantile(QUANTILES)
+    assert rank_error(values, estimate, np.quantile(values, QUANTILES)).max() <= MAX_RANK_ERROR
+
+
+def test_merge_equivale_ao_digest_inteiro(tracks):
+    values = tracks['duration_min'].to_numpy()
+    merged = TDigest.merge(TDigest.from_values(part) for part in np.array_split(values, 5))
+    assert merged.count == len(values)
+    assert rank_error(values, merged.quantile(QUANTILES), np.quantile(values, QUANTILES)).max() <= MAX_RANK_ERROR
+
+
+def test_poucos_pontos_sao_exatos():
+    values = np.random.default_rng(1).normal(size=150)
+    np.testing.assert_allclose(TDigest.from_values(values).quantile(QUANTILES), np.quantile(values, QUANTILES))
+
+
+@pytest.mark.parametrize('values', [[4.2], [3.0] * 500])
+def test_summary_degenerado(values):
+    summary = TDigest.from_values(values).summary()
+    for key in ('q1', 'median', 'q3', 'lowerfence', 'upperfence'):
+        assert summary[key] == values[0]
+    assert summary['count'] == len(values)
+    assert np.isfinite(summary['grid']).all() and np.isfinite(summary['density']).all()
+
+
+def test_summary_vazio(tracks):
+    summary = QuantileSketches(tracks).digest(genres=['inexistente']).summary()
+    assert summary['count'] == 0
+    assert len(summary['density']) == 0
+    assert np.isnan(summary['lowerfence'])
@@ -0,0 +1,96 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.datasets import DatasetRegistry
+from src.web.static_site import MANIFEST, StaticSiteBuilder
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def write_tracks(path, seed=0):
+    rng = np.random.default_rng(seed)
+    n_rows = 300
+    duration_ms = rng.integers(120_000, 300_000, n_rows)
+    pd.DataFrame({
+        'id': [f"t{i}" for i in range(n_rows)],
+        'name': [f"Track {i}" for i in range(n_rows)],
+        'genre': rng.choice(['rock', 'pop', 'jazz'], n_rows),
+        'artists': [f"Artist {i % 40}" for i in range(n_rows)],
+        'album': [f"Album {i % 60}" for i in range(n_rows)],
+        'popularity': rng.integers(0, 101, n_rows),
+        'duration_ms': duration_ms,
+        'explicit': rng.random(n_rows) < 0.2,
+        'duration_min': duration_ms / 60000,
+    }).to_csv(path, index=False)
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    write_tracks(data_dir / 'processed_spotify.csv')
+    registry = DatasetRegistry({'teste': {'path': data_dir, 'title': 'Teste'}})
+
+    def build(output_dir):
+        builder = StaticSiteBuilder(output_dir, static_dir=ROOT / 'static', template_dir=ROOT / 'templates',
+                                    registry=registry, dataset_ids=['teste'], brotli_quality=1)
+        return builder.build()
+
+    return data_dir, build
+
+
+def test_prune_so_remove_arquivos_do_manifesto(site, tmp_path):
+    data_dir, build = site
+    output = tmp_path / 'site'
+    output.mkdir()
+    for name in ('CNAME', '.nojekyll', 'notas/leia.txt'):
+        (output / name).parent.mkdir(parents=True, exist_ok=True)
+        (output / name).write_text('do usuário')
+
+    # Sem manifesto anterior nada que já estava lá é removido
+    assert build(output)['removidos'] == 0
+    first = set(json.loads((output / MANIFEST).read_text())['artifacts']['dados/teste']['files'])
+
+    write_tracks(data_dir / 'processed_spotify.csv', seed=1)
+    report = build(output)
+    second = set(json.loads((output / MANIFEST).read_text())['artifacts']['dados/teste']['files'])
+
+    assert report['removidos'] == len(first - second) > 0
+    assert not any((output / name).exists() for name in first - second)
+    assert all((output / name).exists() for name in second)
+    for name in ('CNAME', '.nojekyll', 'notas/leia.txt'):
+        assert (output / name).read_text() == 'do usuário'
+
+
+def test_prune_ignora_caminhos_fora_da_saida(site, tmp_path):
+    _, build = site
+    output = tmp_path / 'site'
+    build(output)
+    outside = tmp_path / 'fora.txt'
+    outside.write_text('não apagar')
+
+    manifest = json.loads((output / MANIFEST).read_text())
+    manifest['artifacts']['antigo'] = {'files': [os.path.relpath(outside, output)], 'inputs': ''}
+    (output / MANIFEST).write_text(json.dumps(manifest))
+    build(output)
+    assert outside.read_text() == 'não apagar'
+
+
+def test_copia_so_os_arquivos_usados_pela_pagina(site, tmp_path):
+    data_dir, _ = site
+    static = tmp_path / 'static'
+    for name in ('img/header.png', 'visualization/genre_popularity.png', 'visualization/genre_popularity.html',
+                 'visualization/plotly.min.js', 'visualization/manifest.json'):
+        (static / name).parent.mkdir(parents=True, exist_ok=True)
+        (static / name).write_bytes(b'conteudo')
+
+    builder = StaticSiteBuilder(tmp_path / 'site', static_dir=static, template_dir=ROOT / 'templates',
+                                registry=DatasetRegistry({'teste': {'path': data_dir, 'title': 'Teste'}}),
+                                dataset_ids=['teste'], brotli_quality=1)
+    assert sorted(builder.build_static()) == ['img/header.png', 'visualization/genre_popularity.png']
@@ -0,0 +1,73 @@
+import warnings
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from src.analysis.statistics import distribution_summary, one_way_anova
+
+
+def sufficient_statistics(groups):
+    """Contagem, soma e soma dos quadrados de cada grupo"""
+    return ([len(g) for g in groups], [np.sum(g) for g in groups],
+            [np.sum(np.square(g)) for g in groups])
+
+
+def f_oneway(groups):
+    with warnings.catch_warnings():
+        # Grupos constantes: o scipy avisa, mas devolve inf/NaN como esperado
+        warnings.simplefilter('ignore')
+        return stats.f_oneway(*groups)
+
+
+rng = np.random.default_rng(0)
+ANOVA_CASES = {
+    'tamanhos diferentes': [rng.normal(50, 10, n) for n in (3, 40, 400, 7)],
+    'popularidade inteira': [rng.integers(0, 101, n).astype(float) for n in (1000, 50, 2)],
+    'grupos de um membro': [rng.normal(50, 10, n) for n in (1, 20, 1, 5)],
+    'um grupo constante': [np.full(5, 3.7), rng.normal(3, 1, 10)],
+    'grupos constantes distintos': [np.full(5, 3.7), np.full(8, 41.3), np.full(3, 0.1)],
+    'todos constantes e iguais': [np.full(5, 3.7), np.full(8, 3.7)],
+    'só grupos de um membro': [np.array([1.0]), np.array([2.0]), np.array([5.0])],
+}
+
+
+@pytest.mark.parametrize('groups', ANOVA_CASES.values(), ids=ANOVA_CASES.keys())
+def test_one_way_anova_igual_ao_scipy(groups):
+    f_statistic, p_value = one_way_anova(*sufficient_statistics(groups))
+    expected = f_oneway(groups)
+    np.testing.assert_allclose(f_statistic, expected.statistic, rtol=1e-9)
+    np.testing.assert_allclose(p_value, expected.pvalue, rtol=1e-9, atol=1e-15)
+
+
+def test_one_way_anova_ignora_grupos_vazios():
+    groups = ANOVA_CASES['tamanhos diferentes']
+    count, total, total_sq = sufficient_statistics(groups)
+    with_empty = one_way_anova([0, *count, 0], [0.0, *total, 0.0], [0.0, *total_sq, 0.0])
+    np.testing.assert_allclose(with_empty, tuple(f_oneway(groups)), rtol=1e-9)
+
+
+def test_distribution_summary_sem_valores():
+    summary = distribution_summary(np.array([np.nan]))
+    assert summary['count'] == 0
+    assert len(summary['grid']) == 0 and len(summary['density']) == 0
+    assert np.isnan(summary['median'])
+
+
+@pytest.mark.parametrize('values', [[3.5], [2.0, 2.0, 2.0]])
+def test_distribution_summary_degenerado(values):
+    summary = distribution_summary(np.array(values))
+    value = values[0]
+    for key in ('q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean'):
+        assert summary[key] == value
+    assert np.isfinite(summary['grid']).all() and np.isfinite(summary['density']).all()
+    assert summary['grid'][np.argmax(summary['density'])] == pytest.approx(value, abs=1e-2)
+    assert len(summary['outliers']) == 0
+
+
+def test_distribution_summary_normal():
+    values = np.random.default_rng(0).normal(3.5, 1.0, 10_000)
+    summary = distribution_summary(values)
+    bin_width = summary['grid'][1] - summary['grid'][0]
+    assert summary['density'].sum() * bin_width == pytest.approx(1.0, abs=1e-3)
+    assert summary['median'] == pytest.approx(np.median(values))